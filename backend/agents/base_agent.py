@@ -34,9 +34,24 @@ class BaseAgent(ABC):
         action: str,
         result: Dict[str, Any]
     ):
-        """Log agent action to database"""
+        """
+        Log agent action to database
+        
+        The row is queued on the buffered log writer when it is running and
+        written in a later batch; otherwise it is added to the session.
+        """
+        from config import settings
+        from database.log_writer import get_log_writer
         from database.models import ValidationLog
         
+        if not settings.AGENT_LOGGING:
+            return
+        
+        writer = get_log_writer()
+        if writer.running:
+            await writer.write(job_id, provider_id, self.name, action, result)
+            return
+        
         log = ValidationLog(
             job_id=job_id,
             provider_id=provider_id,
@@ -46,5 +61,3 @@ class BaseAgent(ABC):
         )
         session.add(log)
         await session.flush()
-
-
@@ -4,7 +4,7 @@ Directory Management Agent - Manages provider directory and prioritization
 from typing import Dict, Any, List
 from sqlalchemy.ext.asyncio import AsyncSession
 from agents.base_agent import BaseAgent
-from utils.confidence import calculate_overall_confidence
+from utils.confidence import calculate_overall_confidence, COMPLETENESS_FIELDS, CRITICAL_FIELDS
 
 
 class DirectoryAgent(BaseAgent):
@@ -49,27 +49,21 @@ class DirectoryAgent(BaseAgent):
     
     def _calculate_completeness(self, provider_data: Dict[str, Any]) -> float:
         """Calculate data completeness score"""
-        fields = [
-            "name", "npi", "specialty", "phone", "email",
-            "address", "city", "state", "zip_code", "website"
-        ]
-        
         filled_fields = 0
-        for field in fields:
+        for field in COMPLETENESS_FIELDS:
             if provider_data.get(field) or provider_data.get(f"validated_{field}"):
                 filled_fields += 1
         
-        return filled_fields / len(fields)
+        return filled_fields / len(COMPLETENESS_FIELDS)
     
     def _check_critical_fields(self, provider_data: Dict[str, Any]) -> float:
         """Check if critical fields are present"""
-        critical_fields = ["name", "phone", "address"]
         present_fields = 0
         
-        for field in critical_fields:
+        for field in CRITICAL_FIELDS:
             if provider_data.get(field) or provider_data.get(f"validated_{field}"):
                 present_fields += 1
         
-        return present_fields / len(critical_fields)
+        return present_fields / len(CRITICAL_FIELDS)
 
 
@@ -7,8 +7,15 @@ from agents.base_agent import BaseAgent
 from services.npi_service import NPIService
 from services.maps_service import MapsService
 from services.website_service import WebsiteService
-from utils.fuzzy_match import fuzzy_match_strings
-from utils.confidence import calculate_confidence_score, validate_phone, validate_email
+from utils.fuzzy_match import fuzzy_match_strings, fuzzy_match_threshold
+from utils.address import parse_address, format_address, compare_addresses
+from utils.confidence import (
+    calculate_confidence_score,
+    validate_phone,
+    validate_email,
+    phone_format_result,
+    email_format_result
+)
 
 
 class ValidationAgent(BaseAgent):
@@ -55,10 +62,22 @@ class ValidationAgent(BaseAgent):
                     fuzzy_score=name_score
                 )
                 
-                # Validate address
-                npi_address = f"{npi_data.get('address', '')} {npi_data.get('city', '')} {npi_data.get('state', '')}"
-                provider_address = f"{provider_data.get('address', '')} {provider_data.get('city', '')} {provider_data.get('state', '')}"
-                addr_match, addr_score = fuzzy_match_strings(provider_address, npi_address)
+                # Validate address on standardized components
+                npi_components = parse_address(
+                    npi_data.get("address"),
+                    npi_data.get("city"),
+                    npi_data.get("state"),
+                    npi_data.get("zip")
+                )
+                provider_components = parse_address(
+                    provider_data.get("address"),
+                    provider_data.get("city"),
+                    provider_data.get("state"),
+                    provider_data.get("zip_code")
+                )
+                npi_address = format_address(npi_components)
+                provider_address = format_address(provider_components)
+                addr_score = compare_addresses(provider_components, npi_components)
                 validated_data["validated_address"] = npi_address
                 validated_data["confidence_address"] = calculate_confidence_score(
                     provider_address,
@@ -119,7 +138,11 @@ class ValidationAgent(BaseAgent):
         # Validate phone format
         phone = provider_data.get("phone")
         if phone:
-            is_valid, phone_score = validate_phone(phone)
+            # Reuse the format check done at ingest when available
+            if provider_data.get("canonical_phone") is not None:
+                is_valid, phone_score = phone_format_result(provider_data["canonical_phone"])
+            else:
+                is_valid, phone_score = validate_phone(phone)
             if not is_valid:
                 validated_data["issues"].append("Phone number format invalid")
             validated_data["confidence_phone"] = max(validated_data["confidence_phone"], phone_score * 0.5)
@@ -127,7 +150,10 @@ class ValidationAgent(BaseAgent):
         # Validate email format
         email = provider_data.get("email")
         if email:
-            is_valid, email_score = validate_email(email)
+            if provider_data.get("email_valid") is not None:
+                is_valid, email_score = email_format_result(provider_data["email_valid"])
+            else:
+                is_valid, email_score = validate_email(email)
             validated_data["validated_email"] = email
             validated_data["confidence_email"] = email_score
             if not is_valid:
@@ -140,16 +166,17 @@ class ValidationAgent(BaseAgent):
             if website_data:
                 # Cross-validate name and contact info
                 if website_data.get("name"):
-                    name_match, name_score = fuzzy_match_strings(
+                    name_match, name_score = fuzzy_match_threshold(
                         provider_data.get("name", ""),
-                        website_data.get("name", "")
+                        website_data.get("name", ""),
+                        threshold=0.8
                     )
-                    if name_score > 0.8:
+                    if name_match and name_score > 0.8:
                         validated_data["confidence_name"] = max(validated_data["confidence_name"], name_score * 0.3)
                 
                 # Validate phone from website
                 if website_data.get("phone"):
-                    phone_match, phone_score = fuzzy_match_strings(
+                    phone_match, phone_score = fuzzy_match_threshold(
                         provider_data.get("phone", ""),
                         website_data.get("phone", "")
                     )
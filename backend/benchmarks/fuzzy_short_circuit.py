@@ -0,0 +1,84 @@
+"""
+Benchmark for threshold-aware fuzzy comparisons
+
+Compares fuzzy_match_threshold against fuzzy_match_strings on pairs built
+from the sample rosters and reports how many comparisons were decided by the
+cheap bounds, the speed-up and whether every decision agreed.
+
+Usage (from backend/):
+    python -m benchmarks.fuzzy_short_circuit [path/to/roster.csv ...]
+"""
+import csv
+import random
+import sys
+import time
+from pathlib import Path
+from typing import List, Tuple
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from utils import fuzzy_match
+from utils.fuzzy_match import fuzzy_match_strings, fuzzy_match_threshold
+
+SAMPLE_DIR = Path(__file__).resolve().parent.parent.parent / "sample_data"
+DEFAULT_FILES = [SAMPLE_DIR / "providers.csv", SAMPLE_DIR / "providers_200_benchmark.csv"]
+
+# (field, threshold) pairs as used by the agents
+CASES = [("name", 0.7), ("name", 0.8), ("phone", 0.85), ("address", 0.85), ("specialty", 0.85)]
+
+
+def load_rows(paths: List[Path]) -> List[dict]:
+    """Load provider rows from CSV rosters"""
+    rows = []
+    for path in paths:
+        with open(path, newline="", encoding="utf-8") as f:
+            rows.extend(csv.DictReader(f))
+    return rows
+
+
+def build_pairs(rows: List[dict], field: str, rng: random.Random) -> List[Tuple[str, str]]:
+    """Pairs of values: every value against itself in another form and against random others"""
+    values = [row[field] for row in rows if row.get(field)]
+    pairs = []
+    for value in values:
+        pairs.append((value, value.upper()))
+        pairs.append((value, f" {value} "))
+        for other in rng.sample(values, min(20, len(values))):
+            pairs.append((value, other))
+    return pairs
+
+
+def main():
+    paths = [Path(arg) for arg in sys.argv[1:]] or DEFAULT_FILES
+    rows = load_rows(paths)
+    rng = random.Random(42)
+
+    print(f"{len(rows)} providers from {', '.join(path.name for path in paths)}")
+    print(f"{'field':<10} {'thr':>5} {'pairs':>7} {'accept':>7} {'reject':>7} {'full':>7} "
+          f"{'short%':>7} {'full ms':>9} {'thr ms':>9} {'speedup':>8} {'agree':>6}")
+
+    for field, threshold in CASES:
+        pairs = build_pairs(rows, field, rng)
+
+        started = time.perf_counter()
+        expected = [fuzzy_match_strings(a, b, threshold)[0] for a, b in pairs]
+        full_ms = (time.perf_counter() - started) * 1000
+
+        before = fuzzy_match.get_threshold_stats()
+        started = time.perf_counter()
+        decided = [fuzzy_match_threshold(a, b, threshold)[0] for a, b in pairs]
+        threshold_ms = (time.perf_counter() - started) * 1000
+        after = fuzzy_match.get_threshold_stats()
+
+        accepted = after["accepted_early"] - before["accepted_early"]
+        rejected = after["rejected_early"] - before["rejected_early"]
+        full = after["full_scored"] - before["full_scored"]
+        short_rate = (accepted + rejected) / len(pairs) * 100 if pairs else 0.0
+
+        print(f"{field:<10} {threshold:>5.2f} {len(pairs):>7} {accepted:>7} {rejected:>7} {full:>7} "
+              f"{short_rate:>6.1f}% {full_ms:>9.1f} {threshold_ms:>9.1f} "
+              f"{full_ms / threshold_ms if threshold_ms else 0.0:>7.2f}x {str(expected == decided):>6}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,172 @@
+"""
+Benchmark for the provider and validation log indexes
+
+Builds a synthetic SQLite database (one million providers by default) from
+the application models, then runs the hot queries with and without the
+secondary indexes. Reports each query's plan and median latency, so the
+index set in database/models.py has evidence behind it.
+
+Usage (from backend/):
+    python -m benchmarks.index_plans [--rows 1000000] [--jobs 200] [--db path]
+"""
+import argparse
+import os
+import random
+import sqlite3
+import statistics
+import sys
+import tempfile
+import time
+from pathlib import Path
+from typing import List, Tuple
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from sqlalchemy import create_engine
+from sqlalchemy.schema import CreateIndex
+
+from database.database import Base
+from database.models import Provider, ValidationLog  # noqa: F401 - registers the tables
+
+SPECIALTIES = ["Cardiology", "Pediatrics", "Dermatology", "Oncology", "Neurology", "Orthopedics"]
+STATES = ["NY", "CA", "TX", "FL", "IL", "WA", "MA", "GA"]
+
+# (label, SQL) of the queries the API and pipeline run per job
+QUERIES = [
+    ("count providers in job",
+     "SELECT count(id) FROM providers WHERE job_id = :job_id"),
+    ("page providers (offset 1000)",
+     "SELECT * FROM providers WHERE job_id = :job_id ORDER BY id LIMIT 50 OFFSET 1000"),
+    ("load job in id order",
+     "SELECT id, name, phone, confidence_overall FROM providers WHERE job_id = :job_id ORDER BY id"),
+    ("review queue by confidence",
+     "SELECT id, confidence_overall FROM providers WHERE job_id = :job_id AND needs_review = 1 "
+     "ORDER BY confidence_overall LIMIT 50"),
+    ("review stats",
+     "SELECT count(*), avg(confidence_overall) FROM providers WHERE job_id = :job_id AND needs_review = 1"),
+    ("logs for provider",
+     "SELECT * FROM validation_logs WHERE provider_id = :provider_id"),
+]
+
+
+def secondary_indexes() -> List[Tuple[str, str]]:
+    """(name, CREATE INDEX) for the indexes under test"""
+    engine = create_engine("sqlite://")
+    indexes = []
+    for table in (Provider.__table__, ValidationLog.__table__):
+        for index in table.indexes:
+            if index.name in ("ix_providers_job_id_id", "ix_providers_job_review_confidence",
+                              "ix_validation_logs_provider_id"):
+                indexes.append((index.name, str(CreateIndex(index).compile(engine))))
+    return indexes
+
+
+def build_database(path: str, rows: int, jobs: int, seed: int = 7):
+    """Create the schema without the indexes under test and fill it with synthetic rows"""
+    engine = create_engine(f"sqlite:///{path}")
+    Base.metadata.create_all(engine)
+    engine.dispose()
+
+    connection = sqlite3.connect(path)
+    for name, _ in secondary_indexes():
+        connection.execute(f"DROP INDEX IF EXISTS {name}")
+    connection.execute("PRAGMA journal_mode = OFF")
+    connection.execute("PRAGMA synchronous = OFF")
+
+    rng = random.Random(seed)
+    job_ids = [f"job-{index:05d}" for index in range(jobs)]
+    connection.executemany(
+        "INSERT INTO validation_jobs (job_id, status, total_providers, processed_providers) VALUES (?, 'completed', 0, 0)",
+        [(job_id,) for job_id in job_ids]
+    )
+
+    batch = []
+    for index in range(rows):
+        batch.append((
+            rng.choice(job_ids),
+            f"Provider {index}",
+            f"{1000000000 + index}",
+            rng.choice(SPECIALTIES),
+            f"{2000000000 + rng.randrange(10 ** 9)}",
+            rng.choice(STATES),
+            rng.random(),
+            rng.random() < 0.3,
+        ))
+        if len(batch) == 50000:
+            _insert_providers(connection, batch)
+            batch = []
+    if batch:
+        _insert_providers(connection, batch)
+
+    # Roughly one log entry per provider from a subset of agents
+    connection.execute(
+        "INSERT INTO validation_logs (job_id, provider_id, agent_name, action) "
+        "SELECT job_id, id, 'validation', 'validate_provider' FROM providers"
+    )
+    connection.commit()
+    connection.execute("ANALYZE")
+    connection.close()
+
+
+def _insert_providers(connection: sqlite3.Connection, batch: List[tuple]):
+    connection.executemany(
+        "INSERT INTO providers (job_id, name, npi, specialty, phone, state, confidence_overall, needs_review) "
+        "VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+        batch
+    )
+
+
+def run_queries(connection: sqlite3.Connection, samples: int, seed: int = 11) -> List[Tuple[str, str, float]]:
+    """Plan and median latency (ms) of each query over random jobs / providers"""
+    rng = random.Random(seed)
+    job_ids = [row[0] for row in connection.execute("SELECT job_id FROM validation_jobs")]
+    max_id = connection.execute("SELECT max(id) FROM providers").fetchone()[0]
+
+    results = []
+    for label, sql in QUERIES:
+        timings = []
+        params = {}
+        for _ in range(samples):
+            params = {"job_id": rng.choice(job_ids), "provider_id": rng.randint(1, max_id)}
+            started = time.perf_counter()
+            connection.execute(sql, params).fetchall()
+            timings.append((time.perf_counter() - started) * 1000)
+        plan = "; ".join(row[3] for row in connection.execute(f"EXPLAIN QUERY PLAN {sql}", params))
+        results.append((label, plan, statistics.median(timings)))
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--rows", type=int, default=1_000_000)
+    parser.add_argument("--jobs", type=int, default=200)
+    parser.add_argument("--samples", type=int, default=20)
+    parser.add_argument("--db", help="Database file to build (default: a temporary file)")
+    args = parser.parse_args()
+
+    path = args.db or os.path.join(tempfile.mkdtemp(), "index_plans.db")
+    if os.path.exists(path):
+        os.remove(path)
+
+    started = time.perf_counter()
+    build_database(path, args.rows, args.jobs)
+    print(f"Built {args.rows:,} providers in {args.jobs} jobs at {path} ({time.perf_counter() - started:.1f}s)")
+
+    connection = sqlite3.connect(path)
+    before = run_queries(connection, args.samples)
+    for _, create_sql in secondary_indexes():
+        connection.execute(create_sql)
+    connection.execute("ANALYZE")
+    after = run_queries(connection, args.samples)
+    connection.close()
+
+    for (label, plan_before, ms_before), (_, plan_after, ms_after) in zip(before, after):
+        speedup = ms_before / ms_after if ms_after > 0 else float("inf")
+        print(f"\n{label}")
+        print(f"  without: {ms_before:9.2f} ms  {plan_before}")
+        print(f"  with:    {ms_after:9.2f} ms  {plan_after}")
+        print(f"  speed-up: {speedup:.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,139 @@
+"""
+Benchmark for keyset pagination of provider listings
+
+Builds a synthetic SQLite database with one large job among smaller ones,
+then times pages at increasing depth for each listing the reviewers use
+(id order, review queue by confidence, state filter), read once with
+OFFSET and once with the keyset cursor of the previous page. Queries are
+built by database.pagination, so the plans shown are the ones the
+/validation/providers endpoint runs.
+
+Usage (from backend/):
+    python -m benchmarks.keyset_pages [--rows 200000] [--job-rows 50000] [--db path]
+"""
+import argparse
+import os
+import random
+import statistics
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from sqlalchemy import create_engine, insert, select, text
+from sqlalchemy.orm import Session
+
+from database.database import Base
+from database.models import Provider, ValidationJob
+from database.pagination import ProviderFilters, provider_page_query, SORT_KEYS
+
+JOB_ID = "bench-job"
+STATES = ["NY", "CA", "TX", "FL", "IL", "WA", "MA", "GA"]
+PAGE_SIZE = 50
+
+# (label, sort, filters) of the listings under test
+LISTINGS = [
+    ("id order", "id", ProviderFilters()),
+    ("review queue, lowest confidence first", "confidence", ProviderFilters(needs_review=True)),
+    ("state filter, highest confidence first", "-confidence", ProviderFilters(state="TX")),
+]
+
+
+def build_database(path: str, rows: int, job_rows: int, seed: int = 3):
+    """Create the schema and insert the large job's providers interleaved with other jobs'"""
+    engine = create_engine(f"sqlite:///{path}")
+    Base.metadata.create_all(engine)
+    rng = random.Random(seed)
+
+    with engine.begin() as connection:
+        connection.execute(insert(ValidationJob.__table__), [
+            {"job_id": JOB_ID, "status": "completed"},
+            {"job_id": "other-job", "status": "completed"}
+        ])
+        share = job_rows / rows
+        batch = []
+        for index in range(rows):
+            batch.append({
+                "job_id": JOB_ID if rng.random() < share else "other-job",
+                "name": f"Provider {index}",
+                "state": rng.choice(STATES),
+                "confidence_overall": round(rng.random(), 2),
+                "needs_review": rng.random() < 0.3,
+                "original_data": {}
+            })
+            if len(batch) == 10000:
+                connection.execute(insert(Provider.__table__), batch)
+                batch = []
+        if batch:
+            connection.execute(insert(Provider.__table__), batch)
+        connection.execute(text("ANALYZE"))
+    engine.dispose()
+
+
+def page_query(sort: str, filters: ProviderFilters, after=None, offset: int = 0):
+    query = provider_page_query(select(Provider).where(Provider.job_id == JOB_ID), sort, after, filters)
+    return query.offset(offset).limit(PAGE_SIZE)
+
+
+def time_query(session: Session, query, samples: int) -> float:
+    """Median milliseconds to load one page as ORM objects"""
+    timings = []
+    for _ in range(samples):
+        started = time.perf_counter()
+        session.execute(query).scalars().all()
+        session.expunge_all()
+        timings.append((time.perf_counter() - started) * 1000)
+    return statistics.median(timings)
+
+
+def query_plan(session: Session, query) -> str:
+    compiled = query.compile(session.bind, compile_kwargs={"literal_binds": True})
+    rows = session.execute(text(f"EXPLAIN QUERY PLAN {compiled}")).all()
+    return "; ".join(row[3] for row in rows)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--rows", type=int, default=200_000)
+    parser.add_argument("--job-rows", type=int, default=50_000, help="Approximate size of the job being paged")
+    parser.add_argument("--samples", type=int, default=5)
+    parser.add_argument("--db", help="Database file to build (default: a temporary file)")
+    args = parser.parse_args()
+
+    path = args.db or os.path.join(tempfile.mkdtemp(), "keyset_pages.db")
+    if os.path.exists(path):
+        os.remove(path)
+    build_database(path, args.rows, args.job_rows)
+
+    engine = create_engine(f"sqlite:///{path}")
+    with Session(engine) as session:
+        for label, sort, filters in LISTINGS:
+            columns, _ = SORT_KEYS[sort]
+            matching = session.execute(
+                select(Provider.id).where(Provider.job_id == JOB_ID).where(*filters.clauses())
+            ).all()
+            print(f"\n{label} ({len(matching):,} matching rows)")
+            print(f"  plan: {query_plan(session, page_query(sort, filters, after=[0] * len(columns)))}")
+
+            # Sort key of the row before each page, taken from the full ordered listing
+            ordered = session.execute(
+                provider_page_query(
+                    select(*[getattr(Provider, name) for name in columns]).where(Provider.job_id == JOB_ID),
+                    sort,
+                    None,
+                    filters
+                )
+            ).all()
+            for fraction in (0.0, 0.5, 0.99):
+                offset = int(len(ordered) * fraction) // PAGE_SIZE * PAGE_SIZE
+                after = list(ordered[offset - 1]) if offset else None
+                offset_ms = time_query(session, page_query(sort, filters, offset=offset), args.samples)
+                keyset_ms = time_query(session, page_query(sort, filters, after=after), args.samples)
+                print(f"  page {offset // PAGE_SIZE + 1:5d}: offset {offset_ms:8.2f} ms   keyset {keyset_ms:8.2f} ms")
+    engine.dispose()
+
+
+if __name__ == "__main__":
+    main()
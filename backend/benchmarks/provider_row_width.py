@@ -0,0 +1,139 @@
+"""
+Benchmark for deferred, compressed provider JSON documents
+
+Builds a synthetic SQLite database of PDF-sourced providers (each carrying
+its OCR text segment in original_data) through the application models, then
+compares stored document sizes with their plain JSON size and times a
+job-wide select(Provider) scan with the documents deferred (as list pages
+and dashboard stats run it) against the same scan with every document
+loaded.
+
+Usage (from backend/):
+    python -m benchmarks.provider_row_width [--rows 20000] [--text-bytes 4000] [--db path]
+"""
+import argparse
+import json
+import os
+import random
+import statistics
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from sqlalchemy import create_engine, insert, select, func
+from sqlalchemy.orm import Session, undefer
+
+from database.database import Base
+from database.models import Provider, ValidationJob
+
+JOB_ID = "bench-job"
+WORDS = [
+    "Provider", "Directory", "Cardiology", "Pediatrics", "Suite", "Street", "Avenue", "Clinic",
+    "Medical", "Center", "Phone", "Fax", "Hours", "Monday", "Friday", "Accepting", "Patients",
+    "Board", "Certified", "Hospital", "Affiliation", "Language", "English", "Spanish"
+]
+
+
+def build_database(path: str, rows: int, text_bytes: int, seed: int = 5) -> int:
+    """
+    Create the schema and insert providers with OCR-sized original_data
+
+    Returns:
+        Total bytes of the three documents serialized as plain JSON
+    """
+    engine = create_engine(f"sqlite:///{path}")
+    Base.metadata.create_all(engine)
+    rng = random.Random(seed)
+    plain_bytes = 0
+
+    with engine.begin() as connection:
+        connection.execute(insert(ValidationJob.__table__), [{"job_id": JOB_ID, "status": "completed"}])
+        batch = []
+        for index in range(rows):
+            text = []
+            length = 0
+            while length < text_bytes:
+                word = rng.choice(WORDS)
+                text.append(word)
+                length += len(word) + 1
+            documents = {
+                "original_data": {"name": f"Dr. Provider {index}", "npi": f"{1000000000 + index}", "text": " ".join(text)},
+                "enriched_data": {"phone": f"212555{index % 10000:04d}", "source": "npi_registry"},
+                "issues": ["Address not validated by Google Maps"] if index % 3 == 0 else []
+            }
+            plain_bytes += sum(len(json.dumps(value)) for value in documents.values())
+            batch.append({
+                "job_id": JOB_ID,
+                "name": f"Dr. Provider {index}",
+                "npi": f"{1000000000 + index}",
+                "state": "NY",
+                "confidence_overall": rng.random(),
+                **documents
+            })
+            if len(batch) == 1000:
+                connection.execute(insert(Provider.__table__), batch)
+                batch = []
+        if batch:
+            connection.execute(insert(Provider.__table__), batch)
+
+    engine.dispose()
+    return plain_bytes
+
+
+def time_scan(engine, load_documents: bool, samples: int) -> float:
+    """Median seconds to load every provider of the job as ORM objects"""
+    query = select(Provider).where(Provider.job_id == JOB_ID).order_by(Provider.id)
+    if load_documents:
+        query = query.options(
+            undefer(Provider.original_data), undefer(Provider.enriched_data), undefer(Provider.issues)
+        )
+    timings = []
+    for _ in range(samples):
+        with Session(engine) as session:
+            started = time.perf_counter()
+            session.execute(query).scalars().all()
+            timings.append(time.perf_counter() - started)
+    return statistics.median(timings)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--rows", type=int, default=20_000)
+    parser.add_argument("--text-bytes", type=int, default=4000, help="OCR text per provider")
+    parser.add_argument("--samples", type=int, default=5)
+    parser.add_argument("--db", help="Database file to build (default: a temporary file)")
+    args = parser.parse_args()
+
+    path = args.db or os.path.join(tempfile.mkdtemp(), "provider_row_width.db")
+    if os.path.exists(path):
+        os.remove(path)
+
+    plain_bytes = build_database(path, args.rows, args.text_bytes)
+    engine = create_engine(f"sqlite:///{path}")
+    with engine.connect() as connection:
+        table = Provider.__table__
+        stored_bytes = connection.execute(select(
+            func.sum(func.length(table.c.original_data))
+            + func.sum(func.coalesce(func.length(table.c.enriched_data), 0))
+            + func.sum(func.coalesce(func.length(table.c.issues), 0))
+        )).scalar()
+
+    deferred_seconds = time_scan(engine, load_documents=False, samples=args.samples)
+    loaded_seconds = time_scan(engine, load_documents=True, samples=args.samples)
+    engine.dispose()
+
+    print(f"{args.rows:,} providers, ~{args.text_bytes:,} bytes of OCR text each\n")
+    print(f"documents as plain JSON: {plain_bytes / args.rows:10.0f} bytes/row")
+    print(f"documents as stored:     {stored_bytes / args.rows:10.0f} bytes/row "
+          f"({plain_bytes / stored_bytes:.1f}x smaller)")
+    print(f"database file:           {os.path.getsize(path) / 1024 / 1024:10.1f} MB\n")
+    print(f"job scan, documents deferred: {deferred_seconds * 1000:8.1f} ms")
+    print(f"job scan, documents loaded:   {loaded_seconds * 1000:8.1f} ms "
+          f"({loaded_seconds / deferred_seconds:.1f}x slower)")
+
+
+if __name__ == "__main__":
+    main()
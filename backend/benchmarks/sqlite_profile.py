@@ -0,0 +1,161 @@
+"""
+Benchmark for the SQLite connection profile
+
+Runs one writer thread committing small provider updates (as the validation
+pipeline does) alongside reader threads running dashboard queries, first
+with SQLite's default rollback journal and then with the "performance"
+profile from database/sqlite.py. Reports committed writes, completed reads
+and lock errors per second for each.
+
+Usage (from backend/):
+    python -m benchmarks.sqlite_profile [--rows 100000] [--readers 4] [--seconds 10] [--db path]
+"""
+import argparse
+import os
+import random
+import sqlite3
+import sys
+import tempfile
+import threading
+import time
+from pathlib import Path
+from typing import Dict, Any, List, Tuple
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from sqlalchemy import create_engine
+
+from database.database import Base
+from database.models import Provider, ValidationJob  # noqa: F401 - registers the tables
+from database.sqlite import sqlite_pragmas
+
+JOBS = 20
+
+READ_QUERIES = [
+    "SELECT count(id) FROM providers WHERE job_id = ?",
+    "SELECT id, name, confidence_overall FROM providers WHERE job_id = ? ORDER BY id LIMIT 50",
+    "SELECT count(*), avg(confidence_overall) FROM providers WHERE job_id = ? AND needs_review = 1",
+]
+
+
+def build_database(path: str, rows: int, seed: int = 3):
+    """Create the schema and fill it with synthetic providers"""
+    engine = create_engine(f"sqlite:///{path}")
+    Base.metadata.create_all(engine)
+    engine.dispose()
+
+    rng = random.Random(seed)
+    connection = sqlite3.connect(path)
+    job_ids = [f"job-{index:03d}" for index in range(JOBS)]
+    connection.executemany(
+        "INSERT INTO validation_jobs (job_id, status, total_providers, processed_providers) VALUES (?, 'processing', 0, 0)",
+        [(job_id,) for job_id in job_ids]
+    )
+    connection.executemany(
+        "INSERT INTO providers (job_id, name, npi, phone, confidence_overall, needs_review) VALUES (?, ?, ?, ?, ?, ?)",
+        [
+            (rng.choice(job_ids), f"Provider {index}", f"{1000000000 + index}",
+             f"{2000000000 + rng.randrange(10 ** 9)}", rng.random(), rng.random() < 0.3)
+            for index in range(rows)
+        ]
+    )
+    connection.commit()
+    connection.close()
+
+
+def connect(path: str, pragmas: List[Tuple[str, Any]]) -> sqlite3.Connection:
+    # The default profile still waits briefly on locks, as the sqlite3 module does
+    connection = sqlite3.connect(path, timeout=5.0, check_same_thread=False)
+    for name, value in pragmas:
+        connection.execute(f"PRAGMA {name}={value}")
+    return connection
+
+
+def run_workload(path: str, pragmas: List[Tuple[str, Any]], readers: int, seconds: float) -> Dict[str, float]:
+    """Run the writer and readers concurrently and count completed operations"""
+    stop = threading.Event()
+    counts = {"writes": 0, "reads": 0, "write_errors": 0, "read_errors": 0}
+    lock = threading.Lock()
+    max_id = connect(path, []).execute("SELECT max(id) FROM providers").fetchone()[0]
+
+    def writer():
+        rng = random.Random(1)
+        connection = connect(path, pragmas)
+        while not stop.is_set():
+            try:
+                # One provider's results per transaction, like the pipeline's per-provider commits
+                connection.execute(
+                    "UPDATE providers SET confidence_overall = ?, needs_review = ?, updated_at = CURRENT_TIMESTAMP WHERE id = ?",
+                    (rng.random(), rng.random() < 0.3, rng.randint(1, max_id))
+                )
+                connection.execute(
+                    "INSERT INTO validation_logs (job_id, provider_id, agent_name, action) VALUES ('job-000', ?, 'bench', 'update')",
+                    (rng.randint(1, max_id),)
+                )
+                connection.commit()
+                key = "writes"
+            except sqlite3.OperationalError:
+                connection.rollback()
+                key = "write_errors"
+            with lock:
+                counts[key] += 1
+        connection.close()
+
+    def reader(seed: int):
+        rng = random.Random(seed)
+        connection = connect(path, pragmas)
+        while not stop.is_set():
+            try:
+                connection.execute(rng.choice(READ_QUERIES), (f"job-{rng.randrange(JOBS):03d}",)).fetchall()
+                key = "reads"
+            except sqlite3.OperationalError:
+                key = "read_errors"
+            with lock:
+                counts[key] += 1
+        connection.close()
+
+    threads = [threading.Thread(target=writer)] + [
+        threading.Thread(target=reader, args=(index + 10,)) for index in range(readers)
+    ]
+    for thread in threads:
+        thread.start()
+    time.sleep(seconds)
+    stop.set()
+    for thread in threads:
+        thread.join()
+
+    return {key: value / seconds for key, value in counts.items()}
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--rows", type=int, default=100_000)
+    parser.add_argument("--readers", type=int, default=4)
+    parser.add_argument("--seconds", type=float, default=10.0)
+    parser.add_argument("--db", help="Database file to build (default: a temporary file)")
+    args = parser.parse_args()
+
+    path = args.db or os.path.join(tempfile.mkdtemp(), "sqlite_profile.db")
+    results = {}
+    for profile in ("default", "performance"):
+        for suffix in ("", "-wal", "-shm", "-journal"):
+            if os.path.exists(path + suffix):
+                os.remove(path + suffix)
+        build_database(path, args.rows)
+        pragmas = sqlite_pragmas(profile)
+        if not pragmas:
+            # Make sure a previous WAL run does not leak into the baseline
+            connect(path, [("journal_mode", "DELETE")]).close()
+        results[profile] = run_workload(path, pragmas, args.readers, args.seconds)
+
+    print(f"{args.rows:,} providers, 1 writer + {args.readers} readers, {args.seconds:.0f}s per profile\n")
+    print(f"{'profile':<12} {'writes/s':>10} {'reads/s':>10} {'write err/s':>12} {'read err/s':>11}")
+    for profile, rates in results.items():
+        print(
+            f"{profile:<12} {rates['writes']:>10.0f} {rates['reads']:>10.0f} "
+            f"{rates['write_errors']:>12.1f} {rates['read_errors']:>11.1f}"
+        )
+
+
+if __name__ == "__main__":
+    main()
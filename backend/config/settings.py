@@ -15,18 +15,57 @@ class Settings(BaseSettings):
     
     # Database
     DATABASE_URL: str = "sqlite+aiosqlite:///./provider_validation.db"
+    READ_REPLICA_URL: Optional[str] = None  # Database for read-only endpoints; defaults to DATABASE_URL
+    READ_MAX_STALENESS_SECONDS: float = 30.0  # Replica lag beyond which reads go to the primary
+    SQLITE_PROFILE: str = "performance"  # "performance" (WAL, tuned pragmas) or "default"
+    SQLITE_SYNCHRONOUS: str = "NORMAL"  # NORMAL is durable across app crashes in WAL mode
+    SQLITE_BUSY_TIMEOUT_MS: int = 5000  # Wait for locks instead of failing immediately
+    SQLITE_CACHE_SIZE_KB: int = 64 * 1024  # 64MB page cache per connection
+    SQLITE_MMAP_SIZE: int = 256 * 1024 * 1024  # 256MB memory-mapped I/O
+    SQLITE_CHECKPOINT_INTERVAL: float = 300.0  # Seconds between WAL checkpoints; 0 disables
+    DB_POOL_SIZE: int = 10  # PostgreSQL connections kept open per process
+    DB_MAX_OVERFLOW: int = 20  # Extra connections allowed under load
+    DB_POOL_TIMEOUT: float = 30.0  # Seconds to wait for a free connection
+    DB_POOL_RECYCLE: int = 1800  # Seconds before a connection is replaced
+    DB_COMMAND_TIMEOUT: float = 60.0  # Seconds before a PostgreSQL statement is abandoned
+    JSON_COMPRESSION_THRESHOLD: int = 1024  # Bytes above which provider JSON documents are compressed
+    JSON_COMPRESSION_LEVEL: int = 3  # zstd level
+    ARCHIVE_DIR: str = "./archive"  # Parquet files of archived jobs
+    ARCHIVE_RETENTION_DAYS: float = 30.0  # Completed jobs older than this are archived
+    ARCHIVE_INTERVAL: float = 3600.0  # Seconds between archival sweeps; 0 disables
+    ARCHIVE_BATCH_SIZE: int = 10000  # Rows per Parquet row group
+    ARCHIVE_COMPRESSION: str = "zstd"
     
     # File Upload
     UPLOAD_DIR: str = "./uploads"
     MAX_UPLOAD_SIZE: int = 50 * 1024 * 1024  # 50MB
-    ALLOWED_EXTENSIONS: list = [".csv", ".pdf"]
+    UPLOAD_CHUNK_SIZE: int = 1024 * 1024  # Bytes spooled to disk per read
+    ALLOWED_EXTENSIONS: list = [".csv", ".pdf", ".parquet", ".pq", ".ndjson", ".jsonl", ".xlsx"]
+    CSV_CHUNK_SIZE: int = 5000  # Rows read, validated and inserted at a time
+    BULK_INSERT_BATCH_SIZE: int = 1000  # Rows per executemany / COPY batch
+    SCHEMA_SAMPLE_ROWS: int = 200  # Rows sampled to infer roster column mappings
+    BLOCKING_WORKERS: int = 4  # Threads for blocking parse / hash / PDF work
+    BLOCKING_MAX_PENDING: int = 64  # Blocking tasks admitted before callers wait
+    OCR_DPI: int = 300
+    OCR_WORKERS: int = 0  # OCR processes; 0 uses the CPU count
+    OCR_CACHE_ENABLED: bool = True
+    OCR_CACHE_DIR: str = "./cache/ocr_text"
+    OCR_CACHE_MAX_BYTES: int = 256 * 1024 * 1024  # 256MB
     
     # AI/ML Settings
     OPENAI_API_KEY: Optional[str] = None
     CONFIDENCE_THRESHOLD: float = 0.7
     FUZZY_MATCH_THRESHOLD: float = 0.85
+    QA_RULES_PATH: Optional[str] = None  # Defaults to config/qa_rules.json
+    ADDRESS_CACHE_SIZE: int = 65536  # Parsed addresses kept in memory
+    COLUMN_MAPPING_CACHE_SIZE: int = 1024  # Roster column mappings kept in memory
     
     # Background Tasks
+    AGENT_LOGGING: bool = False  # Write a validation log row per agent step (four rows per provider)
+    LOG_WRITER_QUEUE_SIZE: int = 10000  # Log rows buffered in memory
+    LOG_WRITER_BATCH_SIZE: int = 500  # Log rows per bulk insert
+    LOG_WRITER_FLUSH_INTERVAL: float = 1.0  # Seconds a partial batch waits before it is written
+    LOG_WRITER_POLICY: str = "block"  # When the queue is full: "block" (backpressure) or "drop"
     REDIS_URL: str = "redis://localhost:6379/0"
     CELERY_BROKER_URL: str = "redis://localhost:6379/0"
     CELERY_RESULT_BACKEND: str = "redis://localhost:6379/0"
@@ -1,6 +1,6 @@
-from .database import get_db, init_db, engine
+from .database import get_db, get_read_db, init_db, engine
 from .models import Base
 
-__all__ = ["get_db", "init_db", "engine", "Base"]
+__all__ = ["get_db", "get_read_db", "init_db", "engine", "Base"]
 
 
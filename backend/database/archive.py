@@ -0,0 +1,412 @@
+"""
+Archival of completed jobs to compressed Parquet files
+
+Jobs that finished more than ARCHIVE_RETENTION_DAYS ago are moved out of the
+providers and validation_logs tables into one directory per job
+(providers.parquet and logs.parquet, zstd-compressed), leaving the
+ValidationJob row and a small archived_jobs catalog row behind. The catalog
+keeps the provider id range and the dashboard summary of the job, so reads
+for archived jobs go to the files (or need no file at all) while the hot
+tables stay small. Provider and log ids come from sequences that never hand
+out a deleted id again (AUTOINCREMENT on SQLite), so an archived provider
+keeps its id after newer jobs are uploaded.
+"""
+import asyncio
+import json
+import os
+from datetime import datetime, timedelta, timezone
+from typing import Dict, Any, List, Optional, Iterable, Tuple
+from sqlalchemy import select, delete, Integer, Float, Boolean, DateTime, JSON
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.types import TypeDecorator
+from config import settings
+from database.models import ValidationJob, Provider, ValidationLog, ArchivedJob
+from database.bulk import bulk_insert_providers, _TIMESTAMP_COLUMNS
+from utils.blocking import run_blocking
+
+try:
+    import pyarrow as pa
+    import pyarrow.compute as pc
+    import pyarrow.parquet as pq
+except ImportError:  # pragma: no cover - optional dependency
+    pa = None
+    pc = None
+    pq = None
+
+
+class JobNotArchivableError(Exception):
+    """Raised when a job does not exist, is not completed or is already archived"""
+
+
+def _require_pyarrow():
+    if pa is None:
+        raise Exception("pyarrow is required to archive jobs")
+
+
+def _is_document(column) -> bool:
+    return isinstance(column.type, (JSON, TypeDecorator))
+
+
+# Columns stored as JSON text in archive files
+DOCUMENT_COLUMNS = frozenset(
+    column.name
+    for table in (Provider.__table__, ValidationLog.__table__)
+    for column in table.columns
+    if _is_document(column)
+)
+
+# Provider columns read by provider_summary
+SUMMARY_COLUMNS = [
+    "is_validated", "needs_review", "is_suspicious", "confidence_overall",
+    "specialty", "validated_specialty", "state"
+]
+
+
+def _arrow_schema(table) -> "pa.Schema":
+    """Arrow schema for a table; JSON documents are stored as JSON text"""
+    fields = []
+    for column in table.columns:
+        if _is_document(column):
+            arrow_type = pa.string()
+        elif isinstance(column.type, Boolean):
+            arrow_type = pa.bool_()
+        elif isinstance(column.type, Integer):
+            arrow_type = pa.int64()
+        elif isinstance(column.type, Float):
+            arrow_type = pa.float64()
+        elif isinstance(column.type, DateTime):
+            arrow_type = pa.timestamp("us")
+        else:
+            arrow_type = pa.string()
+        fields.append(pa.field(column.name, arrow_type))
+    return pa.schema(fields)
+
+
+def _record_batch(schema: "pa.Schema", rows: List[Dict[str, Any]]) -> "pa.RecordBatch":
+    documents = [name for name in schema.names if name in DOCUMENT_COLUMNS]
+    for row in rows:
+        for name in documents:
+            if row[name] is not None:
+                row[name] = json.dumps(row[name])
+    return pa.RecordBatch.from_pylist(rows, schema=schema)
+
+
+def provider_summary(providers: Iterable[Any]) -> Dict[str, Any]:
+    """
+    Dashboard counts for a set of providers, in a form that can be summed
+    across jobs (see merge_summaries)
+    """
+    summary = {
+        "total": 0,
+        "validated": 0,
+        "needs_review": 0,
+        "suspicious": 0,
+        "confidence_sum": 0.0,
+        "confidence_count": 0,
+        "specialties": {},
+        "states": {}
+    }
+    for provider in providers:
+        summary["total"] += 1
+        summary["validated"] += 1 if provider.is_validated else 0
+        summary["needs_review"] += 1 if provider.needs_review else 0
+        summary["suspicious"] += 1 if provider.is_suspicious else 0
+        if provider.confidence_overall and provider.confidence_overall > 0:
+            summary["confidence_sum"] += provider.confidence_overall
+            summary["confidence_count"] += 1
+        specialty = provider.specialty or provider.validated_specialty or "Unknown"
+        summary["specialties"][specialty] = summary["specialties"].get(specialty, 0) + 1
+        state = provider.state or "Unknown"
+        summary["states"][state] = summary["states"].get(state, 0) + 1
+    return summary
+
+
+def summary_query(job_id: Optional[str] = None):
+    """Select only the provider columns provider_summary reads"""
+    query = select(*[getattr(Provider, name) for name in SUMMARY_COLUMNS])
+    if job_id:
+        query = query.where(Provider.job_id == job_id)
+    return query
+
+
+def merge_summaries(summaries: Iterable[Dict[str, Any]]) -> Dict[str, Any]:
+    """Add provider summaries together"""
+    merged = provider_summary([])
+    for summary in summaries:
+        for key in ("total", "validated", "needs_review", "suspicious", "confidence_sum", "confidence_count"):
+            merged[key] += summary[key]
+        for key in ("specialties", "states"):
+            for value, count in summary[key].items():
+                merged[key][value] = merged[key].get(value, 0) + count
+    return merged
+
+
+async def _write_parquet(session: AsyncSession, table, query, path: str) -> Tuple[int, Optional[int], Optional[int]]:
+    """
+    Stream a query's rows (ordered by id) into a Parquet file, one row group per batch
+
+    Returns:
+        Row count and the first and last id written
+    """
+    schema = _arrow_schema(table)
+    temp_path = f"{path}.tmp"
+    writer = await run_blocking(
+        pq.ParquetWriter, temp_path, schema, compression=settings.ARCHIVE_COMPRESSION
+    )
+    count = 0
+    first_id = last_id = None
+    try:
+        result = await session.stream(query.execution_options(yield_per=settings.ARCHIVE_BATCH_SIZE))
+        async for partition in result.mappings().partitions(settings.ARCHIVE_BATCH_SIZE):
+            rows = [dict(row) for row in partition]
+            if first_id is None:
+                first_id = rows[0]["id"]
+            last_id = rows[-1]["id"]
+            count += len(rows)
+            batch = await run_blocking(_record_batch, schema, rows)
+            await run_blocking(writer.write_batch, batch)
+    finally:
+        await run_blocking(writer.close)
+    os.replace(temp_path, path)
+    return count, first_id, last_id
+
+
+async def archive_job(session: AsyncSession, job_id: str) -> ArchivedJob:
+    """
+    Move a completed job's providers and logs into Parquet files
+
+    The files are written first; the rows are deleted and the catalog row
+    added in the caller's transaction, so a failed commit leaves the job
+    intact (and a later run overwrites the files).
+
+    Raises:
+        JobNotArchivableError: If the job is missing, not completed or already archived
+    """
+    _require_pyarrow()
+    job = (await session.execute(
+        select(ValidationJob).where(ValidationJob.job_id == job_id)
+    )).scalar_one_or_none()
+    if job is None:
+        raise JobNotArchivableError(f"Job not found: {job_id}")
+    if job.status != "completed":
+        raise JobNotArchivableError(f"Job is not completed: {job_id}")
+    if await get_archived_job(session, job_id) is not None:
+        raise JobNotArchivableError(f"Job is already archived: {job_id}")
+
+    directory = os.path.join(settings.ARCHIVE_DIR, job_id)
+    os.makedirs(directory, exist_ok=True)
+    providers_path = os.path.join(directory, "providers.parquet")
+    logs_path = os.path.join(directory, "logs.parquet")
+
+    providers = Provider.__table__
+    provider_count, min_id, max_id = await _write_parquet(
+        session, providers,
+        select(providers).where(providers.c.job_id == job_id).order_by(providers.c.id),
+        providers_path
+    )
+    logs = ValidationLog.__table__
+    log_count, _, max_log_id = await _write_parquet(
+        session, logs,
+        select(logs).where(logs.c.job_id == job_id).order_by(logs.c.id),
+        logs_path
+    )
+
+    # Kept in the catalog so dashboard stats never need to open the file
+    summary = provider_summary((await session.execute(summary_query(job_id))).all())
+
+    await session.execute(delete(logs).where(logs.c.job_id == job_id))
+    await session.execute(delete(providers).where(providers.c.job_id == job_id))
+    archive = ArchivedJob(
+        job_id=job_id,
+        providers_path=providers_path,
+        logs_path=logs_path,
+        provider_count=provider_count,
+        log_count=log_count,
+        min_provider_id=min_id,
+        max_provider_id=max_id,
+        max_log_id=max_log_id,
+        bytes=os.path.getsize(providers_path) + os.path.getsize(logs_path),
+        summary=summary
+    )
+    session.add(archive)
+    await session.flush()
+    return archive
+
+
+def archive_file_max_id(path: str) -> Optional[int]:
+    """Highest id in an archive file; None if it is empty or missing, or pyarrow is not installed"""
+    if pa is None or not os.path.exists(path):
+        return None
+    return pc.max(pq.read_table(path, columns=["id"])["id"]).as_py()
+
+
+async def get_archived_job(session: AsyncSession, job_id: str) -> Optional[ArchivedJob]:
+    """Catalog row of an archived job, or None if the job is in the hot tables"""
+    result = await session.execute(select(ArchivedJob).where(ArchivedJob.job_id == job_id))
+    return result.scalar_one_or_none()
+
+
+def read_archived_rows(
+    path: str,
+    offset: int = 0,
+    limit: Optional[int] = None,
+    filters: Optional[List[tuple]] = None,
+    columns: Optional[List[str]] = None,
+    sort_by: Optional[List[Tuple[str, str]]] = None
+) -> List[Dict[str, Any]]:
+    """
+    Rows of an archive file as dictionaries, JSON documents decoded
+
+    Rows come back in id order unless sort_by ((column, "ascending" or
+    "descending") pairs) is given. Without filters or sort_by only the row
+    groups covering offset..offset+limit are read.
+    """
+    _require_pyarrow()
+    if filters or sort_by:
+        table = pq.read_table(path, filters=filters or None, columns=columns)
+        if sort_by:
+            table = table.sort_by(sort_by)
+    else:
+        parquet_file = pq.ParquetFile(path)
+        groups = []
+        first_row = None
+        start = 0
+        for index in range(parquet_file.num_row_groups):
+            rows = parquet_file.metadata.row_group(index).num_rows
+            if start + rows > offset and (limit is None or start < offset + limit):
+                if first_row is None:
+                    first_row = start
+                groups.append(index)
+            start += rows
+        if not groups:
+            return []
+        table = parquet_file.read_row_groups(groups, columns=columns)
+        offset -= first_row
+    table = table.slice(offset, limit)
+
+    documents = [name for name in table.schema.names if name in DOCUMENT_COLUMNS]
+    rows = table.to_pylist()
+    for row in rows:
+        for name in documents:
+            if row[name] is not None:
+                row[name] = json.loads(row[name])
+    return rows
+
+
+async def load_archived_providers(
+    path: str,
+    offset: int = 0,
+    limit: Optional[int] = None,
+    filters: Optional[List[tuple]] = None,
+    sort_by: Optional[List[Tuple[str, str]]] = None
+) -> List[Provider]:
+    """Archived providers as detached Provider objects, with every column loaded"""
+    rows = await run_blocking(read_archived_rows, path, offset, limit, filters, None, sort_by)
+    return [Provider(**row) for row in rows]
+
+
+def _count_rows(path: str, filters: Optional[List[tuple]]) -> int:
+    _require_pyarrow()
+    return pq.read_table(path, filters=filters, columns=["id"]).num_rows
+
+
+async def count_archived_providers(archive: ArchivedJob, filters: Optional[List[tuple]] = None) -> int:
+    """Number of archived providers of a job matching the filters"""
+    if not filters:
+        return archive.provider_count
+    return await run_blocking(_count_rows, archive.providers_path, filters)
+
+
+async def find_archived_provider(session: AsyncSession, provider_id: int) -> Optional[Provider]:
+    """Look up a provider id in the archives whose id range covers it"""
+    result = await session.execute(
+        select(ArchivedJob)
+        .where(ArchivedJob.min_provider_id <= provider_id)
+        .where(ArchivedJob.max_provider_id >= provider_id)
+    )
+    for archive in result.scalars().all():
+        providers = await load_archived_providers(archive.providers_path, filters=[("id", "=", provider_id)])
+        if providers:
+            return providers[0]
+    return None
+
+
+async def clone_archived_providers(session: AsyncSession, archive: ArchivedJob, target_job_id: str) -> int:
+    """Copy an archived job's providers back into the hot table under another job"""
+    rows = await run_blocking(read_archived_rows, archive.providers_path)
+    for row in rows:
+        row.pop("id")
+        for name in _TIMESTAMP_COLUMNS:
+            row.pop(name, None)
+        row["job_id"] = target_job_id
+    return await bulk_insert_providers(session, rows, settings.BULK_INSERT_BATCH_SIZE)
+
+
+async def archive_expired_jobs(session_factory, retention_days: float) -> List[str]:
+    """
+    Archive every completed job last updated more than retention_days ago
+
+    Returns:
+        Job ids archived
+    """
+    cutoff = datetime.now(timezone.utc).replace(tzinfo=None) - timedelta(days=retention_days)
+    async with session_factory() as session:
+        result = await session.execute(
+            select(ValidationJob.job_id)
+            .where(ValidationJob.status == "completed")
+            .where(ValidationJob.updated_at < cutoff)
+            .where(ValidationJob.job_id.not_in(select(ArchivedJob.job_id)))
+            .order_by(ValidationJob.updated_at)
+        )
+        job_ids = list(result.scalars().all())
+
+    archived = []
+    for job_id in job_ids:
+        async with session_factory() as session:
+            try:
+                await archive_job(session, job_id)
+                await session.commit()
+                archived.append(job_id)
+            except Exception as e:
+                await session.rollback()
+                print(f"Error archiving job {job_id}: {e}")
+    return archived
+
+
+class JobArchiver:
+    """Periodically archives jobs past the retention window"""
+
+    def __init__(self, session_factory, interval: float, retention_days: float):
+        self.session_factory = session_factory
+        self.interval = interval
+        self.retention_days = retention_days
+        self.runs = 0
+        self.archived = 0
+        self._task: Optional[asyncio.Task] = None
+
+    async def run_once(self) -> List[str]:
+        job_ids = await archive_expired_jobs(self.session_factory, self.retention_days)
+        self.runs += 1
+        self.archived += len(job_ids)
+        return job_ids
+
+    async def _run(self):
+        while True:
+            await asyncio.sleep(self.interval)
+            try:
+                await self.run_once()
+            except Exception as e:
+                print(f"Error running job archival: {e}")
+
+    def start(self):
+        if self._task is None and self.interval > 0:
+            self._task = asyncio.get_running_loop().create_task(self._run())
+
+    async def stop(self):
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
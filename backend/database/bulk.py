@@ -0,0 +1,164 @@
+"""
+Bulk insert paths for provider rows
+
+Rows go straight to the providers table through Core executemany (or COPY on
+PostgreSQL with asyncpg), bypassing the ORM unit of work, so no Provider
+objects are created and the session identity map stays empty.
+"""
+import json
+from datetime import datetime, timezone
+from typing import Dict, Any, List, Optional
+from sqlalchemy import insert, select, literal, func, JSON
+from sqlalchemy.types import TypeDecorator
+from sqlalchemy.ext.asyncio import AsyncSession
+from database.models import Provider
+
+
+# Roster fields copied from the original row onto Provider columns
+PROVIDER_FIELDS = [
+    "name", "npi", "specialty", "phone", "email",
+    "address", "city", "state", "zip_code", "website"
+]
+
+_TIMESTAMP_COLUMNS = ("created_at", "updated_at")
+
+
+def _scalar_defaults() -> Dict[str, Any]:
+    """Python-side scalar column defaults of the providers table"""
+    defaults = {}
+    for column in Provider.__table__.columns:
+        if column.default is not None and column.default.is_scalar:
+            defaults[column.name] = column.default.arg
+    return defaults
+
+
+def build_provider_rows(
+    job_id: str,
+    records: List[Dict[str, Any]],
+    canonical: Optional[List[Dict[str, Any]]] = None,
+    original_data: Optional[List[Dict[str, Any]]] = None
+) -> List[Dict[str, Any]]:
+    """
+    Build provider table rows for a batch of roster records
+
+    Args:
+        job_id: Owning job
+        records: Roster rows as dictionaries
+        canonical: Canonical contact fields per row (see utils.canonical)
+        original_data: Value stored as original_data per row; defaults to the record
+
+    Returns:
+        One dictionary per row, all with the same keys
+    """
+    defaults = _scalar_defaults()
+    rows = []
+    for index, record in enumerate(records):
+        row = dict(defaults)
+        row["job_id"] = job_id
+        row["original_data"] = original_data[index] if original_data is not None else record
+        for field in PROVIDER_FIELDS:
+            row[field] = record.get(field)
+        if row["name"] is None:
+            row["name"] = ""
+        if canonical is not None:
+            row.update(canonical[index])
+        rows.append(row)
+    return rows
+
+
+async def bulk_insert_providers(
+    session: AsyncSession,
+    rows: List[Dict[str, Any]],
+    batch_size: int = 1000
+) -> int:
+    """
+    Insert provider rows without going through the ORM
+
+    Args:
+        session: Database session (the insert joins its transaction)
+        rows: Rows from build_provider_rows
+        batch_size: Rows per executemany / COPY call
+
+    Returns:
+        Number of rows inserted
+    """
+    if not rows:
+        return 0
+
+    connection = await session.connection()
+    use_copy = connection.dialect.name == "postgresql" and connection.dialect.driver == "asyncpg"
+
+    for start in range(0, len(rows), batch_size):
+        batch = rows[start:start + batch_size]
+        if use_copy:
+            await _copy_rows(connection, batch)
+        else:
+            await connection.execute(insert(Provider.__table__), batch)
+
+    return len(rows)
+
+
+async def _copy_rows(connection, rows: List[Dict[str, Any]]):
+    """COPY a batch into the providers table through the asyncpg driver connection"""
+    table = Provider.__table__
+    now = datetime.now(timezone.utc).replace(tzinfo=None)
+    columns = list(rows[0].keys()) + [
+        name for name in _TIMESTAMP_COLUMNS if name not in rows[0]
+    ]
+    # COPY bypasses SQLAlchemy's bind processing, so encode documents here:
+    # asyncpg expects JSON as text and CompressedJSON columns as bytes
+    encoders = {}
+    for column in table.columns:
+        if column.name not in columns:
+            continue
+        column_type = column.type.dialect_impl(connection.dialect)
+        if isinstance(column_type, JSON):
+            encoders[column.name] = json.dumps
+        elif isinstance(column_type, TypeDecorator):
+            encoders[column.name] = column_type.bind_processor(connection.dialect)
+
+    records = []
+    for row in rows:
+        values = []
+        for name in columns:
+            if name in _TIMESTAMP_COLUMNS and name not in row:
+                values.append(now)
+            elif name in encoders and row.get(name) is not None:
+                values.append(encoders[name](row[name]))
+            else:
+                values.append(row.get(name))
+        records.append(tuple(values))
+
+    raw_connection = await connection.get_raw_connection()
+    await raw_connection.driver_connection.copy_records_to_table(
+        table.name, records=records, columns=columns
+    )
+
+
+async def clone_job_providers(session: AsyncSession, source_job_id: str, target_job_id: str) -> int:
+    """
+    Copy every provider row of a job, with its validation results, to another job
+
+    Runs as a single INSERT ... SELECT inside the database.
+
+    Returns:
+        Number of rows copied
+    """
+    table = Provider.__table__
+    copied = [
+        column for column in table.columns
+        if column.name not in ("id", "job_id") + _TIMESTAMP_COLUMNS
+    ]
+    source = select(
+        literal(target_job_id).label("job_id"),
+        *copied,
+        *[func.now().label(name) for name in _TIMESTAMP_COLUMNS]
+    ).where(table.c.job_id == source_job_id)
+
+    result = await session.execute(
+        insert(table).from_select(
+            ["job_id"] + [column.name for column in copied] + list(_TIMESTAMP_COLUMNS),
+            source
+        )
+    )
+    return result.rowcount
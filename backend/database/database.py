@@ -1,15 +1,65 @@
 """
 Database connection and session management
 """
+from typing import Dict, Any, Optional
+from fastapi import Response
 from sqlalchemy.ext.asyncio import create_async_engine, AsyncSession, async_sessionmaker
+from sqlalchemy import inspect, MetaData
+from sqlalchemy.schema import CreateTable
+from sqlalchemy.engine import make_url
 from sqlalchemy.orm import declarative_base
 from config import settings
+from database.sqlite import install_sqlite_profile, install_snapshot_transactions, WalCheckpointer
+from database.snapshot import open_snapshot, snapshot_headers
+
+# Serializes schema creation when several API nodes start against one PostgreSQL database
+_SCHEMA_LOCK_ID = 724205113
+
+
+def database_url(url: str) -> str:
+    """Use the async driver for plain postgres:// / postgresql:// URLs"""
+    parsed = make_url(url)
+    if parsed.drivername in ("postgres", "postgresql"):
+        parsed = parsed.set(drivername="postgresql+asyncpg")
+    return parsed.render_as_string(hide_password=False)
+
+
+def engine_options(url: str) -> Dict[str, Any]:
+    """Pool and driver options for the configured database"""
+    options = {"echo": settings.DEBUG, "future": True}
+    if make_url(url).get_backend_name() == "postgresql":
+        options.update(
+            pool_size=settings.DB_POOL_SIZE,
+            max_overflow=settings.DB_MAX_OVERFLOW,
+            pool_timeout=settings.DB_POOL_TIMEOUT,
+            pool_recycle=settings.DB_POOL_RECYCLE,
+            # Connections dropped by the server or a proxy are replaced instead of failing a request
+            pool_pre_ping=True,
+            connect_args={
+                "command_timeout": settings.DB_COMMAND_TIMEOUT,
+                "server_settings": {
+                    "application_name": "provider-validation",
+                    # Short OLTP queries; JIT compilation only adds latency
+                    "jit": "off"
+                }
+            }
+        )
+    return options
+
 
 # Create async engine
 engine = create_async_engine(
-    settings.DATABASE_URL,
-    echo=settings.DEBUG,
-    future=True
+    database_url(settings.DATABASE_URL),
+    **engine_options(settings.DATABASE_URL)
+)
+
+# SQLite pragmas (WAL, synchronous, cache sizes) on every new connection
+sqlite_profile_installed = install_sqlite_profile(engine, settings.SQLITE_PROFILE)
+
+# Periodic WAL checkpoints, only when the database runs in WAL mode
+wal_checkpointer = (
+    WalCheckpointer(engine, settings.SQLITE_CHECKPOINT_INTERVAL)
+    if sqlite_profile_installed else None
 )
 
 # Create async session factory
@@ -19,6 +69,47 @@ AsyncSessionLocal = async_sessionmaker(
     expire_on_commit=False
 )
 
+
+def _create_read_engine():
+    """
+    Engine for read-only sessions: the replica when READ_REPLICA_URL is set,
+    otherwise a separate query_only connection pool on the same SQLite file
+    (reads then never queue behind writers for a pooled connection), or the
+    primary engine
+    """
+    if settings.READ_REPLICA_URL:
+        url = settings.READ_REPLICA_URL
+    else:
+        url = settings.DATABASE_URL
+        parsed = make_url(url)
+        if parsed.get_backend_name() != "sqlite" or parsed.database in (None, "", ":memory:"):
+            return engine
+
+    read_engine = create_async_engine(database_url(url), **engine_options(url))
+    if install_sqlite_profile(read_engine, settings.SQLITE_PROFILE, read_only=True):
+        install_snapshot_transactions(read_engine)
+    return read_engine
+
+
+def _read_sessionmaker(bind):
+    """
+    Sessions for GET endpoints; PostgreSQL runs their transactions as
+    REPEATABLE READ, READ ONLY so every query of a request sees one snapshot
+    """
+    if bind.dialect.name == "postgresql":
+        bind = bind.execution_options(postgresql_readonly=True, isolation_level="REPEATABLE READ")
+    return async_sessionmaker(bind, class_=AsyncSession, expire_on_commit=False, autoflush=False)
+
+
+read_engine = _create_read_engine()
+
+ReadSessionLocal = _read_sessionmaker(read_engine)
+
+# Reads fall back to the primary while the replica lags too far behind
+PrimaryReadSessionLocal: Optional[async_sessionmaker] = (
+    _read_sessionmaker(engine) if settings.READ_REPLICA_URL else None
+)
+
 # Base class for models
 Base = declarative_base()
 
@@ -36,9 +127,139 @@ async def get_db() -> AsyncSession:
             await session.close()
 
 
+async def get_read_db(response: Response) -> AsyncSession:
+    """
+    Dependency for read-only endpoints: one snapshot per request, nothing
+    flushed or committed, and the snapshot's freshness reported in the
+    X-Data-As-Of / X-Data-Staleness / X-Read-Source headers
+    """
+    source = "replica" if settings.READ_REPLICA_URL else "primary"
+    session = ReadSessionLocal()
+    try:
+        snapshot = await open_snapshot(session, source)
+        if (
+            snapshot["staleness_seconds"] > settings.READ_MAX_STALENESS_SECONDS
+            and PrimaryReadSessionLocal is not None
+        ):
+            await session.close()
+            session = PrimaryReadSessionLocal()
+            snapshot = await open_snapshot(session, "primary")
+        response.headers.update(snapshot_headers(snapshot))
+        yield session
+    finally:
+        await session.close()
+
+
+def _add_missing_columns(connection):
+    """
+    Add columns added to existing tables since they were first created
+
+    create_all only creates missing tables, so a database from before the
+    canonical contact fields or content hashes gets those columns here. New
+    columns are all nullable and start out NULL for existing rows.
+    """
+    inspector = inspect(connection)
+    preparer = connection.dialect.identifier_preparer
+    for table in Base.metadata.sorted_tables:
+        existing = {column["name"] for column in inspector.get_columns(table.name)}
+        for column in table.columns:
+            if column.name in existing:
+                continue
+            column_type = column.type.compile(dialect=connection.dialect)
+            connection.exec_driver_sql(
+                f"ALTER TABLE {preparer.format_table(table)} "
+                f"ADD COLUMN {preparer.format_column(column)} {column_type}"
+            )
+
+
+# Catalog column with the highest id each table had archived (see database.archive)
+_ARCHIVED_ID_COLUMNS = {"providers": "max_provider_id", "validation_logs": "max_log_id"}
+
+
+def _archived_max_id(connection, table_name: str) -> int:
+    """Highest id of a table's rows that were moved to archive files"""
+    from database.archive import archive_file_max_id
+
+    column = _ARCHIVED_ID_COLUMNS.get(table_name)
+    if column is None:
+        return 0
+    highest = connection.exec_driver_sql(f"SELECT max({column}) FROM archived_jobs").scalar() or 0
+    if table_name == "validation_logs":
+        # Archives written before max_log_id was recorded: read the ids in their files
+        paths = connection.exec_driver_sql(
+            "SELECT logs_path FROM archived_jobs WHERE max_log_id IS NULL AND logs_path IS NOT NULL"
+        ).scalars().all()
+        for path in paths:
+            highest = max(highest, archive_file_max_id(path) or 0)
+    return highest
+
+
+def _use_autoincrement_ids(connection):
+    """
+    Rebuild SQLite tables declared with sqlite_autoincrement that were created without it
+
+    Without AUTOINCREMENT SQLite reuses the ids of deleted rows, so providers
+    created after a job was archived would take the ids of its archived
+    providers. Each table is copied into a new AUTOINCREMENT table with its
+    ids unchanged, and the id sequence starts above every archived provider
+    or log id. Indexes are recreated by _create_missing_indexes and the
+    full-text triggers by install_search_index.
+    """
+    if connection.dialect.name != "sqlite":
+        return
+    inspector = inspect(connection)
+    for table in Base.metadata.sorted_tables:
+        if not table.dialect_options["sqlite"]["autoincrement"]:
+            continue
+        create_sql = connection.exec_driver_sql(
+            "SELECT sql FROM sqlite_master WHERE type = 'table' AND name = ?", (table.name,)
+        ).scalar()
+        if create_sql is None or "AUTOINCREMENT" in create_sql.upper():
+            continue
+
+        for index in inspector.get_indexes(table.name):
+            connection.exec_driver_sql(f'DROP INDEX "{index["name"]}"')
+        # Other tables are copied along only so the new table's foreign keys resolve
+        metadata = MetaData()
+        for other in Base.metadata.sorted_tables:
+            if other is not table:
+                other.to_metadata(metadata)
+        rebuilt = table.to_metadata(metadata, name=f"_rebuild_{table.name}")
+        connection.execute(CreateTable(rebuilt))
+        columns = ", ".join(f'"{column.name}"' for column in table.columns)
+        connection.exec_driver_sql(
+            f'INSERT INTO "{rebuilt.name}" ({columns}) SELECT {columns} FROM "{table.name}"'
+        )
+        connection.exec_driver_sql(f'DROP TABLE "{table.name}"')
+        connection.exec_driver_sql(f'ALTER TABLE "{rebuilt.name}" RENAME TO "{table.name}"')
+
+        last_id = connection.exec_driver_sql(f'SELECT max(id) FROM "{table.name}"').scalar() or 0
+        last_id = max(last_id, _archived_max_id(connection, table.name))
+        connection.exec_driver_sql("DELETE FROM sqlite_sequence WHERE name = ?", (table.name,))
+        connection.exec_driver_sql("INSERT INTO sqlite_sequence (name, seq) VALUES (?, ?)", (table.name, last_id))
+
+
+def _create_missing_indexes(connection):
+    """Create indexes added to existing tables since they were first created (after _add_missing_columns)"""
+    inspector = inspect(connection)
+    for table in Base.metadata.sorted_tables:
+        existing = {index["name"] for index in inspector.get_indexes(table.name)}
+        for index in table.indexes:
+            if index.name not in existing:
+                index.create(connection)
+
+
 async def init_db():
     """Initialize database tables"""
+    from database.search import install_search_index
+
     async with engine.begin() as conn:
+        if conn.dialect.name == "postgresql":
+            await conn.exec_driver_sql(f"SELECT pg_advisory_xact_lock({_SCHEMA_LOCK_ID})")
         await conn.run_sync(Base.metadata.create_all)
+        await conn.run_sync(_add_missing_columns)
+        await conn.run_sync(_use_autoincrement_ids)
+        await conn.run_sync(_create_missing_indexes)
+        await conn.run_sync(install_search_index)
 
 
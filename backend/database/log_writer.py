@@ -0,0 +1,222 @@
+"""
+Buffered writer for validation log rows
+
+Agents enqueue log records in memory; a background task bulk-inserts them
+once a batch fills up or the flush interval passes, so logging costs one
+round trip per batch instead of one flush per agent action. The queue is
+bounded: when it is full, the "block" policy makes callers wait for the
+writer (backpressure) and the "drop" policy discards the record and counts
+it. Pending records are drained on shutdown. A batch the database rejects
+is not retried; its rows and the error are counted in the stats.
+"""
+import asyncio
+import json
+import time
+from datetime import datetime, timezone
+from typing import Dict, Any, List, Optional
+from sqlalchemy import insert
+from config import settings
+
+
+POLICIES = ("block", "drop")
+
+_STOP = object()
+
+
+class ValidationLogWriter:
+    """Bounded in-memory queue of ValidationLog rows with a background bulk insert"""
+
+    def __init__(
+        self,
+        session_factory,
+        max_queue: int,
+        batch_size: int,
+        flush_interval: float,
+        policy: str = "block"
+    ):
+        if policy not in POLICIES:
+            raise ValueError(f"Unknown log writer policy: {policy}")
+        self.session_factory = session_factory
+        self.max_queue = max_queue
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self.policy = policy
+        self.enqueued = 0
+        self.written = 0
+        self.dropped = 0
+        self.failed = 0
+        self.batches = 0
+        self.failed_batches = 0
+        self.last_error: Optional[str] = None
+        self.total_flush_seconds = 0.0
+        self._queue: Optional[asyncio.Queue] = None
+        self._flush_requested: Optional[asyncio.Event] = None
+        self._progress: Optional[asyncio.Condition] = None
+        self._task: Optional[asyncio.Task] = None
+        self._stopping = False
+
+    @property
+    def running(self) -> bool:
+        return self._task is not None
+
+    def start(self):
+        if self._task is None:
+            self._stopping = False
+            self._queue = asyncio.Queue(maxsize=self.max_queue)
+            self._flush_requested = asyncio.Event()
+            self._progress = asyncio.Condition()
+            self._task = asyncio.get_running_loop().create_task(self._run())
+
+    async def write(
+        self,
+        job_id: str,
+        provider_id: Optional[int],
+        agent_name: str,
+        action: str,
+        result: Dict[str, Any]
+    ) -> bool:
+        """
+        Queue a log row
+
+        The result is copied as JSON when queued, so later changes the agent
+        makes to the dictionary do not leak into the row written.
+
+        Returns:
+            False if the row was dropped because the queue is full
+        """
+        row = {
+            "job_id": job_id,
+            "provider_id": provider_id,
+            "agent_name": agent_name,
+            "action": action,
+            "result": json.loads(json.dumps(result, default=str)),
+            # Stamped when the action happened, not when the batch is written
+            "timestamp": datetime.now(timezone.utc).replace(tzinfo=None)
+        }
+        if self.policy == "drop":
+            try:
+                self._queue.put_nowait(row)
+            except asyncio.QueueFull:
+                self.dropped += 1
+                return False
+        else:
+            await self._queue.put(row)
+        self.enqueued += 1
+        return True
+
+    async def _next_batch(self) -> List[Dict[str, Any]]:
+        """Wait for the first row, then collect until the batch is full or the interval passes"""
+        batch = []
+        deadline = None
+        while len(batch) < self.batch_size:
+            try:
+                row = self._queue.get_nowait()
+            except asyncio.QueueEmpty:
+                if deadline is None:
+                    row = await self._queue.get()
+                else:
+                    remaining = deadline - time.monotonic()
+                    if remaining <= 0 or self._flush_requested.is_set():
+                        break
+                    try:
+                        row = await asyncio.wait_for(self._queue.get(), timeout=remaining)
+                    except asyncio.TimeoutError:
+                        break
+            if row is _STOP:
+                self._stopping = True
+                break
+            batch.append(row)
+            if deadline is None:
+                deadline = time.monotonic() + self.flush_interval
+        return batch
+
+    async def _insert(self, batch: List[Dict[str, Any]]):
+        from database.models import ValidationLog
+
+        started = time.perf_counter()
+        try:
+            async with self.session_factory() as session:
+                await session.execute(insert(ValidationLog.__table__), batch)
+                await session.commit()
+            self.written += len(batch)
+        except Exception as e:
+            self.failed += len(batch)
+            self.failed_batches += 1
+            self.last_error = f"{type(e).__name__}: {e}"
+            print(f"Error writing {len(batch)} validation logs: {e}")
+        self.batches += 1
+        self.total_flush_seconds += time.perf_counter() - started
+
+        async with self._progress:
+            self._progress.notify_all()
+
+    async def _run(self):
+        while not self._stopping:
+            batch = await self._next_batch()
+            if self._queue.empty():
+                self._flush_requested.clear()
+            if batch:
+                await self._insert(batch)
+
+    async def flush(self):
+        """Wait until every row queued so far has been written (or has failed)"""
+        if not self.running:
+            return
+        target = self.enqueued
+        self._flush_requested.set()
+        async with self._progress:
+            await self._progress.wait_for(lambda: self.written + self.failed >= target)
+
+    async def stop(self):
+        """Write whatever is still queued, then stop the background task"""
+        if self._task is None:
+            return
+        # Queued behind every pending row, so the writer drains the queue before exiting
+        await self._queue.put(_STOP)
+        await self._task
+        self._task = None
+
+    def stats(self) -> Dict[str, Any]:
+        """Queue depth, throughput and loss counters"""
+        return {
+            "running": self.running,
+            "policy": self.policy,
+            "max_queue": self.max_queue,
+            "queued": self._queue.qsize() if self._queue is not None else 0,
+            "enqueued": self.enqueued,
+            "written": self.written,
+            "dropped": self.dropped,
+            "failed": self.failed,
+            "batches": self.batches,
+            "failed_batches": self.failed_batches,
+            "last_error": self.last_error,
+            "avg_batch_size": (self.written + self.failed) / self.batches if self.batches else 0.0,
+            "avg_flush_ms": (self.total_flush_seconds / self.batches * 1000) if self.batches else 0.0
+        }
+
+
+_writer: Optional[ValidationLogWriter] = None
+
+
+def get_log_writer() -> ValidationLogWriter:
+    """Process-wide validation log writer, created on first use"""
+    global _writer
+    if _writer is None:
+        from database.database import AsyncSessionLocal
+
+        _writer = ValidationLogWriter(
+            AsyncSessionLocal,
+            settings.LOG_WRITER_QUEUE_SIZE,
+            settings.LOG_WRITER_BATCH_SIZE,
+            settings.LOG_WRITER_FLUSH_INTERVAL,
+            settings.LOG_WRITER_POLICY
+        )
+    return _writer
+
+
+async def shutdown_log_writer():
+    """Drain and stop the log writer, if it was started"""
+    global _writer
+    if _writer is not None:
+        await _writer.stop()
+        _writer = None
@@ -1,11 +1,21 @@
 """
 SQLAlchemy database models
 """
-from sqlalchemy import Column, Integer, String, Float, Boolean, DateTime, Text, JSON, ForeignKey
-from sqlalchemy.orm import relationship
+from sqlalchemy import Column, Integer, String, Float, Boolean, DateTime, Text, JSON, ForeignKey, Index
+from sqlalchemy.dialects.postgresql import JSONB
+from sqlalchemy.orm import relationship, deferred
 from sqlalchemy.sql import func
 from datetime import datetime
 from database.database import Base
+from database.types import CompressedJSON
+
+
+# JSON documents; stored as JSONB on PostgreSQL
+JSONDocument = JSON().with_variant(JSONB(), "postgresql")
+
+# Bulky provider documents; compressed bytes on SQLite, JSONB on PostgreSQL
+# (which TOAST-compresses large values itself)
+ProviderDocument = CompressedJSON().with_variant(JSONB(), "postgresql")
 
 
 class ValidationJob(Base):
@@ -21,6 +31,10 @@ class ValidationJob(Base):
     updated_at = Column(DateTime, default=func.now(), onupdate=func.now())
     error_message = Column(Text, nullable=True)
     
+    # SHA-256 of the uploaded file, used to detect re-uploads
+    content_hash = Column(String, index=True, nullable=True)
+    cloned_from = Column(String, nullable=True)
+    
     providers = relationship("Provider", back_populates="job")
 
 
@@ -31,8 +45,9 @@ class Provider(Base):
     id = Column(Integer, primary_key=True, index=True)
     job_id = Column(String, ForeignKey("validation_jobs.job_id"))
     
-    # Original data
-    original_data = Column(JSON)  # Store original CSV/PDF data
+    # Original data (whole OCR text for PDFs); bulky documents are deferred,
+    # so list pages and aggregates do not load them
+    original_data = deferred(Column(ProviderDocument), raiseload=True)  # Store original CSV/PDF data
     
     # Provider details
     npi = Column(String, index=True, nullable=True)
@@ -46,6 +61,16 @@ class Provider(Base):
     zip_code = Column(String, nullable=True)
     website = Column(String, nullable=True)
     
+    # Canonical forms and format checks computed at ingest
+    canonical_phone = Column(String, nullable=True)
+    phone_valid = Column(Boolean, nullable=True)
+    canonical_email = Column(String, nullable=True)
+    email_valid = Column(Boolean, nullable=True)
+    canonical_zip = Column(String, nullable=True)
+    zip_valid = Column(Boolean, nullable=True)
+    canonical_website = Column(String, nullable=True)
+    website_valid = Column(Boolean, nullable=True)
+    
     # Validated data
     validated_name = Column(String, nullable=True)
     validated_phone = Column(String, nullable=True)
@@ -55,7 +80,7 @@ class Provider(Base):
     validated_website = Column(String, nullable=True)
     
     # Enrichment data
-    enriched_data = Column(JSON, nullable=True)
+    enriched_data = deferred(Column(ProviderDocument, nullable=True), raiseload=True)
     
     # Confidence scores (0-1)
     confidence_name = Column(Float, default=0.0)
@@ -71,7 +96,7 @@ class Provider(Base):
     is_validated = Column(Boolean, default=False)
     
     # Issues and notes
-    issues = Column(JSON, nullable=True)  # List of issues found
+    issues = deferred(Column(ProviderDocument, nullable=True), raiseload=True)  # List of issues found
     validation_notes = Column(Text, nullable=True)
     
     # Timestamps
@@ -79,6 +104,19 @@ class Provider(Base):
     updated_at = Column(DateTime, default=func.now(), onupdate=func.now())
     
     job = relationship("ValidationJob", back_populates="providers")
+    
+    __table_args__ = (
+        # Job-scoped scans in id order: pipeline load, paging, download, counts
+        Index("ix_providers_job_id_id", "job_id", "id"),
+        # Review queues and dashboard stats filtered by job and review flag
+        Index("ix_providers_job_review_confidence", "job_id", "needs_review", "confidence_overall"),
+        # Keyset pages sorted by confidence and listings filtered by state or specialty
+        Index("ix_providers_job_confidence_id", "job_id", "confidence_overall", "id"),
+        Index("ix_providers_job_state_id", "job_id", "state", "id"),
+        Index("ix_providers_job_specialty_id", "job_id", "specialty", "id"),
+        # Ids of archived (deleted) providers are never handed out again
+        {"sqlite_autoincrement": True},
+    )
 
 
 class ValidationLog(Base):
@@ -87,10 +125,46 @@ class ValidationLog(Base):
     
     id = Column(Integer, primary_key=True, index=True)
     job_id = Column(String, index=True)
-    provider_id = Column(Integer, ForeignKey("providers.id"))
+    provider_id = Column(Integer, ForeignKey("providers.id"), index=True)
     agent_name = Column(String)  # validation, enrichment, qa, directory
     action = Column(String)
-    result = Column(JSON)
+    result = Column(JSONDocument)
     timestamp = Column(DateTime, default=func.now())
+    
+    __table_args__ = {"sqlite_autoincrement": True}
+
+
 
 
+class ColumnMapping(Base):
+    """Inferred roster column mapping, keyed by header signature"""
+    __tablename__ = "column_mappings"
+    
+    id = Column(Integer, primary_key=True, index=True)
+    signature = Column(String, unique=True, index=True)
+    headers = Column(JSONDocument)  # Header row as it appeared in the file
+    mapping = Column(JSONDocument)  # Source column -> provider field
+    created_at = Column(DateTime, default=func.now())
+
+
+class ArchivedJob(Base):
+    """Catalog entry of a job whose providers and logs were moved to Parquet files"""
+    __tablename__ = "archived_jobs"
+    
+    id = Column(Integer, primary_key=True, index=True)
+    job_id = Column(String, unique=True, index=True)
+    providers_path = Column(String)
+    logs_path = Column(String, nullable=True)
+    provider_count = Column(Integer, default=0)
+    log_count = Column(Integer, default=0)
+    # Provider id range, to find the archive holding a provider by id
+    min_provider_id = Column(Integer, nullable=True)
+    max_provider_id = Column(Integer, nullable=True)
+    max_log_id = Column(Integer, nullable=True)  # Highest archived log id; log ids above it are new
+    bytes = Column(Integer, default=0)  # Size of the archive files
+    summary = Column(JSONDocument)  # Dashboard counts (see database.archive.provider_summary)
+    archived_at = Column(DateTime, default=func.now())
+    
+    __table_args__ = (
+        Index("ix_archived_jobs_provider_range", "min_provider_id", "max_provider_id"),
+    )
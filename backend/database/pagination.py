@@ -0,0 +1,167 @@
+"""
+Keyset pagination for provider listings
+
+A page is requested with an opaque cursor holding the sort key of the last
+row already seen, and the next page is read with a range condition on that
+key instead of OFFSET, so every page costs one index range scan of page
+size rows however deep the reviewer has paged. Each sort key ends with
+Provider.id so ties in confidence still produce a strict order.
+"""
+import base64
+import json
+from dataclasses import dataclass
+from typing import Dict, Any, List, Optional, Tuple
+from sqlalchemy import tuple_
+from database.models import Provider
+
+
+class InvalidCursorError(Exception):
+    """Raised when a cursor cannot be decoded or belongs to another sort"""
+
+
+# Sort name -> (columns, descending). Backed by ix_providers_job_id_id,
+# ix_providers_job_confidence_id and, with needs_review set,
+# ix_providers_job_review_confidence.
+SORT_KEYS: Dict[str, Tuple[Tuple[str, ...], bool]] = {
+    "id": (("id",), False),
+    "-id": (("id",), True),
+    "confidence": (("confidence_overall", "id"), False),
+    "-confidence": (("confidence_overall", "id"), True),
+}
+
+
+@dataclass
+class ProviderFilters:
+    """Optional filters of a provider listing"""
+    needs_review: Optional[bool] = None
+    is_suspicious: Optional[bool] = None
+    is_validated: Optional[bool] = None
+    state: Optional[str] = None
+    specialty: Optional[str] = None
+    min_confidence: Optional[float] = None
+    max_confidence: Optional[float] = None
+
+    def clauses(self) -> List[Any]:
+        """SQL conditions for the filters that are set"""
+        clauses = []
+        for name in ("needs_review", "is_suspicious", "is_validated", "state", "specialty"):
+            value = getattr(self, name)
+            if value is not None:
+                clauses.append(getattr(Provider, name) == value)
+        if self.min_confidence is not None:
+            clauses.append(Provider.confidence_overall >= self.min_confidence)
+        if self.max_confidence is not None:
+            clauses.append(Provider.confidence_overall <= self.max_confidence)
+        return clauses
+
+    def parquet_filters(self) -> List[tuple]:
+        """The same conditions as pyarrow filters, for archived jobs"""
+        filters = []
+        for name in ("needs_review", "is_suspicious", "is_validated", "state", "specialty"):
+            value = getattr(self, name)
+            if value is not None:
+                filters.append((name, "=", value))
+        if self.min_confidence is not None:
+            filters.append(("confidence_overall", ">=", self.min_confidence))
+        if self.max_confidence is not None:
+            filters.append(("confidence_overall", "<=", self.max_confidence))
+        return filters
+
+
+def encode_cursor(sort: str, row: Any) -> str:
+    """Cursor pointing just past a row (a Provider or any object with its attributes)"""
+    columns, _ = SORT_KEYS[sort]
+    payload = {"sort": sort, "after": [getattr(row, name) for name in columns]}
+    data = json.dumps(payload, separators=(",", ":")).encode("utf-8")
+    return base64.urlsafe_b64encode(data).decode("ascii").rstrip("=")
+
+
+def decode_cursor(cursor: str, sort: str) -> List[Any]:
+    """
+    Sort key values stored in a cursor
+
+    Raises:
+        InvalidCursorError: Malformed cursor, or one issued for a different sort
+    """
+    try:
+        data = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4))
+        payload = json.loads(data)
+        cursor_sort = payload["sort"]
+        after = payload["after"]
+    except (ValueError, TypeError, KeyError):
+        raise InvalidCursorError("Malformed cursor")
+    if cursor_sort != sort:
+        raise InvalidCursorError(f"Cursor was issued for sort={cursor_sort}")
+    columns, _ = SORT_KEYS[sort]
+    if not isinstance(after, list) or len(after) != len(columns):
+        raise InvalidCursorError("Malformed cursor")
+    return after
+
+
+def _after_clause(sort: str, after: List[Any]):
+    columns, descending = SORT_KEYS[sort]
+    keys = [getattr(Provider, name) for name in columns]
+    if len(keys) == 1:
+        return keys[0] < after[0] if descending else keys[0] > after[0]
+    # Row-value comparison, matched against the composite index by SQLite and PostgreSQL
+    if descending:
+        return tuple_(*keys) < tuple(after)
+    return tuple_(*keys) > tuple(after)
+
+
+def provider_page_query(
+    query,
+    sort: str = "id",
+    after: Optional[List[Any]] = None,
+    filters: Optional[ProviderFilters] = None
+):
+    """
+    Apply filters, sort order and the keyset condition to a select(Provider)
+
+    Args:
+        query: Select already scoped to a job
+        sort: Key from SORT_KEYS
+        after: Sort key values of the last row of the previous page
+        filters: Optional listing filters
+
+    Returns:
+        The ordered select; the caller applies the limit
+    """
+    columns, descending = SORT_KEYS[sort]
+    if filters is not None:
+        query = query.where(*filters.clauses())
+    if after is not None:
+        query = query.where(_after_clause(sort, after))
+    order = [getattr(Provider, name) for name in columns]
+    if descending:
+        order = [column.desc() for column in order]
+    return query.order_by(*order)
+
+
+def archived_page_filters(
+    sort: str,
+    after: Optional[List[Any]],
+    filters: Optional[ProviderFilters]
+) -> Optional[List[List[tuple]]]:
+    """
+    Filters and keyset condition for read_archived_rows, in pyarrow's
+    disjunctive form (a list of AND-ed lists, OR-ed together)
+    """
+    base = filters.parquet_filters() if filters is not None else []
+    if after is None:
+        return [base] if base else None
+    columns, descending = SORT_KEYS[sort]
+    op = "<" if descending else ">"
+    if len(columns) == 1:
+        return [base + [(columns[0], op, after[0])]]
+    return [
+        base + [(columns[0], op, after[0])],
+        base + [(columns[0], "=", after[0]), (columns[1], op, after[1])]
+    ]
+
+
+def archived_sort(sort: str) -> List[Tuple[str, str]]:
+    """Sort order of a listing as pyarrow sort keys"""
+    columns, descending = SORT_KEYS[sort]
+    order = "descending" if descending else "ascending"
+    return [(name, order) for name in columns]
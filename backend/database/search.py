@@ -0,0 +1,154 @@
+"""
+Full-text provider search
+
+SQLite keeps an FTS5 index (providers_fts, an external-content table over
+providers) in sync with triggers on insert, delete and on updates of the
+searched columns. PostgreSQL gets a stored tsvector column generated from
+the same columns, with a GIN index. Neither is mapped on the Provider
+model: both are maintained by the database, so the ORM, Core executemany
+and COPY insert paths all keep the index current without extra work.
+
+Every search term is matched as a prefix and all terms must match; results
+are ranked by bm25 (SQLite) or ts_rank (PostgreSQL) with name and NPI
+weighted above contact fields.
+"""
+import re
+from typing import Dict, Any, List, Optional
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import AsyncSession
+
+
+class SearchUnavailableError(Exception):
+    """Raised when the database has no full-text index (SQLite built without FTS5)"""
+
+
+# Indexed columns, in FTS5 column order
+SEARCH_COLUMNS = ["name", "npi", "phone", "canonical_phone", "address", "city"]
+
+# bm25 weights per column above; PostgreSQL uses the matching A/B/C/D labels
+_BM25_WEIGHTS = "10.0, 8.0, 4.0, 4.0, 2.0, 2.0"
+_PG_WEIGHTS = {"name": "A", "npi": "A", "phone": "B", "canonical_phone": "B", "address": "C", "city": "C"}
+
+# Columns returned with each hit
+RESULT_COLUMNS = [
+    "id", "job_id", "name", "npi", "specialty", "phone", "address", "city", "state",
+    "confidence_overall", "needs_review"
+]
+
+_fts_available = True
+
+
+def _sqlite_ddl() -> List[str]:
+    columns = ", ".join(SEARCH_COLUMNS)
+    new_values = ", ".join(f"new.{name}" for name in SEARCH_COLUMNS)
+    old_values = ", ".join(f"old.{name}" for name in SEARCH_COLUMNS)
+    delete_old = (
+        f"INSERT INTO providers_fts(providers_fts, rowid, {columns}) VALUES ('delete', old.id, {old_values});"
+    )
+    insert_new = f"INSERT INTO providers_fts(rowid, {columns}) VALUES (new.id, {new_values});"
+    return [
+        f"CREATE VIRTUAL TABLE IF NOT EXISTS providers_fts USING fts5("
+        f"{columns}, content='providers', content_rowid='id', "
+        f"tokenize='unicode61 remove_diacritics 2')",
+        f"CREATE TRIGGER IF NOT EXISTS providers_fts_ai AFTER INSERT ON providers BEGIN {insert_new} END",
+        f"CREATE TRIGGER IF NOT EXISTS providers_fts_ad AFTER DELETE ON providers BEGIN {delete_old} END",
+        f"CREATE TRIGGER IF NOT EXISTS providers_fts_au AFTER UPDATE OF {columns} ON providers "
+        f"BEGIN {delete_old} {insert_new} END",
+    ]
+
+
+def _postgresql_ddl() -> List[str]:
+    # The default parser reads "555-1234" as 555 and -1234; splitting on hyphens
+    # tokenizes like FTS5 and search_terms do
+    document = " || ".join(
+        f"setweight(to_tsvector('simple', translate(coalesce({name}, ''), '-', ' ')), '{weight}')"
+        for name, weight in _PG_WEIGHTS.items()
+    )
+    return [
+        f"ALTER TABLE providers ADD COLUMN IF NOT EXISTS search_vector tsvector "
+        f"GENERATED ALWAYS AS ({document}) STORED",
+        "CREATE INDEX IF NOT EXISTS ix_providers_search_vector ON providers USING gin (search_vector)",
+    ]
+
+
+def install_search_index(connection):
+    """
+    Create the full-text index and its triggers if missing (run from init_db)
+
+    A newly created SQLite index is filled from the existing provider rows.
+    """
+    global _fts_available
+    dialect = connection.dialect.name
+    if dialect == "postgresql":
+        for statement in _postgresql_ddl():
+            connection.exec_driver_sql(statement)
+    elif dialect == "sqlite":
+        exists = connection.exec_driver_sql(
+            "SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'providers_fts'"
+        ).first()
+        try:
+            for statement in _sqlite_ddl():
+                connection.exec_driver_sql(statement)
+        except Exception as e:
+            _fts_available = False
+            print(f"Full-text search disabled: {e}")
+            return
+        if not exists:
+            connection.exec_driver_sql("INSERT INTO providers_fts(providers_fts) VALUES ('rebuild')")
+
+
+def search_terms(query: str) -> List[str]:
+    """Words of a search string; punctuation separates terms like the index tokenizer does"""
+    return re.findall(r"[^\W_]+", query.lower())
+
+
+async def search_providers(
+    session: AsyncSession,
+    query: str,
+    job_id: Optional[str] = None,
+    limit: int = 20
+) -> List[Dict[str, Any]]:
+    """
+    Providers matching every term of a search string, best match first
+
+    Args:
+        session: Database session
+        query: Free text over name, NPI, phone, address and city
+        job_id: Restrict to one job; all jobs by default
+        limit: Maximum number of hits
+
+    Returns:
+        RESULT_COLUMNS of each hit plus its rank (higher is better)
+
+    Raises:
+        SearchUnavailableError: SQLite without FTS5
+    """
+    terms = search_terms(query)
+    if not terms:
+        return []
+    columns = ", ".join(f"providers.{name}" for name in RESULT_COLUMNS)
+    job_filter = "AND providers.job_id = :job_id" if job_id else ""
+    params = {"job_id": job_id, "limit": limit}
+
+    if session.bind.dialect.name == "postgresql":
+        params["query"] = " & ".join(f"{term}:*" for term in terms)
+        statement = text(
+            f"SELECT {columns}, ts_rank(providers.search_vector, q) AS rank "
+            f"FROM providers, to_tsquery('simple', :query) AS q "
+            f"WHERE providers.search_vector @@ q {job_filter} "
+            f"ORDER BY rank DESC, providers.id LIMIT :limit"
+        )
+    else:
+        if not _fts_available:
+            raise SearchUnavailableError("This SQLite build has no FTS5 support")
+        params["query"] = " ".join(f'"{term}"*' for term in terms)
+        # bm25 is lower for better matches; negated so rank reads the same on both backends
+        statement = text(
+            f"SELECT {columns}, -bm25(providers_fts, {_BM25_WEIGHTS}) AS rank "
+            f"FROM providers_fts JOIN providers ON providers.id = providers_fts.rowid "
+            f"WHERE providers_fts MATCH :query {job_filter} "
+            f"ORDER BY rank DESC, providers.id LIMIT :limit"
+        )
+
+    result = await session.execute(statement, params)
+    return [dict(row._mapping) for row in result]
@@ -0,0 +1,72 @@
+"""
+Snapshot bookkeeping for read-only sessions
+
+Every read session runs in one transaction on a consistent snapshot: an
+explicit BEGIN on SQLite's query_only WAL pool, a REPEATABLE READ, READ ONLY
+transaction on PostgreSQL. When the snapshot is opened the session records
+how old the data it sees is: zero on the primary, the replay lag on a
+streaming replica. Read endpoints report this as data_as_of and
+staleness_seconds, and get_read_db moves reads to the primary once a
+replica falls behind READ_MAX_STALENESS_SECONDS.
+"""
+from datetime import datetime, timedelta, timezone
+from typing import Dict, Any
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import AsyncSession
+
+
+# Seconds of WAL not yet replayed on a standby; 0 on a primary or a caught-up standby
+# (pg_last_xact_replay_timestamp alone keeps growing on an idle replica)
+_REPLICA_LAG_SQL = text(
+    "SELECT CASE WHEN NOT pg_is_in_recovery() "
+    "OR pg_last_wal_receive_lsn() = pg_last_wal_replay_lsn() THEN 0 "
+    "ELSE extract(epoch FROM now() - pg_last_xact_replay_timestamp()) END"
+)
+
+
+async def open_snapshot(session: AsyncSession, source: str) -> Dict[str, Any]:
+    """
+    Start the session's read transaction and record how fresh its data is
+
+    On PostgreSQL the lag query is the transaction's first statement, so it
+    also fixes the snapshot every later query of the session reads.
+
+    Args:
+        session: Read-only session
+        source: "primary" or "replica", reported with the snapshot
+
+    Returns:
+        Snapshot info, also stored in session.info["snapshot"]
+    """
+    opened_at = datetime.now(timezone.utc).replace(tzinfo=None)
+    staleness = 0.0
+    if session.bind.dialect.name == "postgresql":
+        staleness = float(await session.scalar(_REPLICA_LAG_SQL) or 0.0)
+    snapshot = {
+        "source": source,
+        "opened_at": opened_at,
+        "data_as_of": opened_at - timedelta(seconds=staleness),
+        "staleness_seconds": staleness
+    }
+    session.info["snapshot"] = snapshot
+    return snapshot
+
+
+def snapshot_fields(session: AsyncSession) -> Dict[str, Any]:
+    """data_as_of and staleness_seconds for a read endpoint's response"""
+    snapshot = session.info.get("snapshot")
+    if snapshot is None:
+        return {}
+    return {
+        "data_as_of": snapshot["data_as_of"],
+        "staleness_seconds": snapshot["staleness_seconds"]
+    }
+
+
+def snapshot_headers(snapshot: Dict[str, Any]) -> Dict[str, str]:
+    """Response headers describing a snapshot"""
+    return {
+        "X-Data-As-Of": snapshot["data_as_of"].isoformat() + "Z",
+        "X-Data-Staleness": f"{snapshot['staleness_seconds']:.3f}",
+        "X-Read-Source": snapshot["source"]
+    }
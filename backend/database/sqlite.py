@@ -0,0 +1,182 @@
+"""
+SQLite connection profile and WAL checkpointing
+
+The "performance" profile puts the database in WAL mode with
+synchronous=NORMAL, so pipeline commits no longer block dashboard reads and
+do not fsync on every transaction, and sizes the page cache and memory map
+for large jobs. A background task checkpoints the WAL periodically so it
+does not grow without bound while readers keep old snapshots alive.
+"""
+import asyncio
+import time
+from typing import Dict, Any, List, Optional, Tuple
+from sqlalchemy import event
+from config import settings
+
+
+def sqlite_pragmas(profile: str) -> List[Tuple[str, Any]]:
+    """
+    PRAGMA statements applied to every new connection for a profile
+
+    Args:
+        profile: "default" (SQLite's own settings) or "performance"
+
+    Returns:
+        (pragma, value) pairs in the order they are applied
+    """
+    if profile == "default":
+        return []
+    if profile != "performance":
+        raise ValueError(f"Unknown SQLite profile: {profile}")
+    return [
+        ("journal_mode", "WAL"),
+        ("synchronous", settings.SQLITE_SYNCHRONOUS),
+        ("busy_timeout", settings.SQLITE_BUSY_TIMEOUT_MS),
+        # Negative cache_size is in KiB rather than pages
+        ("cache_size", -settings.SQLITE_CACHE_SIZE_KB),
+        ("mmap_size", settings.SQLITE_MMAP_SIZE),
+        ("temp_store", "MEMORY")
+    ]
+
+
+def apply_pragmas(dbapi_connection, pragmas: List[Tuple[str, Any]]):
+    """Run PRAGMA statements on a raw DB-API connection"""
+    cursor = dbapi_connection.cursor()
+    try:
+        for name, value in pragmas:
+            cursor.execute(f"PRAGMA {name}={value}")
+    finally:
+        cursor.close()
+
+
+def install_sqlite_profile(engine, profile: str, read_only: bool = False) -> bool:
+    """
+    Apply a profile's pragmas to each connection the engine opens
+
+    Args:
+        engine: Engine (sync or async) to configure
+        profile: Profile name, see sqlite_pragmas
+        read_only: Also set query_only, so the connections cannot write
+
+    Returns:
+        True if pragmas were installed, False for non-SQLite engines or when there are none
+    """
+    sync_engine = getattr(engine, "sync_engine", engine)
+    if sync_engine.dialect.name != "sqlite":
+        return False
+    pragmas = sqlite_pragmas(profile)
+    if read_only:
+        pragmas = pragmas + [("query_only", "ON")]
+    if not pragmas:
+        return False
+
+    @event.listens_for(sync_engine, "connect")
+    def _set_pragmas(dbapi_connection, connection_record):
+        apply_pragmas(dbapi_connection, pragmas)
+
+    return True
+
+
+def journal_mode(dbapi_connection) -> str:
+    """Journal mode of the database a raw DB-API connection is open on, lower case"""
+    cursor = dbapi_connection.cursor()
+    try:
+        cursor.execute("PRAGMA journal_mode")
+        return str(cursor.fetchone()[0]).lower()
+    finally:
+        cursor.close()
+
+
+def install_snapshot_transactions(engine):
+    """
+    Make every transaction on the engine an explicit BEGIN, on WAL databases
+
+    pysqlite only opens a transaction before writes, so each SELECT of a
+    read-only session otherwise sees its own snapshot. With BEGIN, all
+    statements until the session ends read the same WAL snapshot, taken at
+    the first read, while the pipeline keeps committing. In rollback-journal
+    mode that transaction would hold a SHARED lock for the whole request and
+    stall writers' commits, so those connections keep pysqlite's behaviour.
+    """
+    sync_engine = getattr(engine, "sync_engine", engine)
+
+    @event.listens_for(sync_engine, "connect")
+    def _disable_implicit_transactions(dbapi_connection, connection_record):
+        # Runs after the profile's pragmas, which were installed first
+        snapshots = journal_mode(dbapi_connection) == "wal"
+        connection_record.info["snapshot_transactions"] = snapshots
+        if snapshots:
+            dbapi_connection.isolation_level = None
+
+    @event.listens_for(sync_engine, "begin")
+    def _begin(connection):
+        if connection.connection.info.get("snapshot_transactions"):
+            connection.exec_driver_sql("BEGIN")
+
+
+class WalCheckpointer:
+    """Periodically runs PRAGMA wal_checkpoint and keeps the last result"""
+
+    def __init__(self, engine, interval: float):
+        self.engine = engine
+        self.interval = interval
+        self.checkpoints = 0
+        self.failures = 0
+        self.last_result: Optional[Dict[str, int]] = None
+        self.last_duration_ms = 0.0
+        self._task: Optional[asyncio.Task] = None
+
+    async def checkpoint(self, mode: str = "PASSIVE") -> Dict[str, int]:
+        """
+        Checkpoint the WAL into the database file
+
+        Args:
+            mode: PASSIVE (never waits on readers), FULL, RESTART or TRUNCATE
+
+        Returns:
+            busy flag, frames in the WAL and frames checkpointed
+        """
+        started = time.perf_counter()
+        async with self.engine.connect() as connection:
+            result = await connection.exec_driver_sql(f"PRAGMA wal_checkpoint({mode})")
+            busy, log_frames, checkpointed = result.one()
+        self.checkpoints += 1
+        self.last_duration_ms = (time.perf_counter() - started) * 1000
+        self.last_result = {"busy": busy, "log_frames": log_frames, "checkpointed_frames": checkpointed}
+        return self.last_result
+
+    async def _run(self):
+        while True:
+            await asyncio.sleep(self.interval)
+            try:
+                await self.checkpoint()
+            except Exception:
+                self.failures += 1
+
+    def start(self):
+        if self._task is None and self.interval > 0:
+            self._task = asyncio.get_running_loop().create_task(self._run())
+
+    async def stop(self):
+        """Stop the periodic task and truncate the WAL"""
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+            try:
+                await self.checkpoint("TRUNCATE")
+            except Exception:
+                self.failures += 1
+
+    def stats(self) -> Dict[str, Any]:
+        """Checkpoint counts and the last checkpoint's outcome"""
+        return {
+            "interval_seconds": self.interval,
+            "checkpoints": self.checkpoints,
+            "failures": self.failures,
+            "last_duration_ms": self.last_duration_ms,
+            "last_result": self.last_result
+        }
@@ -0,0 +1,73 @@
+"""
+Column types for bulky JSON documents
+
+CompressedJSON stores a JSON document as UTF-8 bytes and compresses it with
+zstd (zlib when the zstandard package is not installed) once it is larger
+than JSON_COMPRESSION_THRESHOLD. Compressed values are recognised by their
+frame header, so small documents stay readable without decompression and
+rows written as plain JSON text before the type was introduced still load.
+"""
+import json
+import zlib
+from typing import Any, Optional
+from sqlalchemy import LargeBinary
+from sqlalchemy.types import TypeDecorator
+from config import settings
+
+try:
+    import zstandard
+except ImportError:  # pragma: no cover - optional dependency
+    zstandard = None
+
+
+ZSTD_MAGIC = b"\x28\xb5\x2f\xfd"
+# zlib streams start with 0x78; JSON text never starts with "x"
+ZLIB_MARKER = b"\x78"
+
+
+def compress_document(data: bytes) -> bytes:
+    """Compress serialized JSON with zstd, or zlib without zstandard"""
+    if zstandard is not None:
+        return zstandard.ZstdCompressor(level=settings.JSON_COMPRESSION_LEVEL).compress(data)
+    return zlib.compress(data, 6)
+
+
+def encode_document(value: Any) -> Optional[bytes]:
+    """Serialize a JSON document, compressing it above the size threshold"""
+    if value is None:
+        return None
+    data = json.dumps(value, separators=(",", ":"), ensure_ascii=False).encode("utf-8")
+    if len(data) >= settings.JSON_COMPRESSION_THRESHOLD:
+        compressed = compress_document(data)
+        if len(compressed) < len(data):
+            return compressed
+    return data
+
+
+def decode_document(value: Any) -> Any:
+    """Load a stored document: zstd or zlib compressed bytes, plain bytes or legacy JSON text"""
+    if value is None:
+        return None
+    if isinstance(value, str):
+        return json.loads(value)
+    data = bytes(value)
+    if data.startswith(ZSTD_MAGIC):
+        if zstandard is None:
+            raise Exception("zstandard is required to read zstd-compressed documents")
+        data = zstandard.ZstdDecompressor().decompress(data)
+    elif data.startswith(ZLIB_MARKER):
+        data = zlib.decompress(data)
+    return json.loads(data)
+
+
+class CompressedJSON(TypeDecorator):
+    """JSON document stored as (optionally compressed) bytes"""
+
+    impl = LargeBinary
+    cache_ok = True
+
+    def process_bind_param(self, value, dialect):
+        return encode_document(value)
+
+    def process_result_value(self, value, dialect):
+        return decode_document(value)
@@ -4,18 +4,35 @@ FastAPI main application
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
 from contextlib import asynccontextmanager
-from database.database import init_db
+from database.database import init_db, wal_checkpointer, AsyncSessionLocal
+from database.archive import JobArchiver
+from database.log_writer import get_log_writer, shutdown_log_writer
 from routes import api_router
 from config import settings
+from utils.ocr import shutdown_ocr_executor
+from utils.blocking import shutdown_blocking_executor, loop_lag_monitor
+
+job_archiver = JobArchiver(AsyncSessionLocal, settings.ARCHIVE_INTERVAL, settings.ARCHIVE_RETENTION_DAYS)
 
 @asynccontextmanager
 async def lifespan(app: FastAPI):
     """Application lifespan events"""
     # Startup
     await init_db()
+    loop_lag_monitor.start()
+    get_log_writer().start()
+    job_archiver.start()
+    if wal_checkpointer is not None:
+        wal_checkpointer.start()
     yield
     # Shutdown
-    pass
+    await loop_lag_monitor.stop()
+    await job_archiver.stop()
+    await shutdown_log_writer()
+    if wal_checkpointer is not None:
+        await wal_checkpointer.stop()
+    await shutdown_ocr_executor()
+    shutdown_blocking_executor()
 
 app = FastAPI(
     title=settings.API_TITLE,
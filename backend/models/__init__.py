@@ -4,7 +4,25 @@ from .schemas import (
     ValidationJobResponse,
     ProviderResponse,
     ProviderListResponse,
+    ProviderSearchHit,
+    ProviderSearchResponse,
     DashboardStatsResponse,
+    DirectoryPriorityItem,
+    DirectoryPriorityResponse,
+    QARuleStats,
+    QARuleStatsResponse,
+    FuzzyMatchStatsResponse,
+    CacheStats,
+    AddressCacheStatsResponse,
+    TextCacheStatsResponse,
+    BlockingExecutorStats,
+    EventLoopLagStats,
+    EventLoopStatsResponse,
+    WalCheckpointStats,
+    LogWriterStatsResponse,
+    DatabaseStatsResponse,
+    ArchivedJobResponse,
+    ArchiveResponse,
     EmailTemplateRequest,
     EmailTemplateResponse,
     DownloadResultsResponse
@@ -16,7 +34,25 @@ __all__ = [
     "ValidationJobResponse",
     "ProviderResponse",
     "ProviderListResponse",
+    "ProviderSearchHit",
+    "ProviderSearchResponse",
     "DashboardStatsResponse",
+    "DirectoryPriorityItem",
+    "DirectoryPriorityResponse",
+    "QARuleStats",
+    "QARuleStatsResponse",
+    "FuzzyMatchStatsResponse",
+    "CacheStats",
+    "AddressCacheStatsResponse",
+    "TextCacheStatsResponse",
+    "BlockingExecutorStats",
+    "EventLoopLagStats",
+    "EventLoopStatsResponse",
+    "WalCheckpointStats",
+    "LogWriterStatsResponse",
+    "DatabaseStatsResponse",
+    "ArchivedJobResponse",
+    "ArchiveResponse",
     "EmailTemplateRequest",
     "EmailTemplateResponse",
     "DownloadResultsResponse"
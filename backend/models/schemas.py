@@ -11,6 +11,12 @@ class UploadResponse(BaseModel):
     message: str
     file_id: str
     filename: str
+    total_providers: Optional[int] = None
+    rows_per_second: Optional[float] = None
+    deduplicated: bool = False
+    duplicate_of: Optional[str] = None
+    column_mapping: Optional[Dict[str, str]] = None
+    column_mapping_signature: Optional[str] = None
 
 
 class ValidationJobRequest(BaseModel):
@@ -82,9 +88,39 @@ class ProviderResponse(BaseModel):
 class ProviderListResponse(BaseModel):
     """List of providers with pagination"""
     providers: List[ProviderResponse]
-    total: int
+    total: Optional[int]
     page: int
     page_size: int
+    sort: str = "id"
+    next_cursor: Optional[str] = None  # Pass as cursor to fetch the following page
+    data_as_of: Optional[datetime] = None  # Time of the database snapshot the response was read from
+    staleness_seconds: Optional[float] = None  # How far that snapshot trailed the primary
+
+
+class ProviderSearchHit(BaseModel):
+    """Provider matching a full-text search"""
+    id: int
+    job_id: str
+    name: Optional[str]
+    npi: Optional[str]
+    specialty: Optional[str]
+    phone: Optional[str]
+    address: Optional[str]
+    city: Optional[str]
+    state: Optional[str]
+    confidence_overall: Optional[float]
+    needs_review: Optional[bool]
+    rank: float  # Higher is a better match
+
+
+class ProviderSearchResponse(BaseModel):
+    """Ranked full-text search results"""
+    query: str
+    job_id: Optional[str] = None
+    results: List[ProviderSearchHit]
+    took_ms: float
+    data_as_of: Optional[datetime] = None  # Time of the database snapshot the response was read from
+    staleness_seconds: Optional[float] = None  # How far that snapshot trailed the primary
 
 
 class DashboardStatsResponse(BaseModel):
@@ -97,6 +133,176 @@ class DashboardStatsResponse(BaseModel):
     validation_status: Dict[str, int]
     specialty_distribution: Dict[str, int]
     state_distribution: Dict[str, int]
+    data_as_of: Optional[datetime] = None  # Time of the database snapshot the response was read from
+    staleness_seconds: Optional[float] = None  # How far that snapshot trailed the primary
+
+
+class DirectoryPriorityItem(BaseModel):
+    """Directory priority for a single provider"""
+    provider_id: int
+    name: Optional[str]
+    confidence_overall: float
+    completeness: float
+    critical_fields: float
+    priority_score: float
+    directory_status: str
+
+
+class DirectoryPriorityResponse(BaseModel):
+    """Providers of a job ranked by directory priority"""
+    job_id: str
+    total: int
+    providers: List[DirectoryPriorityItem]
+    data_as_of: Optional[datetime] = None  # Time of the database snapshot the response was read from
+    staleness_seconds: Optional[float] = None  # How far that snapshot trailed the primary
+
+
+class QARuleStats(BaseModel):
+    """Evaluation statistics for a QA rule"""
+    rule_id: str
+    type: str
+    effect: str
+    evaluated: int
+    hits: int
+    total_seconds: float
+    avg_microseconds: float
+
+
+class QARuleStatsResponse(BaseModel):
+    """Statistics for the loaded QA rule set"""
+    rules: List[QARuleStats]
+
+
+class FuzzyMatchStatsResponse(BaseModel):
+    """Outcomes of threshold-aware fuzzy comparisons"""
+    comparisons: int
+    accepted_early: int
+    rejected_early: int
+    full_scored: int
+    short_circuit_rate: float
+
+
+class CacheStats(BaseModel):
+    """Hit and size statistics of a bounded cache"""
+    hits: int
+    misses: int
+    size: int
+    max_size: Optional[int] = None
+    hit_rate: float
+
+
+class AddressCacheStatsResponse(BaseModel):
+    """Address standardization cache statistics"""
+    parse_cache: CacheStats
+    validation_cache: CacheStats
+
+
+class TextCacheStatsResponse(BaseModel):
+    """PDF text extraction cache statistics"""
+    enabled: bool
+    document_cache: Optional[CacheStats] = None
+    page_cache: Optional[CacheStats] = None
+    bytes: int = 0
+    max_bytes: int = 0
+    evictions: int = 0
+
+
+class BlockingExecutorStats(BaseModel):
+    """Blocking work executor queueing statistics"""
+    max_workers: int
+    max_pending: int
+    submitted: int
+    completed: int
+    failed: int
+    waiting: int
+    running: int
+    avg_queue_ms: float
+    max_queue_ms: float
+    avg_run_ms: float
+
+
+class EventLoopLagStats(BaseModel):
+    """Event-loop wake-up lag over the recent sample window"""
+    samples: int
+    last_ms: float
+    p50_ms: float
+    p99_ms: float
+    max_ms: float
+
+
+class EventLoopStatsResponse(BaseModel):
+    """Blocking executor and event-loop responsiveness"""
+    blocking_executor: BlockingExecutorStats
+    loop_lag: EventLoopLagStats
+
+
+class WalCheckpointStats(BaseModel):
+    """Periodic WAL checkpoint statistics"""
+    interval_seconds: float
+    checkpoints: int
+    failures: int
+    last_duration_ms: float
+    last_result: Optional[Dict[str, int]] = None
+
+
+class LogWriterStatsResponse(BaseModel):
+    """Buffered validation log writer statistics"""
+    running: bool
+    policy: str
+    max_queue: int
+    queued: int
+    enqueued: int
+    written: int
+    dropped: int
+    failed: int  # Rows in batches the database rejected
+    batches: int
+    failed_batches: int
+    avg_batch_size: float
+    avg_flush_ms: float
+    last_error: Optional[str] = None  # Error of the most recent rejected batch
+
+
+class DatabaseStatsResponse(BaseModel):
+    """Database connection profile in effect"""
+    dialect: str
+    pool: Optional[Dict[str, int]] = None
+    read_pool: Optional[Dict[str, int]] = None
+    sqlite_profile: Optional[str] = None
+    pragmas: Dict[str, Any] = {}
+    checkpointer: Optional[WalCheckpointStats] = None
+
+
+class ColumnMappingRequest(BaseModel):
+    """Corrected roster column mapping"""
+    mapping: Dict[str, str]  # Source column -> provider field
+
+
+class ColumnMappingResponse(BaseModel):
+    """Stored roster column mapping"""
+    signature: str
+    headers: List[str]
+    mapping: Dict[str, str]
+    created_at: Optional[datetime] = None
+    
+    class Config:
+        from_attributes = True
+
+
+class ArchivedJobResponse(BaseModel):
+    """Catalog entry of an archived job"""
+    job_id: str
+    provider_count: int
+    log_count: int
+    bytes: int
+    archived_at: datetime
+    
+    class Config:
+        from_attributes = True
+
+
+class ArchiveResponse(BaseModel):
+    """Jobs archived by an archival run"""
+    archived: List[ArchivedJobResponse]
 
 
 class EmailTemplateRequest(BaseModel):
@@ -3,6 +3,7 @@ from .upload import router as upload_router
 from .validation import router as validation_router
 from .dashboard import router as dashboard_router
 from .email import router as email_router
+from .metrics import router as metrics_router
 
 api_router = APIRouter()
 
@@ -10,5 +11,6 @@ api_router.include_router(upload_router, prefix="/upload", tags=["upload"])
 api_router.include_router(validation_router, prefix="/validation", tags=["validation"])
 api_router.include_router(dashboard_router, prefix="/dashboard", tags=["dashboard"])
 api_router.include_router(email_router, prefix="/email", tags=["email"])
+api_router.include_router(metrics_router, prefix="/metrics", tags=["metrics"])
 
 
@@ -4,9 +4,13 @@ Dashboard routes
 from fastapi import APIRouter, Depends
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy import select, func, case
-from database.database import get_db
-from database.models import Provider, ValidationJob
-from models.schemas import DashboardStatsResponse, DownloadResultsResponse
+from sqlalchemy.orm import undefer
+from database.database import get_read_db
+from database.snapshot import snapshot_fields
+from database.models import Provider, ValidationJob, ArchivedJob
+from database.archive import provider_summary, summary_query, merge_summaries, get_archived_job, load_archived_providers
+from models.schemas import DashboardStatsResponse, DownloadResultsResponse, DirectoryPriorityResponse, DirectoryPriorityItem
+from utils.scoring import load_job_score_frame, score_frame
 from typing import Dict, Optional
 import csv
 import io
@@ -18,24 +22,31 @@ router = APIRouter()
 @router.get("/stats", response_model=DashboardStatsResponse)
 async def get_dashboard_stats(
     job_id: Optional[str] = None,
-    db: AsyncSession = Depends(get_db)
+    db: AsyncSession = Depends(get_read_db)
 ):
     """Get dashboard statistics"""
-    query = select(Provider)
-    if job_id:
-        query = query.where(Provider.job_id == job_id)
+    # Only the columns the counts need, never the JSON documents
+    result = await db.execute(summary_query(job_id))
+    summaries = [provider_summary(result.all())]
     
-    result = await db.execute(query)
-    providers = result.scalars().all()
+    # Archived jobs contribute the summary kept in their catalog row
+    archived_query = select(ArchivedJob.summary)
+    if job_id:
+        archived_query = archived_query.where(ArchivedJob.job_id == job_id)
+    archived = await db.execute(archived_query)
+    summaries.extend(summary for summary in archived.scalars().all() if summary)
+    summary = merge_summaries(summaries)
     
-    total_providers = len(providers)
-    auto_validated = sum(1 for p in providers if p.is_validated)
-    needs_review = sum(1 for p in providers if p.needs_review)
-    suspicious = sum(1 for p in providers if p.is_suspicious)
+    total_providers = summary["total"]
+    auto_validated = summary["validated"]
+    needs_review = summary["needs_review"]
+    suspicious = summary["suspicious"]
     
     # Calculate average confidence
-    confidences = [p.confidence_overall for p in providers if p.confidence_overall > 0]
-    avg_confidence = sum(confidences) / len(confidences) if confidences else 0.0
+    avg_confidence = (
+        summary["confidence_sum"] / summary["confidence_count"]
+        if summary["confidence_count"] else 0.0
+    )
     
     # Validation status distribution
     validation_status = {
@@ -45,17 +56,9 @@ async def get_dashboard_stats(
         "pending": total_providers - auto_validated - needs_review
     }
     
-    # Specialty distribution
-    specialty_dist = {}
-    for provider in providers:
-        specialty = provider.specialty or provider.validated_specialty or "Unknown"
-        specialty_dist[specialty] = specialty_dist.get(specialty, 0) + 1
-    
-    # State distribution
-    state_dist = {}
-    for provider in providers:
-        state = provider.state or "Unknown"
-        state_dist[state] = state_dist.get(state, 0) + 1
+    # Specialty and state distributions
+    specialty_dist = summary["specialties"]
+    state_dist = summary["states"]
     
     return DashboardStatsResponse(
         total_providers=total_providers,
@@ -65,20 +68,64 @@ async def get_dashboard_stats(
         average_confidence=avg_confidence,
         validation_status=validation_status,
         specialty_distribution=specialty_dist,
-        state_distribution=state_dist
+        state_distribution=state_dist,
+        **snapshot_fields(db)
+    )
+
+
+@router.get("/priority/{job_id}", response_model=DirectoryPriorityResponse)
+async def get_directory_priority(
+    job_id: str,
+    status: Optional[str] = None,
+    limit: int = 50,
+    db: AsyncSession = Depends(get_read_db)
+):
+    """Rank a job's providers by directory priority"""
+    # Archived jobs are scored from the score columns of their Parquet file
+    frame = await load_job_score_frame(db, job_id)
+    scores = score_frame(frame, recompute_flags=False)
+    scores["name"] = frame["name"]
+    
+    if status:
+        scores = scores[scores["directory_status"] == status]
+    ranked = scores.sort_values(["priority_score", "id"], ascending=[False, True]).head(limit)
+    
+    return DirectoryPriorityResponse(
+        job_id=job_id,
+        total=len(scores),
+        providers=[
+            DirectoryPriorityItem(
+                provider_id=int(row.id),
+                name=row.name,
+                confidence_overall=float(row.confidence_overall),
+                completeness=float(row.completeness),
+                critical_fields=float(row.critical_fields),
+                priority_score=float(row.priority_score),
+                directory_status=str(row.directory_status)
+            )
+            for row in ranked.itertuples(index=False)
+        ],
+        **snapshot_fields(db)
     )
 
 
 @router.get("/download-results")
 async def download_results(
     job_id: str,
-    db: AsyncSession = Depends(get_db)
+    db: AsyncSession = Depends(get_read_db)
 ):
     """Download validation results as CSV"""
     result = await db.execute(
-        select(Provider).where(Provider.job_id == job_id)
+        select(Provider)
+        .options(undefer(Provider.issues))
+        .where(Provider.job_id == job_id)
+        .order_by(Provider.id)
     )
     providers = result.scalars().all()
+    if not providers:
+        archive = await get_archived_job(db, job_id)
+        if archive is not None:
+            providers = await load_archived_providers(archive.providers_path)
     
     # Create CSV in memory
     output = io.StringIO()
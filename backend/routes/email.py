@@ -4,8 +4,10 @@ Email template routes
 from fastapi import APIRouter, HTTPException, Depends
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy import select
-from database.database import get_db
+from sqlalchemy.orm import undefer
+from database.database import get_read_db
 from database.models import Provider
+from database.archive import find_archived_provider
 from models.schemas import EmailTemplateRequest, EmailTemplateResponse
 from jinja2 import Template
 
@@ -15,14 +17,17 @@ router = APIRouter()
 @router.post("/template", response_model=EmailTemplateResponse)
 async def generate_email_template(
     request: EmailTemplateRequest,
-    db: AsyncSession = Depends(get_db)
+    db: AsyncSession = Depends(get_read_db)
 ):
     """Generate email template for provider"""
     result = await db.execute(
-        select(Provider).where(Provider.id == request.provider_id)
+        select(Provider).options(undefer(Provider.issues)).where(Provider.id == request.provider_id)
     )
     provider = result.scalar_one_or_none()
     
+    if not provider:
+        provider = await find_archived_provider(db, request.provider_id)
+    
     if not provider:
         raise HTTPException(status_code=404, detail="Provider not found")
     
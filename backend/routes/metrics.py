@@ -0,0 +1,129 @@
+"""
+Runtime metrics routes
+"""
+from typing import Dict, Optional
+from fastapi import APIRouter
+from config import settings
+from models.schemas import (
+    QARuleStatsResponse,
+    QARuleStats,
+    FuzzyMatchStatsResponse,
+    CacheStats,
+    AddressCacheStatsResponse,
+    TextCacheStatsResponse,
+    BlockingExecutorStats,
+    EventLoopLagStats,
+    EventLoopStatsResponse,
+    WalCheckpointStats,
+    LogWriterStatsResponse,
+    DatabaseStatsResponse
+)
+from utils.rule_engine import load_rule_engine
+from utils.fuzzy_match import get_threshold_stats
+from utils.address import address_cache_info
+from utils.text_cache import get_text_cache
+from utils.blocking import run_blocking, get_blocking_executor, loop_lag_monitor
+from services.maps_service import get_address_cache_stats
+from database.database import engine, read_engine, wal_checkpointer
+from database.log_writer import get_log_writer
+
+router = APIRouter()
+
+
+@router.get("/qa-rules", response_model=QARuleStatsResponse)
+async def get_qa_rule_stats():
+    """Get per-rule hit counts and timings for the QA rule set"""
+    engine = load_rule_engine(settings.QA_RULES_PATH)
+    return QARuleStatsResponse(
+        rules=[QARuleStats(**stats) for stats in engine.stats()]
+    )
+
+
+@router.get("/fuzzy", response_model=FuzzyMatchStatsResponse)
+async def get_fuzzy_match_stats():
+    """Get how many threshold comparisons were decided without full scoring"""
+    stats = get_threshold_stats()
+    short_circuited = stats["accepted_early"] + stats["rejected_early"]
+    return FuzzyMatchStatsResponse(
+        **stats,
+        short_circuit_rate=(short_circuited / stats["comparisons"]) if stats["comparisons"] > 0 else 0.0
+    )
+
+
+@router.get("/address-cache", response_model=AddressCacheStatsResponse)
+async def get_address_cache_metrics():
+    """Get hit rates of the address parse cache and the address validation cache"""
+    return AddressCacheStatsResponse(
+        parse_cache=CacheStats(**address_cache_info()),
+        validation_cache=CacheStats(**get_address_cache_stats())
+    )
+
+
+@router.get("/ocr-cache", response_model=TextCacheStatsResponse)
+async def get_ocr_cache_metrics():
+    """Get hit rates and disk usage of the PDF text / OCR cache"""
+    cache = get_text_cache()
+    if cache is None:
+        return TextCacheStatsResponse(enabled=False)
+    
+    stats = await run_blocking(cache.stats)
+    return TextCacheStatsResponse(
+        enabled=True,
+        document_cache=CacheStats(**stats["namespaces"]["document"]),
+        page_cache=CacheStats(**stats["namespaces"]["page"]),
+        bytes=stats["bytes"],
+        max_bytes=stats["max_bytes"],
+        evictions=stats["evictions"]
+    )
+
+
+@router.get("/event-loop", response_model=EventLoopStatsResponse)
+async def get_event_loop_metrics():
+    """Get blocking executor queueing and event-loop lag"""
+    return EventLoopStatsResponse(
+        blocking_executor=BlockingExecutorStats(**get_blocking_executor().stats()),
+        loop_lag=EventLoopLagStats(**loop_lag_monitor.stats())
+    )
+
+
+@router.get("/log-writer", response_model=LogWriterStatsResponse)
+async def get_log_writer_metrics():
+    """Get queue depth, batch sizes and dropped rows of the validation log writer"""
+    return LogWriterStatsResponse(**get_log_writer().stats())
+
+
+def _pool_stats(pool) -> Optional[Dict[str, int]]:
+    """Connection counts of a queue pool, or None for pools without them"""
+    if not hasattr(pool, "checkedout"):
+        return None
+    return {
+        "size": pool.size(),
+        "checked_out": pool.checkedout(),
+        "checked_in": pool.checkedin(),
+        "overflow": pool.overflow()
+    }
+
+
+@router.get("/database", response_model=DatabaseStatsResponse)
+async def get_database_metrics():
+    """Get connection pool usage, the SQLite pragmas in effect and WAL checkpoint activity"""
+    dialect = engine.dialect.name
+    pool_stats = _pool_stats(engine.pool)
+    read_pool_stats = _pool_stats(read_engine.pool) if read_engine is not engine else None
+    if dialect != "sqlite":
+        return DatabaseStatsResponse(dialect=dialect, pool=pool_stats, read_pool=read_pool_stats)
+    
+    pragmas = {}
+    async with engine.connect() as connection:
+        for name in ("journal_mode", "synchronous", "busy_timeout", "cache_size", "mmap_size"):
+            result = await connection.exec_driver_sql(f"PRAGMA {name}")
+            pragmas[name] = result.scalar()
+    
+    return DatabaseStatsResponse(
+        dialect=dialect,
+        pool=pool_stats,
+        read_pool=read_pool_stats,
+        sqlite_profile=settings.SQLITE_PROFILE,
+        pragmas=pragmas,
+        checkpointer=WalCheckpointStats(**wal_checkpointer.stats()) if wal_checkpointer is not None else None
+    )
@@ -1,130 +1,343 @@
 """
 File upload routes
 """
-from fastapi import APIRouter, UploadFile, File, HTTPException
+from fastapi import APIRouter, UploadFile, File, HTTPException, Query
 from fastapi.responses import JSONResponse
 import uuid
+from typing import Optional, Iterator, Tuple, List, Dict, Any
 import os
+import time
+import pandas as pd
 from config import settings
-from utils.file_handler import save_uploaded_file, read_csv_file, extract_pdf_text, parse_provider_from_text
-from models.schemas import UploadResponse
-from database.models import ValidationJob, Provider
+from utils.file_handler import save_upload_stream, UploadTooLargeError, SavedUpload, iter_csv_chunks, frame_to_records, extract_pdf_text, parse_provider_from_text, parse_providers_from_text
+from utils.canonical import canonical_records
+from utils.blocking import run_blocking, iterate_blocking
+from utils.schema_inference import resolve_column_mapping, apply_column_mapping, header_signature, update_column_mapping
+from utils.roster_formats import ROSTER_EXTENSIONS, sniff_roster_format, iter_roster_batches, batch_records, batch_frame
+from models.schemas import UploadResponse, ColumnMappingRequest, ColumnMappingResponse
+from database.models import ValidationJob, ColumnMapping
 from database.database import get_db
+from database.bulk import build_provider_rows, bulk_insert_providers, clone_job_providers
+from database.archive import get_archived_job, clone_archived_providers
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import select
+from sqlalchemy import select, update
 from fastapi import Depends
 
 router = APIRouter()
 
 
+async def _spool_upload(file: UploadFile) -> SavedUpload:
+    """Stream an upload to disk, rejecting it once it exceeds MAX_UPLOAD_SIZE"""
+    too_large = HTTPException(
+        status_code=413,
+        detail=f"File exceeds maximum upload size of {settings.MAX_UPLOAD_SIZE} bytes"
+    )
+    if file.size is not None and file.size > settings.MAX_UPLOAD_SIZE:
+        raise too_large
+    
+    try:
+        return await save_upload_stream(
+            file,
+            file.filename,
+            settings.UPLOAD_DIR,
+            settings.MAX_UPLOAD_SIZE,
+            settings.UPLOAD_CHUNK_SIZE
+        )
+    except UploadTooLargeError:
+        raise too_large
+
+
+async def _deduplicate_upload(
+    db: AsyncSession,
+    saved: SavedUpload,
+    filename: str,
+    clone: bool
+) -> Optional[UploadResponse]:
+    """
+    Resolve an upload whose content was seen before
+    
+    Returns None for new content. For a duplicate the spooled file is removed
+    and the earlier job is returned, or, with clone, a new job holding a copy
+    of the earlier job's providers and validation results.
+    """
+    result = await db.execute(
+        select(ValidationJob)
+        .where(ValidationJob.content_hash == saved.sha256)
+        .where(ValidationJob.status != "failed")
+        .order_by(ValidationJob.created_at.desc(), ValidationJob.id.desc())
+        .limit(1)
+    )
+    existing = result.scalar_one_or_none()
+    if existing is None:
+        return None
+    
+    os.remove(saved.path)
+    
+    # Only finished results are worth copying; otherwise point at the running job
+    if not clone or existing.status != "completed":
+        return UploadResponse(
+            message="Duplicate upload; returning existing job",
+            file_id=existing.job_id,
+            filename=filename,
+            total_providers=existing.total_providers,
+            deduplicated=True,
+            duplicate_of=existing.job_id
+        )
+    
+    job_id = str(uuid.uuid4())
+    db.add(ValidationJob(
+        job_id=job_id,
+        status=existing.status,
+        total_providers=existing.total_providers,
+        processed_providers=existing.processed_providers,
+        content_hash=saved.sha256,
+        cloned_from=existing.job_id
+    ))
+    await db.flush()
+    archive = await get_archived_job(db, existing.job_id)
+    if archive is not None:
+        await clone_archived_providers(db, archive, job_id)
+    else:
+        await clone_job_providers(db, existing.job_id, job_id)
+    await db.commit()
+    
+    return UploadResponse(
+        message="Duplicate upload; cloned results of existing job",
+        file_id=job_id,
+        filename=filename,
+        total_providers=existing.total_providers,
+        deduplicated=True,
+        duplicate_of=existing.job_id
+    )
+
+
 @router.post("/csv", response_model=UploadResponse)
 async def upload_csv(
     file: UploadFile = File(...),
+    force: bool = Query(False, description="Revalidate even if this file was uploaded before"),
+    clone: bool = Query(False, description="For a duplicate, copy the earlier job's results into a new job"),
     db: AsyncSession = Depends(get_db)
 ):
     """Upload CSV file with provider data"""
     if not file.filename.endswith('.csv'):
         raise HTTPException(status_code=400, detail="File must be a CSV")
     
-    # Read file content
-    content = await file.read()
+    # Stream file to disk
+    saved = await _spool_upload(file)
+    file_path = saved.path
+    
+    if not force:
+        duplicate = await _deduplicate_upload(db, saved, file.filename, clone)
+        if duplicate is not None:
+            return duplicate
     
-    # Save file
-    file_path = await save_uploaded_file(content, file.filename, settings.UPLOAD_DIR)
+    # Stream the CSV in chunks so memory stays flat regardless of file size
+    chunks = (
+        (frame_to_records(chunk), chunk)
+        for chunk in iter_csv_chunks(file_path, settings.CSV_CHUNK_SIZE)
+    )
+    return await _ingest_roster(db, saved, file.filename, chunks, "CSV uploaded successfully")
+
+
+@router.post("/roster", response_model=UploadResponse)
+async def upload_roster(
+    file: UploadFile = File(...),
+    force: bool = Query(False, description="Revalidate even if this file was uploaded before"),
+    clone: bool = Query(False, description="For a duplicate, copy the earlier job's results into a new job"),
+    db: AsyncSession = Depends(get_db)
+):
+    """Upload a CSV, Parquet, NDJSON or Excel roster; the format is detected from the content"""
+    extension = os.path.splitext(file.filename)[1].lower()
+    if extension not in settings.ALLOWED_EXTENSIONS or extension not in ROSTER_EXTENSIONS:
+        raise HTTPException(
+            status_code=400,
+            detail=f"File must be one of: {', '.join(sorted(ROSTER_EXTENSIONS))}"
+        )
     
-    # Read CSV data
-    providers_data = await read_csv_file(file_path)
+    # Stream file to disk
+    saved = await _spool_upload(file)
+    file_path = saved.path
     
+    try:
+        roster_format = await run_blocking(sniff_roster_format, file_path, file.filename)
+    except ValueError as e:
+        os.remove(file_path)
+        raise HTTPException(status_code=400, detail=str(e))
+    
+    if not force:
+        duplicate = await _deduplicate_upload(db, saved, file.filename, clone)
+        if duplicate is not None:
+            return duplicate
+    
+    if roster_format == "csv":
+        chunks = (
+            (frame_to_records(chunk), chunk)
+            for chunk in iter_csv_chunks(file_path, settings.CSV_CHUNK_SIZE)
+        )
+    else:
+        # Arrow record batches feed the insert directly, without a CSV round trip
+        chunks = (
+            (batch_records(batch), batch_frame(batch))
+            for batch in iter_roster_batches(file_path, roster_format, settings.CSV_CHUNK_SIZE)
+        )
+    return await _ingest_roster(
+        db, saved, file.filename, chunks, f"{roster_format.upper()} roster uploaded successfully"
+    )
+
+
+async def _ingest_roster(
+    db: AsyncSession,
+    saved: SavedUpload,
+    filename: str,
+    chunks: Iterator[Tuple[List[Dict[str, Any]], pd.DataFrame]],
+    message: str
+) -> UploadResponse:
+    """Create a job and bulk insert a roster chunk by chunk"""
     # Create validation job
     job_id = str(uuid.uuid4())
     job = ValidationJob(
         job_id=job_id,
         status="pending",
-        total_providers=len(providers_data)
+        total_providers=0,
+        content_hash=saved.sha256
     )
     db.add(job)
     await db.flush()
     
-    # Create provider records
-    for provider_data in providers_data:
-        provider = Provider(
-            job_id=job_id,
-            original_data=provider_data,
-            name=provider_data.get("name", ""),
-            npi=provider_data.get("npi"),
-            specialty=provider_data.get("specialty"),
-            phone=provider_data.get("phone"),
-            email=provider_data.get("email"),
-            address=provider_data.get("address"),
-            city=provider_data.get("city"),
-            state=provider_data.get("state"),
-            zip_code=provider_data.get("zip_code"),
-            website=provider_data.get("website")
-        )
-        db.add(provider)
+    started = time.perf_counter()
+    total_providers = 0
+    # Reading, parsing and canonicalizing run on the blocking executor
+    column_mapping = None
+    signature = None
+    async for records, frame in iterate_blocking(chunks):
+        if column_mapping is None:
+            # Only the first chunk is sampled; see utils.schema_inference
+            signature = header_signature(list(frame.columns))
+            column_mapping = await resolve_column_mapping(
+                db, list(frame.columns), frame.head(settings.SCHEMA_SAMPLE_ROWS)
+            )
+        records, frame = apply_column_mapping(column_mapping, records, frame)
+        total_providers += await _insert_provider_chunk(db, job_id, records, frame)
     
+    await db.execute(
+        update(ValidationJob)
+        .where(ValidationJob.job_id == job_id)
+        .values(total_providers=total_providers)
+    )
     await db.commit()
+    elapsed = time.perf_counter() - started
     
     return UploadResponse(
-        message="CSV uploaded successfully",
+        message=message,
         file_id=job_id,
-        filename=file.filename
+        filename=filename,
+        total_providers=total_providers,
+        rows_per_second=(total_providers / elapsed) if elapsed > 0 else None,
+        column_mapping=column_mapping,
+        column_mapping_signature=signature
+    )
+
+
+async def _insert_provider_chunk(
+    db: AsyncSession,
+    job_id: str,
+    records: List[Dict[str, Any]],
+    frame: pd.DataFrame
+) -> int:
+    """Canonicalize one chunk of roster rows and bulk insert it"""
+    rows = await run_blocking(
+        lambda: build_provider_rows(job_id, records, canonical_records(frame))
     )
+    return await bulk_insert_providers(db, rows, settings.BULK_INSERT_BATCH_SIZE)
 
 
 @router.post("/pdf", response_model=UploadResponse)
 async def upload_pdf(
     file: UploadFile = File(...),
+    force: bool = Query(False, description="Revalidate even if this file was uploaded before"),
+    clone: bool = Query(False, description="For a duplicate, copy the earlier job's results into a new job"),
     db: AsyncSession = Depends(get_db)
 ):
     """Upload PDF file with provider data"""
     if not file.filename.endswith('.pdf'):
         raise HTTPException(status_code=400, detail="File must be a PDF")
     
-    # Read file content
-    content = await file.read()
+    # Stream file to disk
+    saved = await _spool_upload(file)
+    file_path = saved.path
     
-    # Save file
-    file_path = await save_uploaded_file(content, file.filename, settings.UPLOAD_DIR)
+    if not force:
+        duplicate = await _deduplicate_upload(db, saved, file.filename, clone)
+        if duplicate is not None:
+            return duplicate
     
     # Extract text from PDF
-    pdf_text = await extract_pdf_text(file_path)
+    pdf_text = await extract_pdf_text(file_path, saved.sha256)
     
-    # Parse provider data from text
-    provider_data = parse_provider_from_text(pdf_text)
+    # Parse every provider in the roster text
+    providers_data = await run_blocking(parse_providers_from_text, pdf_text, include_source=True)
+    if not providers_data:
+        providers_data = [dict(parse_provider_from_text(""), source_text=pdf_text)]
+    original_data = [
+        {"source": "pdf", "text": provider_data.pop("source_text")}
+        for provider_data in providers_data
+    ]
+    canonical = await run_blocking(lambda: canonical_records(pd.DataFrame(providers_data)))
     
     # Create validation job
     job_id = str(uuid.uuid4())
     job = ValidationJob(
         job_id=job_id,
         status="pending",
-        total_providers=1
+        total_providers=len(providers_data),
+        content_hash=saved.sha256
     )
     db.add(job)
     await db.flush()
     
-    # Create provider record
-    provider = Provider(
-        job_id=job_id,
-        original_data={"source": "pdf", "text": pdf_text},
-        name=provider_data.get("name", ""),
-        npi=provider_data.get("npi"),
-        specialty=provider_data.get("specialty"),
-        phone=provider_data.get("phone"),
-        email=provider_data.get("email"),
-        address=provider_data.get("address"),
-        city=provider_data.get("city"),
-        state=provider_data.get("state"),
-        zip_code=provider_data.get("zip_code"),
-        website=provider_data.get("website")
-    )
-    db.add(provider)
+    # Create provider records
+    rows = build_provider_rows(job_id, providers_data, canonical, original_data)
+    await bulk_insert_providers(db, rows, settings.BULK_INSERT_BATCH_SIZE)
     await db.commit()
     
     return UploadResponse(
         message="PDF uploaded successfully",
         file_id=job_id,
-        filename=file.filename
+        filename=file.filename,
+        total_providers=len(providers_data)
+    )
+
+
+@router.get("/column-mappings/{signature}", response_model=ColumnMappingResponse)
+async def get_column_mapping(
+    signature: str,
+    db: AsyncSession = Depends(get_db)
+):
+    """Stored column mapping for a roster header signature"""
+    result = await db.execute(
+        select(ColumnMapping).where(ColumnMapping.signature == signature)
     )
+    stored = result.scalar_one_or_none()
+    if not stored:
+        raise HTTPException(status_code=404, detail="Column mapping not found")
+    
+    return ColumnMappingResponse.model_validate(stored)
 
 
+@router.put("/column-mappings/{signature}", response_model=ColumnMappingResponse)
+async def correct_column_mapping(
+    signature: str,
+    request: ColumnMappingRequest,
+    db: AsyncSession = Depends(get_db)
+):
+    """Correct a stored column mapping; later uploads with these headers use it"""
+    try:
+        stored = await update_column_mapping(db, signature, request.mapping)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    if not stored:
+        raise HTTPException(status_code=404, detail="Column mapping not found")
+    
+    await db.commit()
+    await db.refresh(stored)
+    return ColumnMappingResponse.model_validate(stored)
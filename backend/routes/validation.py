@@ -1,13 +1,47 @@
 """
 Validation routes
 """
-from fastapi import APIRouter, HTTPException, BackgroundTasks, Depends
+from fastapi import APIRouter, HTTPException, BackgroundTasks, Depends, Query
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy import select, func
-from database.database import get_db
-from database.models import ValidationJob, Provider
-from models.schemas import ValidationJobRequest, ValidationJobResponse, ProviderListResponse, ProviderResponse
+from sqlalchemy.orm import undefer
+from database.database import get_db, get_read_db, AsyncSessionLocal
+from database.models import ValidationJob, Provider, ArchivedJob
+from database.archive import (
+    JobNotArchivableError,
+    archive_job,
+    archive_expired_jobs,
+    get_archived_job,
+    load_archived_providers,
+    count_archived_providers,
+    find_archived_provider
+)
+from database.pagination import (
+    SORT_KEYS,
+    InvalidCursorError,
+    ProviderFilters,
+    encode_cursor,
+    decode_cursor,
+    provider_page_query,
+    archived_page_filters,
+    archived_sort
+)
+from database.search import SearchUnavailableError, search_providers
+from database.snapshot import snapshot_fields
+from config import settings
+from models.schemas import (
+    ValidationJobRequest,
+    ValidationJobResponse,
+    ProviderListResponse,
+    ProviderResponse,
+    ProviderSearchHit,
+    ProviderSearchResponse,
+    ArchivedJobResponse,
+    ArchiveResponse
+)
+from typing import Optional
 from tasks.validation_task import run_validation_job_async
+import time
 import uuid
 
 router = APIRouter()
@@ -34,6 +68,9 @@ async def start_validation(
     if job.status == "processing":
         raise HTTPException(status_code=400, detail="Job already processing")
     
+    if await get_archived_job(db, job_id) is not None:
+        raise HTTPException(status_code=409, detail="Job is archived")
+    
     # Start background task
     background_tasks.add_task(run_validation_job_async, job_id)
     
@@ -52,7 +89,7 @@ async def start_validation(
 @router.get("/status/{job_id}", response_model=ValidationJobResponse)
 async def get_job_status(
     job_id: str,
-    db: AsyncSession = Depends(get_db)
+    db: AsyncSession = Depends(get_read_db)
 ):
     """Get validation job status"""
     result = await db.execute(
@@ -81,47 +118,161 @@ async def get_job_status(
 async def get_providers(
     job_id: str,
     page: int = 1,
-    page_size: int = 50,
-    db: AsyncSession = Depends(get_db)
+    page_size: int = Query(50, ge=1, le=1000),
+    cursor: Optional[str] = Query(None, description="next_cursor of the previous page; replaces page"),
+    sort: str = Query("id", description="id, -id, confidence or -confidence"),
+    needs_review: Optional[bool] = None,
+    is_suspicious: Optional[bool] = None,
+    is_validated: Optional[bool] = None,
+    state: Optional[str] = None,
+    specialty: Optional[str] = None,
+    min_confidence: Optional[float] = None,
+    max_confidence: Optional[float] = None,
+    include_total: Optional[bool] = Query(
+        None,
+        description="Count matching providers; by default only requests without a cursor count"
+    ),
+    db: AsyncSession = Depends(get_read_db)
 ):
-    """Get providers for a job"""
-    # Get total count
-    count_result = await db.execute(
-        select(func.count(Provider.id)).where(Provider.job_id == job_id)
+    """Get providers for a job, filtered and sorted, paged by cursor or page number"""
+    if sort not in SORT_KEYS:
+        raise HTTPException(status_code=400, detail=f"Unknown sort: {sort}")
+    
+    after = None
+    if cursor:
+        try:
+            after = decode_cursor(cursor, sort)
+        except InvalidCursorError as e:
+            raise HTTPException(status_code=400, detail=str(e))
+    
+    filters = ProviderFilters(
+        needs_review=needs_review,
+        is_suspicious=is_suspicious,
+        is_validated=is_validated,
+        state=state,
+        specialty=specialty,
+        min_confidence=min_confidence,
+        max_confidence=max_confidence
     )
-    total = count_result.scalar()
     
-    # Get providers with pagination
-    offset = (page - 1) * page_size
-    result = await db.execute(
-        select(Provider)
-        .where(Provider.job_id == job_id)
-        .offset(offset)
-        .limit(page_size)
+    # Get total count; cursor pages skip it so each costs one page-sized range scan
+    if include_total is None:
+        include_total = cursor is None
+    total = None
+    if include_total:
+        count_result = await db.execute(
+            select(func.count(Provider.id)).where(Provider.job_id == job_id).where(*filters.clauses())
+        )
+        total = count_result.scalar()
+    
+    # Keyset page after the cursor; without one, fall back to OFFSET paging.
+    # One extra row tells whether there is a next page.
+    offset = 0 if cursor else (page - 1) * page_size
+    query = provider_page_query(
+        select(Provider).options(undefer(Provider.issues)).where(Provider.job_id == job_id),
+        sort,
+        after,
+        filters
     )
+    result = await db.execute(query.offset(offset).limit(page_size + 1))
     providers = result.scalars().all()
     
+    # Archived jobs are paged straight from their Parquet file
+    if not providers:
+        archive = await get_archived_job(db, job_id)
+        if archive is not None:
+            providers = await load_archived_providers(
+                archive.providers_path,
+                offset,
+                page_size + 1,
+                archived_page_filters(sort, after, filters),
+                archived_sort(sort) if sort != "id" else None
+            )
+            if include_total:
+                total = await count_archived_providers(archive, filters.parquet_filters())
+    
+    next_cursor = None
+    if len(providers) > page_size:
+        providers = providers[:page_size]
+        next_cursor = encode_cursor(sort, providers[-1])
+    
     return ProviderListResponse(
         providers=[ProviderResponse.model_validate(p) for p in providers],
         total=total,
         page=page,
-        page_size=page_size
+        page_size=page_size,
+        sort=sort,
+        next_cursor=next_cursor,
+        **snapshot_fields(db)
     )
 
 
 @router.get("/provider/{provider_id}", response_model=ProviderResponse)
 async def get_provider(
     provider_id: int,
-    db: AsyncSession = Depends(get_db)
+    db: AsyncSession = Depends(get_read_db)
 ):
     """Get single provider details"""
     result = await db.execute(
-        select(Provider).where(Provider.id == provider_id)
+        select(Provider).options(undefer(Provider.issues)).where(Provider.id == provider_id)
     )
     provider = result.scalar_one_or_none()
     
+    if not provider:
+        provider = await find_archived_provider(db, provider_id)
+    
     if not provider:
         raise HTTPException(status_code=404, detail="Provider not found")
     
     return ProviderResponse.model_validate(provider)
 
+
+
+@router.get("/search", response_model=ProviderSearchResponse)
+async def search(
+    q: str = Query(..., min_length=1, description="Words or prefixes of name, NPI, phone, address or city"),
+    job_id: Optional[str] = None,
+    limit: int = Query(20, ge=1, le=100),
+    db: AsyncSession = Depends(get_read_db)
+):
+    """Full-text search over providers of every job (or one job), best match first"""
+    started = time.perf_counter()
+    try:
+        hits = await search_providers(db, q, job_id, limit)
+    except SearchUnavailableError as e:
+        raise HTTPException(status_code=503, detail=str(e))
+    
+    return ProviderSearchResponse(
+        query=q,
+        job_id=job_id,
+        results=[ProviderSearchHit(**hit) for hit in hits],
+        took_ms=(time.perf_counter() - started) * 1000,
+        **snapshot_fields(db)
+    )
+
+
+@router.post("/archive", response_model=ArchiveResponse)
+async def archive_jobs(
+    job_id: Optional[str] = None,
+    older_than_days: Optional[float] = None,
+    db: AsyncSession = Depends(get_db)
+):
+    """
+    Archive one completed job, or every completed job older than the
+    retention window (ARCHIVE_RETENTION_DAYS unless older_than_days is given)
+    """
+    if job_id:
+        try:
+            archived = [await archive_job(db, job_id)]
+        except JobNotArchivableError as e:
+            raise HTTPException(status_code=400, detail=str(e))
+        await db.commit()
+    else:
+        retention = older_than_days if older_than_days is not None else settings.ARCHIVE_RETENTION_DAYS
+        job_ids = await archive_expired_jobs(AsyncSessionLocal, retention)
+        result = await db.execute(select(ArchivedJob).where(ArchivedJob.job_id.in_(job_ids)))
+        archived = result.scalars().all()
+    
+    return ArchiveResponse(
+        archived=[ArchivedJobResponse.model_validate(archive) for archive in archived]
+    )
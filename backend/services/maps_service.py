@@ -1,8 +1,61 @@
 """
 Google Maps validation service (mock implementation)
 """
+from collections import OrderedDict
 from typing import Dict, Any, Optional, Tuple
 import random
+from config import settings
+from utils.address import parse_address, format_address, address_key, AddressComponents
+
+
+# Validation results keyed by delivery point (address_key), shared by all instances;
+# they hold no formatted address, which depends on the caller's unit
+_result_cache: "OrderedDict[str, Tuple[bool, Dict[str, Any]]]" = OrderedDict()
+_cache_stats = {"hits": 0, "misses": 0}
+
+
+def _cache_get(key: str) -> Optional[Tuple[bool, Dict[str, Any]]]:
+    """Look up a cached validation result, refreshing its LRU position"""
+    result = _result_cache.get(key)
+    if result is None:
+        _cache_stats["misses"] += 1
+        return None
+    _result_cache.move_to_end(key)
+    _cache_stats["hits"] += 1
+    return result
+
+
+def _cache_put(key: str, result: Tuple[bool, Dict[str, Any]]):
+    """Store a validation result, evicting the least recently used entries"""
+    _result_cache[key] = result
+    _result_cache.move_to_end(key)
+    while len(_result_cache) > settings.ADDRESS_CACHE_SIZE:
+        _result_cache.popitem(last=False)
+
+
+def _caller_result(
+    result: Tuple[bool, Dict[str, Any]],
+    components: AddressComponents
+) -> Tuple[bool, Dict[str, Any]]:
+    """
+    Copy of a cached result with the formatted address of the caller's own
+    components (the cache key leaves out the unit, the formatted address does not)
+    """
+    is_valid, data = result
+    formatted = format_address(components) if is_valid else None
+    return is_valid, {"formatted_address": formatted, **data}
+
+
+def get_address_cache_stats() -> Dict[str, Any]:
+    """Hit and size statistics of the validation result cache"""
+    lookups = _cache_stats["hits"] + _cache_stats["misses"]
+    return {
+        "hits": _cache_stats["hits"],
+        "misses": _cache_stats["misses"],
+        "size": len(_result_cache),
+        "max_size": settings.ADDRESS_CACHE_SIZE,
+        "hit_rate": _cache_stats["hits"] / lookups if lookups else 0.0
+    }
 
 
 class MapsService:
@@ -49,12 +102,20 @@ class MapsService:
         if not address:
             return False, None
         
-        # Normalize address for lookup
-        full_address = f"{address} {city or ''} {state or ''} {zip_code or ''}".lower().strip()
+        # Standardize address for lookup; units and ZIP+4 don't change the result
+        components = parse_address(address, city, state, zip_code)
+        lookup_key = address_key(components)
         
         # Check mock database
-        if full_address in self.validated_addresses:
-            return True, self.validated_addresses[full_address]
+        if lookup_key in self.validated_addresses:
+            data = dict(self.validated_addresses[lookup_key])
+            if components.unit:
+                data["formatted_address"] = format_address(components)
+            return True, data
+        
+        cached = _cache_get(lookup_key)
+        if cached is not None:
+            return _caller_result(cached, components)
         
         # Mock validation - simulate API call
         import asyncio
@@ -63,20 +124,22 @@ class MapsService:
         # Random validation result for demo
         is_valid = random.random() > 0.2  # 80% valid
         
+        # Only the parts shared by every unit at the delivery point are cached
         if is_valid:
-            return True, {
-                "formatted_address": f"{address}, {city or 'Unknown'}, {state or 'XX'} {zip_code or '00000'}",
+            result = True, {
                 "valid": True,
                 "lat": random.uniform(25.0, 49.0),
                 "lng": random.uniform(-125.0, -66.0),
                 "place_id": f"mock_place_{random.randint(1000, 9999)}"
             }
         else:
-            return False, {
-                "formatted_address": None,
+            result = False, {
                 "valid": False,
                 "error": "Address not found"
             }
+        
+        _cache_put(lookup_key, result)
+        return _caller_result(result, components)
     
     async def geocode_address(self, address: str) -> Optional[Dict[str, Any]]:
         """Geocode an address to get coordinates"""
@@ -5,13 +5,16 @@ import asyncio
 from typing import Dict, Any, List
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy import select, update
+from sqlalchemy.orm import undefer
 from database.database import AsyncSessionLocal
 from database.models import ValidationJob, Provider
+from database.log_writer import get_log_writer
 from agents.validation_agent import ValidationAgent
 from agents.enrichment_agent import EnrichmentAgent
 from agents.qa_agent import QAAgent
 from agents.directory_agent import DirectoryAgent
 from utils.confidence import calculate_overall_confidence
+from utils.canonical import CANONICAL_FIELDS
 
 
 class ValidationPipeline:
@@ -45,27 +48,33 @@ class ValidationPipeline:
             "zip_code": provider.zip_code,
             "website": provider.website
         })
+        # Canonical forms and format checks from ingest
+        for field in CANONICAL_FIELDS:
+            provider_data[field] = getattr(provider, field)
         
         # Step 1: Enrichment (fill missing data)
         enrichment_result = await self.enrichment_agent.process(provider_data, session)
+        await self.enrichment_agent.log_action(session, provider.job_id, provider.id, "enrich", enrichment_result)
         if enrichment_result.get("enriched_data"):
             provider_data.update(enrichment_result["enriched_data"])
             # Update provider with enriched data
             for field, value in enrichment_result["enriched_data"].items():
-                if hasattr(provider, field):
+                if hasattr(Provider, field):
                     setattr(provider, field, value)
         
         # Step 2: Validation
         validation_result = await self.validation_agent.process(provider_data, session)
+        await self.validation_agent.log_action(session, provider.job_id, provider.id, "validate", validation_result)
         provider_data.update(validation_result)
         
         # Update provider with validated data
         for key, value in validation_result.items():
-            if hasattr(provider, key):
+            if hasattr(Provider, key):
                 setattr(provider, key, value)
         
         # Step 3: QA
         qa_result = await self.qa_agent.process(provider_data, session)
+        await self.qa_agent.log_action(session, provider.job_id, provider.id, "qa", qa_result)
         provider_data.update(qa_result)
         
         # Update provider with QA results
@@ -76,6 +85,7 @@ class ValidationPipeline:
         
         # Step 4: Directory Management
         directory_result = await self.directory_agent.process(provider_data, session)
+        await self.directory_agent.log_action(session, provider.job_id, provider.id, "directory", directory_result)
         provider_data.update(directory_result)
         
         # Update provider with directory results
@@ -112,7 +122,10 @@ class ValidationPipeline:
             
             # Get all providers for this job
             result = await session.execute(
-                select(Provider).where(Provider.job_id == job_id)
+                select(Provider)
+                .options(undefer(Provider.original_data))
+                .where(Provider.job_id == job_id)
+                .order_by(Provider.id)
             )
             providers = result.scalars().all()
             
@@ -132,6 +145,9 @@ class ValidationPipeline:
                     print(f"Error processing provider {provider.id}: {e}")
                     continue
             
+            # Agent logs of this job are written before it is reported complete
+            await get_log_writer().flush()
+            
             # Mark job as completed
             job.status = "completed"
             await session.commit()
@@ -0,0 +1,14 @@
+"""Test setup: the backend modules import each other from the backend directory"""
+import os
+import sys
+import tempfile
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+# Settings are read on first import, so the app under test gets its own files
+_data_dir = tempfile.mkdtemp(prefix="provider-validation-tests-")
+os.environ.setdefault("DATABASE_URL", f"sqlite+aiosqlite:///{_data_dir}/test.db")
+os.environ.setdefault("UPLOAD_DIR", os.path.join(_data_dir, "uploads"))
+os.environ.setdefault("ARCHIVE_DIR", os.path.join(_data_dir, "archive"))
+os.environ.setdefault("OCR_CACHE_DIR", os.path.join(_data_dir, "ocr_text"))
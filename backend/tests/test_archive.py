@@ -0,0 +1,79 @@
+"""Tests for reading archived jobs next to jobs uploaded after them"""
+import time
+
+import pytest
+from fastapi.testclient import TestClient
+
+pytest.importorskip("pyarrow")
+
+import main  # noqa: E402
+
+HEADER = "name,npi,specialty,phone,email,address,city,state,zip_code,website\n"
+
+
+def _upload(client: TestClient, rows: str) -> str:
+    response = client.post(
+        "/api/upload/csv", files={"file": ("providers.csv", HEADER + rows, "text/csv")}
+    )
+    assert response.status_code == 200
+    return response.json()["file_id"]
+
+
+def _validate(client: TestClient, job_id: str):
+    assert client.post("/api/validation/start", json={"job_id": job_id}).status_code == 200
+    for _ in range(200):
+        if client.get(f"/api/validation/status/{job_id}").json()["status"] == "completed":
+            return
+        time.sleep(0.1)
+    raise AssertionError(f"Job {job_id} did not complete")
+
+
+def _provider_ids(client: TestClient, job_id: str) -> dict:
+    providers = client.get(f"/api/validation/providers/{job_id}").json()["providers"]
+    return {provider["name"]: provider["id"] for provider in providers}
+
+
+def test_archived_provider_ids_are_not_reused():
+    with TestClient(main.app) as client:
+        old_job = _upload(
+            client,
+            "Alice Archived,1234567893,Cardiology,2125551234,alice@example.com,1 Main St,New York,NY,10001,\n"
+            "Bob Archived,1245319599,Pediatrics,3105555678,bob@example.com,2 Oak Ave,Los Angeles,CA,90001,\n"
+        )
+        _validate(client, old_job)
+        old_ids = _provider_ids(client, old_job)
+        response = client.post("/api/validation/archive", params={"job_id": old_job})
+        assert response.status_code == 200
+
+        new_job = _upload(
+            client,
+            "Carol New,1003000126,Neurology,3125550000,carol@example.com,3 Elm St,Chicago,IL,60601,\n"
+        )
+        new_ids = _provider_ids(client, new_job)
+
+        assert min(new_ids.values()) > max(old_ids.values())
+        for name, provider_id in old_ids.items():
+            detail = client.get(f"/api/validation/provider/{provider_id}")
+            assert detail.status_code == 200
+            assert detail.json()["name"] == name
+            assert detail.json()["job_id"] == old_job
+        detail = client.get(f"/api/validation/provider/{new_ids['Carol New']}")
+        assert detail.json()["job_id"] == new_job
+
+
+def test_archived_job_keeps_its_directory_priority():
+    with TestClient(main.app) as client:
+        job_id = _upload(
+            client,
+            "Dana Ranked,1234567893,Cardiology,2125551234,dana@example.com,1 Main St,New York,NY,10001,\n"
+            "Evan Ranked,1245319599,Pediatrics,,,,,,,\n"
+        )
+        _validate(client, job_id)
+        before = client.get(f"/api/dashboard/priority/{job_id}").json()
+        response = client.post("/api/validation/archive", params={"job_id": job_id})
+        assert response.status_code == 200
+
+        after = client.get(f"/api/dashboard/priority/{job_id}").json()
+
+        assert after["total"] == before["total"] == 2
+        assert after["providers"] == before["providers"]
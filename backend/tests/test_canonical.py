@@ -0,0 +1,92 @@
+"""Ingest-time canonical contact fields must agree with the per-value validators"""
+import pandas as pd
+import pytest
+
+from utils.canonical import canonicalize_contact_fields
+from utils.confidence import (
+    email_format_result,
+    phone_format_result,
+    validate_email,
+    validate_phone,
+    validate_zip_code,
+    zip_format_result,
+)
+from utils.file_handler import iter_csv_chunks
+
+PHONES = [
+    "2125551234", "(212) 555-1234", "212.555.1234 ext 55", "212-555-1234 x5",
+    "1-212-555-1234", "+1 212 555 1234", "2-212-555-1234", "555-1234", "   ", "phone",
+    "12125551234", "٢١٢٥٥٥١٢٣٤",
+]
+EMAILS = [
+    "john@example.com", "John.Smith@Example.COM", " john@example.com ", "john@example",
+    "john@@example.com", "john@example.com\n", "jöhn@example.com", "a+b@sub.example.co",
+]
+ZIPS = ["10001", "10001-1234", "100011234", "1000", "10001-12", " 10001 ", "ZIP", "02134"]
+WEBSITES = {
+    "example.com": ("https://example.com", True),
+    "WWW.Example.com/": ("https://www.example.com", True),
+    "http://clinic.org/path?x=1": ("http://clinic.org/path?x=1", True),
+    "https://clinic.org:8443/": ("https://clinic.org:8443", True),
+    "not a url": ("https://not a url", False),
+    "localhost": ("https://localhost", False),
+}
+
+
+def _column(values, length):
+    return values + [values[-1]] * (length - len(values))
+
+
+def _frame():
+    length = max(len(PHONES), len(EMAILS), len(ZIPS), len(WEBSITES))
+    return pd.DataFrame({
+        "phone": _column(PHONES, length),
+        "email": _column(EMAILS, length),
+        "zip_code": _column(ZIPS, length),
+        "website": _column(list(WEBSITES), length),
+    }, dtype=object)
+
+
+@pytest.mark.parametrize("field, validate, from_canonical", [
+    ("phone", validate_phone, lambda row: phone_format_result(row["canonical_phone"])),
+    ("email", validate_email, lambda row: email_format_result(row["email_valid"])),
+    ("zip_code", validate_zip_code, lambda row: zip_format_result(row["canonical_zip"].replace("-", ""))),
+])
+def test_canonical_fields_score_like_the_per_value_validators(field, validate, from_canonical):
+    frame = _frame()
+    canonical = canonicalize_contact_fields(frame)
+    for value, (_, row) in zip(frame[field], canonical.iterrows()):
+        assert from_canonical(row) == validate(value), value
+
+
+def test_canonical_forms():
+    canonical = canonicalize_contact_fields(_frame())
+    phones = dict(zip(PHONES, canonical["canonical_phone"]))
+    assert phones["212.555.1234 ext 55"] == "212555123455"
+    assert phones["+1 212 555 1234"] == "12125551234"
+    assert dict(zip(PHONES, canonical["phone_valid"]))["2-212-555-1234"] is False
+    assert dict(zip(EMAILS, canonical["canonical_email"]))[" john@example.com "] == "john@example.com"
+    zips = dict(zip(ZIPS, canonical["canonical_zip"]))
+    assert zips["100011234"] == "10001-1234"
+    assert zips["02134"] == "02134"
+    for website, expected in WEBSITES.items():
+        row = canonical.iloc[list(WEBSITES).index(website)]
+        assert (row["canonical_website"], row["website_valid"]) == expected, website
+
+
+def test_missing_values_from_csv_stay_missing(tmp_path):
+    path = tmp_path / "roster.csv"
+    path.write_text("name,phone,email,zip_code,website\nA,,,,\nB, , ,,\nC,2125551234,a@b.co,10001,b.co\n")
+    chunk = next(iter_csv_chunks(str(path), 10))
+    canonical = canonicalize_contact_fields(chunk)
+
+    empty = canonical.iloc[0]
+    assert all(empty[field] is None for field in canonical.columns)
+    assert canonical.iloc[2].to_dict() == {
+        "canonical_phone": "2125551234", "phone_valid": True,
+        "canonical_email": "a@b.co", "email_valid": True,
+        "canonical_zip": "10001", "zip_valid": True,
+        "canonical_website": "https://b.co", "website_valid": True,
+    }
+    # Blank cells agree with the validators, which treat them as present but invalid
+    assert (canonical.iloc[1]["phone_valid"], validate_phone(chunk.iloc[1]["phone"])[0]) == (False, False)
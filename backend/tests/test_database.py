@@ -0,0 +1,105 @@
+"""Tests for bringing databases created by older releases up to the current schema"""
+import pytest
+from sqlalchemy import create_engine, inspect, text
+
+import database.models  # noqa: F401  (registers the tables on Base.metadata)
+from database.database import Base, _add_missing_columns, _use_autoincrement_ids, _create_missing_indexes
+
+
+def test_old_tables_get_new_columns_before_their_indexes(tmp_path):
+    engine = create_engine(f"sqlite:///{tmp_path / 'old.db'}")
+    with engine.begin() as connection:
+        # Tables as the first release created them, without canonical fields or content hashes
+        connection.exec_driver_sql(
+            "CREATE TABLE validation_jobs (id INTEGER PRIMARY KEY, job_id VARCHAR, status VARCHAR)"
+        )
+        connection.exec_driver_sql(
+            "CREATE TABLE providers (id INTEGER PRIMARY KEY, job_id VARCHAR, name VARCHAR, npi VARCHAR)"
+        )
+        connection.exec_driver_sql("INSERT INTO providers (job_id, name) VALUES ('old', 'Dr. A')")
+        Base.metadata.create_all(connection)
+        _add_missing_columns(connection)
+        _create_missing_indexes(connection)
+
+        inspector = inspect(connection)
+        job_columns = {column["name"] for column in inspector.get_columns("validation_jobs")}
+        provider_columns = {column["name"] for column in inspector.get_columns("providers")}
+        job_indexes = {index["name"] for index in inspector.get_indexes("validation_jobs")}
+        provider_indexes = {index["name"] for index in inspector.get_indexes("providers")}
+        legacy_row = connection.execute(text("SELECT name, canonical_phone FROM providers")).one()
+
+    assert {"content_hash", "cloned_from"} <= job_columns
+    assert {"canonical_phone", "phone_valid", "canonical_zip", "website_valid"} <= provider_columns
+    assert "ix_validation_jobs_content_hash" in job_indexes
+    assert "ix_providers_job_confidence_id" in provider_indexes
+    assert tuple(legacy_row) == ("Dr. A", None)
+
+
+def test_rebuilt_provider_table_skips_archived_ids(tmp_path):
+    engine = create_engine(f"sqlite:///{tmp_path / 'old.db'}")
+    with engine.begin() as connection:
+        Base.metadata.create_all(connection)
+        # Recreate providers without AUTOINCREMENT, as older releases did
+        connection.exec_driver_sql("DROP TABLE providers")
+        connection.exec_driver_sql(
+            "CREATE TABLE providers (id INTEGER PRIMARY KEY, job_id VARCHAR, name VARCHAR, npi VARCHAR)"
+        )
+        connection.exec_driver_sql("INSERT INTO providers (id, job_id, name) VALUES (3, 'hot', 'Dr. Hot')")
+        connection.exec_driver_sql(
+            "INSERT INTO archived_jobs (job_id, providers_path, min_provider_id, max_provider_id) "
+            "VALUES ('archived', 'providers.parquet', 4, 9)"
+        )
+        _add_missing_columns(connection)
+        _use_autoincrement_ids(connection)
+        _create_missing_indexes(connection)
+
+        connection.exec_driver_sql("INSERT INTO providers (job_id, name) VALUES ('new', 'Dr. New')")
+        rows = connection.execute(text("SELECT id, name FROM providers ORDER BY id")).all()
+        provider_indexes = {index["name"] for index in inspect(connection).get_indexes("providers")}
+
+    assert [tuple(row) for row in rows] == [(3, "Dr. Hot"), (10, "Dr. New")]
+    assert "ix_providers_job_id_id" in provider_indexes
+
+
+def test_rebuilt_log_table_skips_archived_log_ids(tmp_path):
+    pa = pytest.importorskip("pyarrow")
+    pq = pytest.importorskip("pyarrow.parquet")
+    logs_path = str(tmp_path / "logs.parquet")
+    pq.write_table(pa.table({"id": [11, 12]}), logs_path)
+
+    engine = create_engine(f"sqlite:///{tmp_path / 'old.db'}")
+    with engine.begin() as connection:
+        Base.metadata.create_all(connection)
+        connection.exec_driver_sql("DROP TABLE validation_logs")
+        connection.exec_driver_sql(
+            "CREATE TABLE validation_logs (id INTEGER PRIMARY KEY, job_id VARCHAR, provider_id INTEGER)"
+        )
+        connection.exec_driver_sql("INSERT INTO validation_logs (id, job_id) VALUES (2, 'hot')")
+        # Archived before max_log_id was recorded: the ids are read from the file
+        connection.execute(
+            text(
+                "INSERT INTO archived_jobs (job_id, providers_path, logs_path) "
+                "VALUES ('archived', 'providers.parquet', :path)"
+            ),
+            {"path": logs_path},
+        )
+        _add_missing_columns(connection)
+        _use_autoincrement_ids(connection)
+
+        connection.exec_driver_sql("INSERT INTO validation_logs (job_id) VALUES ('new')")
+        new_id = connection.exec_driver_sql("SELECT max(id) FROM validation_logs").scalar()
+
+    assert new_id == 13
+
+
+def test_provider_documents_are_jsonb_on_postgresql_and_compressed_on_sqlite():
+    from sqlalchemy.dialects import postgresql, sqlite
+    from sqlalchemy.schema import CreateTable
+    from database.models import Provider
+
+    postgres_ddl = str(CreateTable(Provider.__table__).compile(dialect=postgresql.dialect()))
+    sqlite_ddl = str(CreateTable(Provider.__table__).compile(dialect=sqlite.dialect()))
+
+    for name in ("original_data", "enriched_data", "issues"):
+        assert f"{name} JSONB" in postgres_ddl
+        assert f"{name} BLOB" in sqlite_ddl
@@ -0,0 +1,98 @@
+"""Tests for splitting extracted PDF text into provider records"""
+from utils.file_handler import parse_providers_from_text
+
+
+def _records(lines):
+    return parse_providers_from_text("\n".join(lines))
+
+
+def test_unlabelled_phone_stays_with_its_record():
+    records = _records([
+        "Dr. John Smith",
+        "NPI: 1234567893",
+        "2125551234",
+        "123 Main St",
+        "New York, NY 10001",
+        "Dr. Jane Doe",
+        "NPI: 1987654321",
+    ])
+    assert len(records) == 2
+    john, jane = records
+    assert john["name"] == "Dr. John Smith"
+    assert john["npi"] == "1234567893"
+    assert john["phone"] == "2125551234"
+    assert john["address"] == "123 Main St"
+    assert john["city"] == "New York"
+    assert john["state"] == "NY"
+    assert john["zip_code"] == "10001"
+    assert jane["name"] == "Dr. Jane Doe"
+    assert jane["npi"] == "1987654321"
+    assert not jane["phone"]
+
+
+def test_unlabelled_number_is_npi_only_when_check_digit_passes():
+    records = _records([
+        "Dr. John Smith",
+        "1234567893",
+        "2125551234",
+        "Dr. Jane Doe",
+        "1234567890",
+    ])
+    assert len(records) == 2
+    john, jane = records
+    assert john["npi"] == "1234567893"
+    assert john["phone"] == "2125551234"
+    assert not jane["npi"]
+    assert jane["phone"] == "1234567890"
+
+
+def test_labelled_npi_starts_new_record():
+    records = _records([
+        "NPI: 1234567893",
+        "Phone: (212) 555-1234",
+        "NPI: 1245319599",
+        "Phone: (646) 555-9876",
+    ])
+    assert [record["npi"] for record in records] == ["1234567893", "1245319599"]
+    assert [record["phone"] for record in records] == ["2125551234", "6465559876"]
+
+
+def test_repeated_npi_does_not_split():
+    records = _records([
+        "Dr. John Smith",
+        "NPI: 1234567893",
+        "1234567893",
+        "Phone: 212-555-1234",
+    ])
+    assert len(records) == 1
+    assert records[0]["phone"] == "2125551234"
+
+
+def test_tabular_roster_has_one_record_per_row():
+    records = _records([
+        "Name  NPI  Specialty  Phone  Address  City",
+        "John Smith  1234567893  Cardiology  (555) 123-4567  123 Main St  New York, NY 10001",
+        "Smith, Jane MD  1245319599  Pediatrics  (555) 987-6543  456 Oak Ave  Austin, TX 78701",
+    ])
+    assert len(records) == 2
+    john, jane = records
+    assert (john["name"], john["npi"], john["phone"]) == ("John Smith", "1234567893", "5551234567")
+    assert (john["address"], john["city"], john["state"], john["zip_code"]) == (
+        "123 Main St", "New York", "NY", "10001"
+    )
+    assert (jane["name"], jane["npi"], jane["phone"]) == ("Smith, Jane MD", "1245319599", "5559876543")
+    assert (jane["city"], jane["state"]) == ("Austin", "TX")
+
+
+def test_valid_unlabelled_npi_starts_new_record():
+    records = _records([
+        "Jane Doe 1234567893",
+        "(555) 123-4567",
+        "Smith, John MD",
+        "1245319599",
+    ])
+    assert [(record["name"], record["npi"]) for record in records] == [
+        ("Jane Doe", "1234567893"),
+        ("Smith, John MD", "1245319599"),
+    ]
+    assert records[0]["phone"] == "5551234567"
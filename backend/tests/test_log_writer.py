@@ -0,0 +1,61 @@
+"""Tests for the buffered validation log writer"""
+import asyncio
+
+from database.log_writer import ValidationLogWriter
+
+
+class _FailingSession:
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc_info):
+        return False
+
+    async def execute(self, statement, rows):
+        raise RuntimeError("database is locked")
+
+
+def _writer(session_factory) -> ValidationLogWriter:
+    return ValidationLogWriter(session_factory, max_queue=100, batch_size=10, flush_interval=0.01)
+
+
+def test_result_is_copied_when_queued():
+    async def run():
+        queued = []
+
+        class RecordingSession(_FailingSession):
+            async def execute(self, statement, rows):
+                queued.extend(rows)
+
+            async def commit(self):
+                pass
+
+        writer = _writer(RecordingSession)
+        writer.start()
+        result = {"issues": ["missing phone"], "score": 0.5}
+        await writer.write("job", 1, "qa", "qa", result)
+        result["issues"].append("added later")
+        result["score"] = 0.9
+        await writer.flush()
+        await writer.stop()
+        return queued
+
+    rows = asyncio.run(run())
+    assert rows[0]["result"] == {"issues": ["missing phone"], "score": 0.5}
+
+
+def test_rejected_batches_are_counted():
+    async def run():
+        writer = _writer(_FailingSession)
+        writer.start()
+        for provider_id in range(3):
+            await writer.write("job", provider_id, "qa", "qa", {})
+        await writer.flush()
+        await writer.stop()
+        return writer.stats()
+
+    stats = asyncio.run(run())
+    assert stats["written"] == 0
+    assert stats["failed"] == 3
+    assert stats["failed_batches"] == 1
+    assert stats["last_error"] == "RuntimeError: database is locked"
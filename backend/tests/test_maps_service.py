@@ -0,0 +1,37 @@
+"""Tests for the shared address validation cache"""
+import asyncio
+
+from services import maps_service
+from services.maps_service import MapsService
+
+
+def test_cached_result_keeps_each_callers_unit(monkeypatch):
+    monkeypatch.setattr(maps_service.random, "random", lambda: 0.5)
+    service = MapsService()
+
+    async def validate(address):
+        return await service.validate_address(address, "Austin", "TX", "78701")
+
+    async def run():
+        first = await validate("900 Pine St Ste 100")
+        second = await validate("900 Pine St Apt 7")
+        first[1]["lat"] = None
+        third = await validate("900 Pine St")
+        return first, second, third
+
+    first, second, third = asyncio.run(run())
+    assert first[1]["formatted_address"] == "900 PINE ST STE 100, AUSTIN, TX 78701"
+    assert second[1]["formatted_address"] == "900 PINE ST APT 7, AUSTIN, TX 78701"
+    assert third[1]["formatted_address"] == "900 PINE ST, AUSTIN, TX 78701"
+    assert second[1]["place_id"] == third[1]["place_id"]
+    assert third[1]["lat"] is not None
+
+
+def test_mock_address_with_unit_is_formatted_with_it():
+    service = MapsService()
+    is_valid, data = asyncio.run(service.validate_address("123 Main St Apt 5", "New York", "NY", "10001"))
+    assert is_valid
+    assert data["formatted_address"] == "123 MAIN ST APT 5, NEW YORK, NY 10001"
+    assert service.validated_addresses["123 main st new york ny 10001"]["formatted_address"] == (
+        "123 Main St, New York, NY 10001"
+    )
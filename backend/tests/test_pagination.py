@@ -0,0 +1,124 @@
+"""Tests for keyset pagination of provider listings"""
+import random
+from types import SimpleNamespace
+
+import pytest
+from sqlalchemy import create_engine, insert, select
+from sqlalchemy.orm import Session
+
+from database.database import Base
+from database.models import Provider, ValidationJob
+from database.pagination import (
+    InvalidCursorError,
+    ProviderFilters,
+    archived_page_filters,
+    archived_sort,
+    decode_cursor,
+    encode_cursor,
+    provider_page_query,
+)
+
+PAGE_SIZE = 7
+
+
+def _rows(count: int = 60):
+    rng = random.Random(5)
+    # Few distinct confidences, so most pages end inside a run of ties
+    return [
+        {
+            "id": index + 1,
+            "job_id": "job",
+            "name": f"Provider {index}",
+            "state": rng.choice(["NY", "TX"]),
+            "needs_review": rng.random() < 0.5,
+            "confidence_overall": rng.choice([0.25, 0.5, 0.75]),
+        }
+        for index in range(count)
+    ]
+
+
+def _reference(rows, sort: str, filters: ProviderFilters):
+    matching = [
+        row for row in rows
+        if all(row[name] == value for name, value in (
+            ("needs_review", filters.needs_review), ("state", filters.state)
+        ) if value is not None)
+        and (filters.min_confidence is None or row["confidence_overall"] >= filters.min_confidence)
+    ]
+    descending = sort.startswith("-")
+    if sort.lstrip("-") == "confidence":
+        key = lambda row: (row["confidence_overall"], row["id"])  # noqa: E731
+    else:
+        key = lambda row: row["id"]  # noqa: E731
+    return [row["id"] for row in sorted(matching, key=key, reverse=descending)]
+
+
+@pytest.fixture
+def session(tmp_path):
+    engine = create_engine(f"sqlite:///{tmp_path / 'pages.db'}")
+    Base.metadata.create_all(engine)
+    with engine.begin() as connection:
+        connection.execute(insert(ValidationJob.__table__), [{"job_id": "job", "status": "completed"}])
+        connection.execute(insert(Provider.__table__), _rows())
+    with Session(engine) as session:
+        yield session
+    engine.dispose()
+
+
+def _walk(session, sort: str, filters: ProviderFilters):
+    """Ids of every page, following the cursor the way the endpoint issues it"""
+    ids, cursor = [], None
+    while True:
+        after = decode_cursor(cursor, sort) if cursor else None
+        query = provider_page_query(select(Provider).where(Provider.job_id == "job"), sort, after, filters)
+        page = session.execute(query.limit(PAGE_SIZE + 1)).scalars().all()
+        ids.extend(provider.id for provider in page[:PAGE_SIZE])
+        if len(page) <= PAGE_SIZE:
+            return ids
+        cursor = encode_cursor(sort, page[PAGE_SIZE - 1])
+
+
+@pytest.mark.parametrize("sort", ["id", "-id", "confidence", "-confidence"])
+@pytest.mark.parametrize("filters", [
+    ProviderFilters(),
+    ProviderFilters(needs_review=True),
+    ProviderFilters(state="TX", min_confidence=0.5),
+])
+def test_cursor_pages_cover_listing_once_in_order(session, sort, filters):
+    assert _walk(session, sort, filters) == _reference(_rows(), sort, filters)
+
+
+def test_cursor_for_another_sort_is_rejected():
+    cursor = encode_cursor("-confidence", SimpleNamespace(confidence_overall=0.5, id=3))
+    assert decode_cursor(cursor, "-confidence") == [0.5, 3]
+    with pytest.raises(InvalidCursorError):
+        decode_cursor(cursor, "confidence")
+    with pytest.raises(InvalidCursorError):
+        decode_cursor("not-a-cursor", "id")
+
+
+@pytest.mark.parametrize("sort", ["id", "-confidence", "confidence"])
+def test_archived_pages_match_hot_table_pages(tmp_path, sort):
+    pa = pytest.importorskip("pyarrow")
+    pq = pytest.importorskip("pyarrow.parquet")
+    from database.archive import read_archived_rows
+
+    rows = _rows()
+    path = str(tmp_path / "providers.parquet")
+    pq.write_table(pa.Table.from_pylist(rows), path, row_group_size=10)
+    filters = ProviderFilters(needs_review=True)
+
+    ids, after = [], None
+    while True:
+        page = read_archived_rows(
+            path, 0, PAGE_SIZE + 1,
+            archived_page_filters(sort, after, filters),
+            None,
+            archived_sort(sort) if sort != "id" else None
+        )
+        ids.extend(row["id"] for row in page[:PAGE_SIZE])
+        if len(page) <= PAGE_SIZE:
+            break
+        after = decode_cursor(encode_cursor(sort, SimpleNamespace(**page[PAGE_SIZE - 1])), sort)
+
+    assert ids == _reference(rows, sort, filters)
@@ -0,0 +1,27 @@
+"""Tests for the Arrow roster readers"""
+import json
+
+import pytest
+
+pytest.importorskip("pyarrow")
+
+from utils.roster_formats import iter_ndjson_batches  # noqa: E402
+
+
+def test_ndjson_is_read_in_bounded_batches_as_text(tmp_path):
+    path = tmp_path / "roster.ndjson"
+    rows = [{"name": f"Provider {index}", "npi": 1234567800 + index, "zip": "02134"} for index in range(7)]
+    rows[5]["phone"] = 2125551234
+    path.write_bytes(
+        b"\xef\xbb\xbf" + b"\n".join(json.dumps(row).encode() for row in rows[:4])
+        + b"\n\n" + b"\n".join(json.dumps(row).encode() for row in rows[4:])
+    )
+
+    batches = list(iter_ndjson_batches(str(path), batch_size=3))
+
+    assert [batch.num_rows for batch in batches] == [3, 3, 1]
+    records = [record for batch in batches for record in batch.to_pylist()]
+    assert [record["npi"] for record in records] == [str(1234567800 + index) for index in range(7)]
+    assert records[0]["zip"] == "02134"
+    assert records[5]["phone"] == "2125551234"
+    assert "phone" not in records[0]
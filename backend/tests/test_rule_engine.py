@@ -0,0 +1,131 @@
+"""Tests for the declarative QA rule set"""
+import asyncio
+import random
+
+import numpy as np
+import pytest
+
+from agents.qa_agent import QAAgent
+from utils.confidence import calculate_overall_confidence
+from utils.fuzzy_match import calculate_similarity
+from utils.rule_engine import DEFAULT_RULES_PATH, RULE_TYPES, CompiledRule, RuleEngine
+
+TEXT_VALUES = [
+    None, "", "John Smith", "Jon Smyth", "Dr. Jane Doe", "123 Test St", "456 Oak Ave",
+    "12345 Example Rd", "212-555-1234", "1 (800) 555 1234", "555-1234", "x²1234567890"
+]
+TEXT_FIELDS = ["name", "validated_name", "phone", "validated_phone", "address", "validated_address"]
+
+
+def _providers(count: int = 1500):
+    rng = random.Random(27)
+    providers = []
+    for _ in range(count):
+        provider = {field: rng.choice(TEXT_VALUES) for field in TEXT_FIELDS if rng.random() < 0.85}
+        for field in ["confidence_name", "confidence_phone", "confidence_address", "confidence_specialty"]:
+            if rng.random() < 0.8:
+                provider[field] = rng.random()
+        provider["issues"] = ["issue"] * rng.randint(0, 2)
+        providers.append(provider)
+    return providers
+
+
+def _baseline_qa(provider):
+    """The QA checks as QAAgent hard-coded them before the rule set existed"""
+    result = {"needs_review": False, "is_suspicious": False, "issues": provider.get("issues", []), "validation_notes": ""}
+    overall_confidence = calculate_overall_confidence(provider)
+    if overall_confidence < 0.5:
+        result["needs_review"] = True
+        result["issues"].append("Low overall confidence score")
+    missing = [
+        field for field in ["name", "phone", "address"]
+        if not provider.get(field) and not provider.get(f"validated_{field}")
+    ]
+    if missing:
+        result["needs_review"] = True
+        result["issues"].append(f"Missing critical fields: {', '.join(missing)}")
+    suspicious = []
+    if provider.get("name") and provider.get("validated_name"):
+        if calculate_similarity(provider["name"], provider["validated_name"]) < 0.7:
+            suspicious.append("Name mismatch between original and validated")
+    if provider.get("phone"):
+        if len(''.join(filter(str.isdigit, provider["phone"]))) not in [10, 11]:
+            suspicious.append("Invalid phone number format")
+    if provider.get("address"):
+        if any(word in provider["address"].lower() for word in ["test", "example", "fake", "dummy", "12345"]):
+            suspicious.append("Suspicious address pattern")
+    if len(result["issues"]) >= 3:
+        result["is_suspicious"] = True
+        result["issues"].append("Multiple validation issues detected")
+    if suspicious:
+        result["is_suspicious"] = True
+        result["issues"].extend(suspicious)
+    notes = []
+    if result["needs_review"]:
+        notes.append("Requires manual review")
+    if result["is_suspicious"]:
+        notes.append("Suspicious patterns detected")
+    if overall_confidence >= 0.8:
+        notes.append("High confidence validation")
+    elif overall_confidence >= 0.6:
+        notes.append("Moderate confidence validation")
+    else:
+        notes.append("Low confidence validation")
+    result["validation_notes"] = "; ".join(notes)
+    return result
+
+
+def test_default_rule_set_matches_former_qa_checks():
+    agent = QAAgent()
+
+    async def run(provider):
+        return await agent.process(dict(provider, issues=list(provider["issues"])), None)
+
+    for provider in _providers():
+        expected = _baseline_qa(dict(provider, issues=list(provider["issues"])))
+        assert asyncio.run(run(provider)) == expected
+
+
+def _engine_with_every_rule_type() -> RuleEngine:
+    engine = RuleEngine.from_file(str(DEFAULT_RULES_PATH))
+    extra = RuleEngine({"rules": [
+        {"id": "high_confidence", "type": "threshold", "field": "confidence_overall", "above": 0.9,
+         "message": "Too good"},
+        {"id": "test_word", "type": "regex", "field": "address", "pattern": r"\btest\b",
+         "case_insensitive": True, "message": "Test address"},
+        {"id": "no_street_number", "type": "regex", "field": "address", "pattern": r"^\d+\s",
+         "negate": True, "message": "No street number"},
+    ]})
+    engine.rules.extend(extra.rules)
+    return engine
+
+
+def test_evaluate_and_evaluate_masks_agree_for_every_rule_type():
+    engine = _engine_with_every_rule_type()
+    assert {rule.rule_type for rule in engine.rules} == set(RULE_TYPES)
+
+    providers = _providers()
+    rng = random.Random(7)
+    for provider in providers:
+        provider["confidence_overall"] = rng.choice([None, 0.2, 0.5, 0.95])
+        if provider.get("phone") and rng.random() < 0.5:
+            provider["canonical_phone"] = ''.join(filter(str.isdigit, provider["phone"]))[:10]
+
+    columns = {
+        field: np.array([provider.get(field) for provider in providers], dtype=object)
+        for rule in engine.rules for field in rule.fields
+    }
+    masks = dict((rule.rule_id, mask) for rule, mask in engine.evaluate_masks(columns, len(providers)))
+    for index, provider in enumerate(providers):
+        hit_ids = {hit.rule_id for hit in engine.evaluate(provider)}
+        mask_ids = {rule_id for rule_id, mask in masks.items() if mask[index]}
+        assert hit_ids == mask_ids, provider
+
+
+def test_rule_types_must_implement_check_and_mask():
+    class PartialRule(CompiledRule):
+        def check(self, provider):
+            return None
+
+    with pytest.raises(TypeError):
+        PartialRule({"id": "partial", "type": "partial", "message": "m"})
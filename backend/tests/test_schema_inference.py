@@ -0,0 +1,91 @@
+"""Tests for inferring and storing roster column mappings"""
+import asyncio
+
+import pandas as pd
+import pytest
+from sqlalchemy.ext.asyncio import create_async_engine, async_sessionmaker
+
+import database.models  # noqa: F401  (registers the tables on Base.metadata)
+from database.database import Base
+from utils import schema_inference
+from utils.schema_inference import infer_column_mapping, resolve_column_mapping, update_column_mapping
+
+NPIS = ["1234567893", "1245319599", "1003000126"]
+PHONES = ["(212) 555-1234", "310-555-5678", "312.555.0000"]
+
+
+def _infer(columns: dict) -> dict:
+    return infer_column_mapping(list(columns), pd.DataFrame(columns))
+
+
+def test_header_synonym_wins_over_value_inference():
+    # Office phone numbers that happen to pass the NPI check digit
+    mapping = _infer({"Provider Name": ["A", "B", "C"], "Office Phone": NPIS})
+
+    assert mapping == {"Provider Name": "name", "Office Phone": "phone"}
+
+
+def test_column_is_not_inferred_as_a_field_already_taken():
+    mapping = _infer({"NPI": NPIS, "Provider ID": NPIS, "Phone": PHONES, "Telephone": PHONES})
+
+    assert mapping == {"NPI": "npi", "Phone": "phone"}
+
+
+def test_fax_column_is_not_mapped_to_phone():
+    assert _infer({"Name": ["A", "B", "C"], "Fax": PHONES}) == {"Name": "name"}
+    assert _infer({"Fax Number": PHONES, "Contact": PHONES}) == {"Contact": "phone"}
+
+
+def _session_factory(tmp_path):
+    engine = create_async_engine(f"sqlite+aiosqlite:///{tmp_path / 'mappings.db'}")
+    return engine, async_sessionmaker(engine, expire_on_commit=False)
+
+
+def test_stored_mapping_is_reused_until_corrected(tmp_path, monkeypatch):
+    headers = ["Doctor", "Column B"]
+    monkeypatch.setattr(schema_inference, "_mapping_cache", type(schema_inference._mapping_cache)())
+
+    async def run():
+        engine, sessions = _session_factory(tmp_path)
+        async with engine.begin() as connection:
+            await connection.run_sync(Base.metadata.create_all)
+
+        async with sessions() as session:
+            first = await resolve_column_mapping(
+                session, headers, pd.DataFrame({"Doctor": ["A"], "Column B": PHONES[:1]})
+            )
+            await session.commit()
+
+        # Values of a later file with the same header row are not sampled again,
+        # whether the mapping comes from the process cache or the database
+        monkeypatch.setattr(schema_inference, "infer_column_mapping", None)
+        reused = []
+        for clear_cache in (False, True):
+            if clear_cache:
+                schema_inference._mapping_cache.clear()
+            async with sessions() as session:
+                reused.append(await resolve_column_mapping(
+                    session, headers, pd.DataFrame({"Doctor": ["A"], "Column B": NPIS[:1]})
+                ))
+
+        signature = schema_inference.header_signature(headers)
+        async with sessions() as session:
+            with pytest.raises(ValueError):
+                await update_column_mapping(session, signature, {"Column B": "fax"})
+            stored = await update_column_mapping(session, signature, {"Doctor": "name", "Column B": "npi"})
+            await session.commit()
+            missing = await update_column_mapping(session, "unknown", {})
+
+        async with sessions() as session:
+            corrected = await resolve_column_mapping(
+                session, headers, pd.DataFrame({"Doctor": ["A"], "Column B": PHONES[:1]})
+            )
+        await engine.dispose()
+        return first, reused, stored, missing, corrected
+
+    first, reused, stored, missing, corrected = asyncio.run(run())
+
+    assert reused == [first, first]
+    assert first == {"Doctor": "name", "Column B": "phone"}
+    assert stored.mapping == corrected == {"Doctor": "name", "Column B": "npi"}
+    assert missing is None
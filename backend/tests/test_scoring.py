@@ -0,0 +1,71 @@
+"""Columnar job scoring must match the per-provider reference functions exactly"""
+import asyncio
+import random
+
+from agents.directory_agent import DirectoryAgent
+from agents.qa_agent import QAAgent
+from utils.confidence import calculate_overall_confidence
+from utils.scoring import CONFIDENCE_COLUMNS, TEXT_COLUMNS, build_score_frame, score_frame
+
+VALUES = [
+    None, "", " ", "John Smith", "Jon Smyth", "123 Test St", "456 Oak Ave Ste 2",
+    "212-555-1234", "555", "1 (800) 555 1234 9", "x²1234567890", "test@example.com"
+]
+
+
+def _providers(count: int = 2000):
+    rng = random.Random(26)
+    providers = []
+    for index in range(count):
+        provider = {"id": index}
+        for field in TEXT_COLUMNS:
+            if rng.random() < 0.85:
+                provider[field] = rng.choice(VALUES)
+        # Missing confidences are left out: the per-row reference defaults them to 0.0
+        for field in CONFIDENCE_COLUMNS:
+            if rng.random() < 0.85:
+                provider[field] = rng.choice([0.0, 0.7, 0.8, 1.0, rng.random()])
+        provider["issues"] = ["issue"] * rng.randint(0, 3)
+        providers.append(provider)
+    return providers
+
+
+def test_score_frame_matches_per_row_functions():
+    providers = _providers()
+    scores = score_frame(build_score_frame(providers))
+    qa_agent, directory_agent = QAAgent(), DirectoryAgent()
+
+    async def reference(provider):
+        provider = dict(provider, issues=list(provider["issues"]))
+        qa_result = await qa_agent.process(provider, None)
+        provider.update(qa_result)
+        directory_result = await directory_agent.process(provider, None)
+        return (
+            calculate_overall_confidence(provider),
+            provider["confidence_overall"],
+            directory_agent._calculate_completeness(provider),
+            directory_agent._check_critical_fields(provider),
+            qa_result["needs_review"],
+            qa_result["is_suspicious"],
+            directory_result["priority_score"],
+            directory_result["is_validated"],
+            directory_result["directory_status"],
+        )
+
+    async def run():
+        return [await reference(provider) for provider in providers]
+
+    expected = asyncio.run(run())
+    for row, want in zip(scores.itertuples(index=False), expected):
+        got = (
+            row.confidence_overall,
+            row.confidence_overall,
+            row.completeness,
+            row.critical_fields,
+            bool(row.needs_review),
+            bool(row.is_suspicious),
+            row.priority_score,
+            bool(row.is_validated),
+            row.directory_status,
+        )
+        assert got == want, f"provider {row.id}"
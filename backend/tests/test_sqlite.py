@@ -0,0 +1,29 @@
+"""Tests for the SQLite connection profile of the read-only pool"""
+import pytest
+from sqlalchemy import create_engine, text
+
+from database.sqlite import install_snapshot_transactions, install_sqlite_profile
+
+
+def _read_engine(path, profile: str):
+    writer = create_engine(f"sqlite:///{path}")
+    install_sqlite_profile(writer, profile)
+    with writer.begin() as connection:
+        connection.exec_driver_sql("CREATE TABLE items (id INTEGER PRIMARY KEY)")
+        connection.exec_driver_sql("INSERT INTO items DEFAULT VALUES")
+    writer.dispose()
+
+    reader = create_engine(f"sqlite:///{path}")
+    install_sqlite_profile(reader, profile, read_only=True)
+    install_snapshot_transactions(reader)
+    return reader
+
+
+@pytest.mark.parametrize("profile, holds_snapshot", [("performance", True), ("default", False)])
+def test_snapshot_transaction_only_in_wal_mode(tmp_path, profile, holds_snapshot):
+    reader = _read_engine(tmp_path / f"{profile}.db", profile)
+    with reader.connect() as connection:
+        assert connection.execute(text("SELECT count(*) FROM items")).scalar() == 1
+        # A held read transaction in rollback-journal mode would block writers' commits
+        assert connection.connection.dbapi_connection.in_transaction is holds_snapshot
+    reader.dispose()
@@ -0,0 +1,29 @@
+"""Tests for the on-disk extracted text cache"""
+import os
+
+from utils.text_cache import TextCache
+
+
+def test_eviction_leaves_writes_in_progress_alone(tmp_path):
+    cache = TextCache(str(tmp_path), max_bytes=10)
+    cache.put("page", "aa" * 32, "x" * 8)
+    temp_path = os.path.join(str(tmp_path), "page", "bb", "bb.partial.tmp")
+    os.makedirs(os.path.dirname(temp_path))
+    with open(temp_path, "w") as f:
+        f.write("y" * 100)
+
+    cache.put("page", "cc" * 32, "z" * 8)
+
+    assert os.path.exists(temp_path)
+    assert cache.lookup("page", "aa" * 32) is None
+    assert cache.lookup("page", "cc" * 32) == "z" * 8
+    assert cache.stats()["bytes"] == 8
+
+
+def test_failed_write_is_a_miss(tmp_path):
+    blocker = tmp_path / "page"
+    blocker.write_text("not a directory")
+    cache = TextCache(str(tmp_path), max_bytes=1000)
+
+    assert cache.store("page", "aa" * 32, "text") == 0
+    assert cache.lookup("page", "aa" * 32) is None
@@ -1,5 +1,5 @@
 from .file_handler import save_uploaded_file, read_csv_file, extract_pdf_text
-from .fuzzy_match import fuzzy_match_strings, calculate_similarity
+from .fuzzy_match import fuzzy_match_strings, fuzzy_match_threshold, calculate_similarity
 from .confidence import calculate_confidence_score, calculate_overall_confidence
 
 __all__ = [
@@ -7,6 +7,7 @@ __all__ = [
     "read_csv_file",
     "extract_pdf_text",
     "fuzzy_match_strings",
+    "fuzzy_match_threshold",
     "calculate_similarity",
     "calculate_confidence_score",
     "calculate_overall_confidence"
@@ -0,0 +1,322 @@
+"""
+US address parsing and standardization
+
+Addresses are split into components and normalized with the USPS
+abbreviation tables (Publication 28: street suffixes, directionals and
+secondary unit designators), so "456 Oak Avenue, Suite 200" and
+"456 OAK AVE STE 200" compare and cache as the same address. Parsing is
+memoized in a bounded LRU cache.
+"""
+import re
+from functools import lru_cache
+from typing import Optional, NamedTuple, Dict, Any
+from config import settings
+from utils.fuzzy_match import fuzzy_match_strings
+
+
+class AddressComponents(NamedTuple):
+    """Standardized address components (upper case, USPS abbreviations)"""
+    number: str
+    predirectional: str
+    street: str
+    suffix: str
+    postdirectional: str
+    unit: str
+    city: str
+    state: str
+    zip5: str
+    zip4: str
+
+
+# USPS street suffix abbreviations (common and standard forms)
+STREET_SUFFIXES = {
+    "ALLEY": "ALY", "ALLEE": "ALY", "ALLY": "ALY", "ALY": "ALY",
+    "AVENUE": "AVE", "AV": "AVE", "AVE": "AVE", "AVEN": "AVE", "AVENU": "AVE", "AVN": "AVE", "AVNUE": "AVE",
+    "BEND": "BND", "BND": "BND",
+    "BOULEVARD": "BLVD", "BLVD": "BLVD", "BOUL": "BLVD", "BOULV": "BLVD",
+    "BYPASS": "BYP", "BYP": "BYP",
+    "CAUSEWAY": "CSWY", "CSWY": "CSWY",
+    "CENTER": "CTR", "CENTRE": "CTR", "CNTR": "CTR", "CTR": "CTR",
+    "CIRCLE": "CIR", "CIR": "CIR", "CIRC": "CIR", "CRCL": "CIR",
+    "COURT": "CT", "CT": "CT",
+    "COVE": "CV", "CV": "CV",
+    "CREEK": "CRK", "CRK": "CRK",
+    "CROSSING": "XING", "XING": "XING", "CRSSNG": "XING",
+    "DRIVE": "DR", "DR": "DR", "DRIV": "DR", "DRV": "DR",
+    "EXPRESSWAY": "EXPY", "EXPY": "EXPY", "EXPW": "EXPY", "EXPR": "EXPY",
+    "FREEWAY": "FWY", "FWY": "FWY",
+    "GARDENS": "GDNS", "GDNS": "GDNS",
+    "GROVE": "GRV", "GRV": "GRV",
+    "HEIGHTS": "HTS", "HTS": "HTS", "HT": "HTS",
+    "HIGHWAY": "HWY", "HWY": "HWY", "HIWAY": "HWY", "HIWY": "HWY",
+    "HILL": "HL", "HL": "HL",
+    "HOLLOW": "HOLW", "HOLW": "HOLW",
+    "JUNCTION": "JCT", "JCT": "JCT",
+    "LAKE": "LK", "LK": "LK",
+    "LANDING": "LNDG", "LNDG": "LNDG",
+    "LANE": "LN", "LN": "LN",
+    "LOOP": "LOOP",
+    "MALL": "MALL",
+    "MANOR": "MNR", "MNR": "MNR",
+    "MEADOWS": "MDWS", "MDWS": "MDWS",
+    "PARK": "PARK", "PRK": "PARK",
+    "PARKWAY": "PKWY", "PKWY": "PKWY", "PARKWY": "PKWY", "PKY": "PKWY",
+    "PASS": "PASS",
+    "PATH": "PATH",
+    "PIKE": "PIKE",
+    "PLACE": "PL", "PL": "PL",
+    "PLAZA": "PLZ", "PLZ": "PLZ", "PLZA": "PLZ",
+    "POINT": "PT", "PT": "PT",
+    "RIDGE": "RDG", "RDG": "RDG",
+    "ROAD": "RD", "RD": "RD",
+    "ROUTE": "RTE", "RTE": "RTE",
+    "ROW": "ROW",
+    "RUN": "RUN",
+    "SQUARE": "SQ", "SQ": "SQ", "SQR": "SQ",
+    "STREET": "ST", "ST": "ST", "STR": "ST", "STRT": "ST",
+    "TERRACE": "TER", "TER": "TER", "TERR": "TER",
+    "TRACE": "TRCE", "TRCE": "TRCE",
+    "TRAIL": "TRL", "TRL": "TRL", "TRAILS": "TRL",
+    "TURNPIKE": "TPKE", "TPKE": "TPKE", "TRNPK": "TPKE",
+    "VIEW": "VW", "VW": "VW",
+    "VILLAGE": "VLG", "VLG": "VLG",
+    "VISTA": "VIS", "VIS": "VIS",
+    "WALK": "WALK",
+    "WAY": "WAY", "WY": "WAY"
+}
+
+DIRECTIONALS = {
+    "NORTH": "N", "N": "N", "SOUTH": "S", "S": "S", "EAST": "E", "E": "E", "WEST": "W", "W": "W",
+    "NORTHEAST": "NE", "NE": "NE", "NORTHWEST": "NW", "NW": "NW",
+    "SOUTHEAST": "SE", "SE": "SE", "SOUTHWEST": "SW", "SW": "SW"
+}
+
+# USPS secondary unit designators
+UNIT_DESIGNATORS = {
+    "APARTMENT": "APT", "APT": "APT",
+    "BUILDING": "BLDG", "BLDG": "BLDG",
+    "DEPARTMENT": "DEPT", "DEPT": "DEPT",
+    "FLOOR": "FL", "FL": "FL",
+    "LOT": "LOT",
+    "ROOM": "RM", "RM": "RM",
+    "SPACE": "SPC", "SPC": "SPC",
+    "SUITE": "STE", "STE": "STE",
+    "TRAILER": "TRLR", "TRLR": "TRLR",
+    "UNIT": "UNIT",
+    "#": "#"
+}
+
+STATE_ABBREVIATIONS = {
+    "ALABAMA": "AL", "ALASKA": "AK", "ARIZONA": "AZ", "ARKANSAS": "AR", "CALIFORNIA": "CA",
+    "COLORADO": "CO", "CONNECTICUT": "CT", "DELAWARE": "DE", "DISTRICT OF COLUMBIA": "DC",
+    "FLORIDA": "FL", "GEORGIA": "GA", "HAWAII": "HI", "IDAHO": "ID", "ILLINOIS": "IL",
+    "INDIANA": "IN", "IOWA": "IA", "KANSAS": "KS", "KENTUCKY": "KY", "LOUISIANA": "LA",
+    "MAINE": "ME", "MARYLAND": "MD", "MASSACHUSETTS": "MA", "MICHIGAN": "MI", "MINNESOTA": "MN",
+    "MISSISSIPPI": "MS", "MISSOURI": "MO", "MONTANA": "MT", "NEBRASKA": "NE", "NEVADA": "NV",
+    "NEW HAMPSHIRE": "NH", "NEW JERSEY": "NJ", "NEW MEXICO": "NM", "NEW YORK": "NY",
+    "NORTH CAROLINA": "NC", "NORTH DAKOTA": "ND", "OHIO": "OH", "OKLAHOMA": "OK", "OREGON": "OR",
+    "PENNSYLVANIA": "PA", "PUERTO RICO": "PR", "RHODE ISLAND": "RI", "SOUTH CAROLINA": "SC",
+    "SOUTH DAKOTA": "SD", "TENNESSEE": "TN", "TEXAS": "TX", "UTAH": "UT", "VERMONT": "VT",
+    "VIRGINIA": "VA", "WASHINGTON": "WA", "WEST VIRGINIA": "WV", "WISCONSIN": "WI", "WYOMING": "WY"
+}
+_STATE_CODES = set(STATE_ABBREVIATIONS.values())
+
+_PUNCTUATION = re.compile(r"[^\w#\-/ ]")
+_WHITESPACE = re.compile(r"\s+")
+_HOUSE_NUMBER = re.compile(r"^\d+[A-Z]?(?:-\d+[A-Z]?)?$|^\d+/\d+$")
+_UNIT_ATTACHED = re.compile(r"^#(\w+)$")
+_STATE_ZIP_TAIL = re.compile(r"(?:^|\s)([A-Z]{2})(?:\s+(\d{5})(?:-?(\d{4}))?)?$")
+_ZIP_DIGITS = re.compile(r"\D")
+
+
+def _clean(value: Optional[str]) -> str:
+    """Upper-case text with punctuation removed and whitespace collapsed"""
+    if not value:
+        return ""
+    text = _PUNCTUATION.sub(" ", str(value).upper())
+    return _WHITESPACE.sub(" ", text).strip()
+
+
+def _split_free_text(address: str):
+    """Split "street, city, ST 12345" into street line, city, state and ZIP"""
+    parts = [part.strip() for part in str(address).split(",") if part.strip()]
+    if len(parts) < 2:
+        return address, None, None, None
+
+    tail = _clean(parts[-1])
+    match = _STATE_ZIP_TAIL.search(tail)
+    if match and match.group(1) in _STATE_CODES:
+        state = match.group(1)
+        zip_code = (match.group(2) or "") + (match.group(3) or "")
+        city_in_tail = tail[:match.start()].strip()
+        city = city_in_tail or (parts[-2] if len(parts) > 2 else None)
+        street_parts = parts[:-1] if city_in_tail else parts[:-2] or parts[:1]
+        return ", ".join(street_parts), city, state, zip_code or None
+
+    return address, None, None, None
+
+
+def _parse_street_line(line: str):
+    """Parse the delivery line into number, directionals, street name, suffix and unit"""
+    tokens = _clean(line).split()
+
+    # Secondary unit: designator and its identifier, anywhere after the street
+    unit = ""
+    for index, token in enumerate(tokens):
+        attached = _UNIT_ATTACHED.match(token)
+        if attached and index > 0:
+            unit = f"# {attached.group(1)}"
+            del tokens[index:index + 1]
+            break
+        if token in UNIT_DESIGNATORS and index > 1:
+            identifier = tokens[index + 1] if index + 1 < len(tokens) else ""
+            unit = f"{UNIT_DESIGNATORS[token]} {identifier}".strip()
+            del tokens[index:index + 2]
+            break
+
+    number = ""
+    if tokens and _HOUSE_NUMBER.match(tokens[0]):
+        number = tokens.pop(0)
+
+    # A leading directional is only a prefix if a street name follows it ("12 West St" is West)
+    predirectional = ""
+    if tokens and tokens[0] in DIRECTIONALS and (
+        len(tokens) > 2 or (len(tokens) == 2 and tokens[1] not in STREET_SUFFIXES)
+    ):
+        predirectional = DIRECTIONALS[tokens.pop(0)]
+
+    postdirectional = ""
+    if len(tokens) > 2 and tokens[-1] in DIRECTIONALS and tokens[-2] in STREET_SUFFIXES:
+        postdirectional = DIRECTIONALS[tokens.pop()]
+
+    suffix = ""
+    if len(tokens) > 1 and tokens[-1] in STREET_SUFFIXES:
+        suffix = STREET_SUFFIXES[tokens.pop()]
+
+    return number, predirectional, " ".join(tokens), suffix, postdirectional, unit
+
+
+def _standardize_state(state: Optional[str]) -> str:
+    """Two-letter state code for a state name or code"""
+    cleaned = _clean(state)
+    return STATE_ABBREVIATIONS.get(cleaned, cleaned)
+
+
+@lru_cache(maxsize=settings.ADDRESS_CACHE_SIZE)
+def _parse_address_cached(
+    address: str,
+    city: Optional[str],
+    state: Optional[str],
+    zip_code: Optional[str]
+) -> AddressComponents:
+    if not (city or state or zip_code):
+        address, city, state, zip_code = _split_free_text(address)
+
+    number, predirectional, street, suffix, postdirectional, unit = _parse_street_line(address)
+    zip_digits = _ZIP_DIGITS.sub("", zip_code or "")
+
+    return AddressComponents(
+        number=number,
+        predirectional=predirectional,
+        street=street,
+        suffix=suffix,
+        postdirectional=postdirectional,
+        unit=unit,
+        city=_clean(city),
+        state=_standardize_state(state),
+        zip5=zip_digits[:5],
+        zip4=zip_digits[5:9] if len(zip_digits) == 9 else ""
+    )
+
+
+def parse_address(
+    address: Optional[str],
+    city: Optional[str] = None,
+    state: Optional[str] = None,
+    zip_code: Optional[str] = None
+) -> AddressComponents:
+    """
+    Parse an address into standardized components
+
+    City, state and ZIP are taken from their own arguments when given,
+    otherwise from a trailing "city, ST 12345" in the address text.
+    """
+    return _parse_address_cached(
+        str(address or ""),
+        str(city) if city else None,
+        str(state) if state else None,
+        str(zip_code) if zip_code else None
+    )
+
+
+def format_address(components: AddressComponents, include_unit: bool = True) -> str:
+    """Single-line standardized address, e.g. "123 N MAIN ST STE 4, NEW YORK, NY 10001" """
+    street_line = " ".join(part for part in (
+        components.number,
+        components.predirectional,
+        components.street,
+        components.suffix,
+        components.postdirectional,
+        components.unit if include_unit else ""
+    ) if part)
+
+    zip_code = f"{components.zip5}-{components.zip4}" if components.zip4 else components.zip5
+    region = " ".join(part for part in (components.state, zip_code) if part)
+    return ", ".join(part for part in (street_line, components.city, region) if part)
+
+
+def address_key(components: AddressComponents) -> str:
+    """Lookup key for caches: lower-case delivery point without unit or ZIP+4"""
+    return " ".join(part for part in (
+        components.number,
+        components.predirectional,
+        components.street,
+        components.suffix,
+        components.postdirectional,
+        components.city,
+        components.state,
+        components.zip5
+    ) if part).lower()
+
+
+def compare_addresses(first: AddressComponents, second: AddressComponents) -> float:
+    """
+    Similarity of two parsed addresses (0-1)
+
+    Addresses with the same street components, and the same city, state and
+    ZIP5 wherever both sides have them, score 1.0 without fuzzy matching;
+    everything else is fuzzy-matched on the standardized text without units.
+    """
+    same_street = (
+        first.number == second.number and
+        first.predirectional == second.predirectional and
+        first.street == second.street and
+        first.suffix == second.suffix and
+        first.postdirectional == second.postdirectional
+    )
+    if same_street and first.street:
+        comparable = all(
+            not a or not b or a == b
+            for a, b in ((first.city, second.city), (first.state, second.state), (first.zip5, second.zip5))
+        )
+        if comparable:
+            return 1.0
+
+    _, score = fuzzy_match_strings(
+        format_address(first, include_unit=False),
+        format_address(second, include_unit=False)
+    )
+    return score
+
+
+def address_cache_info() -> Dict[str, Any]:
+    """Hit and size statistics of the parse cache"""
+    info = _parse_address_cached.cache_info()
+    lookups = info.hits + info.misses
+    return {
+        "hits": info.hits,
+        "misses": info.misses,
+        "size": info.currsize,
+        "max_size": info.maxsize,
+        "hit_rate": info.hits / lookups if lookups else 0.0
+    }
@@ -0,0 +1,188 @@
+"""
+Bounded executor for blocking work and event-loop lag monitoring
+
+Parsing, hashing and PDF work is dispatched to a dedicated thread pool with
+a cap on admitted tasks, so a large upload queues behind its own work instead
+of stalling request handling. A monitor task measures how late the event
+loop wakes up to show whether anything still blocks it.
+"""
+import asyncio
+import threading
+import time
+import weakref
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, AsyncIterator, Callable, Dict, Iterator, Optional, TypeVar
+from config import settings
+
+
+T = TypeVar("T")
+
+_DONE = object()
+
+
+class BlockingExecutor:
+    """Thread pool with a bound on admitted tasks and queueing metrics"""
+
+    def __init__(self, max_workers: int, max_pending: int):
+        self.max_workers = max_workers
+        self.max_pending = max_pending
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="blocking")
+        # Admission slots per event loop (asyncio semaphores are bound to one loop)
+        self._slots = weakref.WeakKeyDictionary()
+        self._lock = threading.Lock()
+        self.submitted = 0
+        self.completed = 0
+        self.failed = 0
+        self.waiting = 0
+        self.running = 0
+        self.total_queue_seconds = 0.0
+        self.max_queue_seconds = 0.0
+        self.total_run_seconds = 0.0
+
+    async def run(self, func: Callable[..., T], *args: Any, **kwargs: Any) -> T:
+        """Run func(*args, **kwargs) in the pool, waiting for a slot if the pool is saturated"""
+        enqueued = time.perf_counter()
+        with self._lock:
+            self.submitted += 1
+            self.waiting += 1
+
+        loop = asyncio.get_running_loop()
+        slots = self._slots.get(loop)
+        if slots is None:
+            slots = self._slots[loop] = asyncio.Semaphore(self.max_pending)
+        try:
+            await slots.acquire()
+        except BaseException:
+            with self._lock:
+                self.waiting -= 1
+            raise
+
+        def call():
+            started = time.perf_counter()
+            with self._lock:
+                waited = started - enqueued
+                self.waiting -= 1
+                self.running += 1
+                self.total_queue_seconds += waited
+                self.max_queue_seconds = max(self.max_queue_seconds, waited)
+            try:
+                return func(*args, **kwargs)
+            finally:
+                with self._lock:
+                    self.running -= 1
+                    self.total_run_seconds += time.perf_counter() - started
+
+        try:
+            result = await loop.run_in_executor(self._executor, call)
+        except BaseException:
+            with self._lock:
+                self.failed += 1
+            raise
+        finally:
+            slots.release()
+
+        with self._lock:
+            self.completed += 1
+        return result
+
+    def stats(self) -> Dict[str, Any]:
+        """Queue depth, throughput and wait times"""
+        with self._lock:
+            finished = self.completed + self.failed
+            return {
+                "max_workers": self.max_workers,
+                "max_pending": self.max_pending,
+                "submitted": self.submitted,
+                "completed": self.completed,
+                "failed": self.failed,
+                "waiting": self.waiting,
+                "running": self.running,
+                "avg_queue_ms": (self.total_queue_seconds / finished * 1000) if finished else 0.0,
+                "max_queue_ms": self.max_queue_seconds * 1000,
+                "avg_run_ms": (self.total_run_seconds / finished * 1000) if finished else 0.0
+            }
+
+    def shutdown(self):
+        self._executor.shutdown(wait=True, cancel_futures=True)
+
+
+_executor: Optional[BlockingExecutor] = None
+
+
+def get_blocking_executor() -> BlockingExecutor:
+    """Process-wide executor for blocking file work, created on first use"""
+    global _executor
+    if _executor is None:
+        _executor = BlockingExecutor(settings.BLOCKING_WORKERS, settings.BLOCKING_MAX_PENDING)
+    return _executor
+
+
+def shutdown_blocking_executor():
+    """Stop the blocking executor, if it was started"""
+    global _executor
+    if _executor is not None:
+        _executor.shutdown()
+        _executor = None
+
+
+async def run_blocking(func: Callable[..., T], *args: Any, **kwargs: Any) -> T:
+    """Run a blocking call on the blocking executor"""
+    return await get_blocking_executor().run(func, *args, **kwargs)
+
+
+async def iterate_blocking(iterator: Iterator[T]) -> AsyncIterator[T]:
+    """Drive a blocking iterator (e.g. a chunked file reader) from the blocking executor"""
+    while True:
+        item = await run_blocking(next, iterator, _DONE)
+        if item is _DONE:
+            return
+        yield item
+
+
+class LoopLagMonitor:
+    """Samples how late the event loop runs a timer callback"""
+
+    def __init__(self, interval: float = 0.1, window: int = 600):
+        self.interval = interval
+        self.samples = deque(maxlen=window)
+        self.max_lag = 0.0
+        self._task: Optional[asyncio.Task] = None
+
+    async def _run(self):
+        loop = asyncio.get_running_loop()
+        while True:
+            expected = loop.time() + self.interval
+            await asyncio.sleep(self.interval)
+            lag = max(0.0, loop.time() - expected)
+            self.samples.append(lag)
+            self.max_lag = max(self.max_lag, lag)
+
+    def start(self):
+        if self._task is None:
+            self._task = asyncio.get_running_loop().create_task(self._run())
+
+    async def stop(self):
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+    def stats(self) -> Dict[str, Any]:
+        """Lag percentiles over the recent window, in milliseconds"""
+        samples = sorted(self.samples)
+        if not samples:
+            return {"samples": 0, "last_ms": 0.0, "p50_ms": 0.0, "p99_ms": 0.0, "max_ms": 0.0}
+        return {
+            "samples": len(samples),
+            "last_ms": self.samples[-1] * 1000,
+            "p50_ms": samples[len(samples) // 2] * 1000,
+            "p99_ms": samples[min(len(samples) - 1, int(len(samples) * 0.99))] * 1000,
+            "max_ms": self.max_lag * 1000
+        }
+
+
+loop_lag_monitor = LoopLagMonitor()
@@ -0,0 +1,105 @@
+"""
+Ingest-time canonicalization and format validation of contact fields
+
+Runs once per uploaded file with vectorized pandas string operations, so the
+agents can reuse the stored canonical forms and validity flags instead of
+re-running the per-value regexes in utils.confidence.
+"""
+from typing import Dict, Any, List
+import pandas as pd
+from utils.confidence import EMAIL_PATTERN
+
+
+# Canonical columns stored on Provider
+CANONICAL_FIELDS = [
+    "canonical_phone", "phone_valid",
+    "canonical_email", "email_valid",
+    "canonical_zip", "zip_valid",
+    "canonical_website", "website_valid"
+]
+
+WEBSITE_PATTERN = r'^https?://(?:[a-z0-9](?:[a-z0-9-]*[a-z0-9])?\.)+[a-z]{2,}(?::\d+)?(?:/\S*)?$'
+
+
+def _text_column(df: pd.DataFrame, field: str) -> pd.Series:
+    """Column as object strings, with missing or empty values as None"""
+    if field not in df.columns:
+        return pd.Series([None] * len(df), index=df.index, dtype=object)
+    values = df[field].astype("string")
+    present = values.notna() & (values != "")
+    return values.astype(object).where(present.fillna(False).astype(bool), None)
+
+
+def _finish(canonical: pd.Series, valid: pd.Series, present: pd.Series) -> Dict[str, pd.Series]:
+    """Mask canonical values and flags to None where the source value is missing"""
+    return {
+        "canonical": canonical.where(present, None).astype(object),
+        "valid": valid.astype(object).where(present, None)
+    }
+
+
+def canonicalize_phones(phones: pd.Series) -> Dict[str, pd.Series]:
+    """Phone numbers reduced to digits, valid when 10 digits or 11 starting with 1"""
+    present = phones.notna()
+    digits = phones.fillna("").str.replace(r'\D', '', regex=True)
+    lengths = digits.str.len()
+    valid = (lengths == 10) | ((lengths == 11) & digits.str.startswith("1"))
+    return _finish(digits, valid, present)
+
+
+def canonicalize_emails(emails: pd.Series) -> Dict[str, pd.Series]:
+    """Lowercased, trimmed emails; validity uses the same pattern as validate_email"""
+    present = emails.notna()
+    raw = emails.fillna("")
+    valid = raw.str.match(EMAIL_PATTERN.pattern)
+    return _finish(raw.str.strip().str.lower(), valid, present)
+
+
+def canonicalize_zip_codes(zip_codes: pd.Series) -> Dict[str, pd.Series]:
+    """ZIP codes as ZIP5 or ZIP5-ZIP4, valid when 5 or 9 digits"""
+    present = zip_codes.notna()
+    digits = zip_codes.fillna("").str.replace(r'\D', '', regex=True)
+    lengths = digits.str.len()
+    canonical = digits.where(lengths != 9, digits.str[:5] + "-" + digits.str[5:])
+    valid = lengths.isin([5, 9])
+    return _finish(canonical, valid, present)
+
+
+def canonicalize_websites(websites: pd.Series) -> Dict[str, pd.Series]:
+    """Lowercased URLs with an explicit scheme and no trailing slash"""
+    present = websites.notna()
+    url = websites.fillna("").str.strip().str.lower()
+    url = url.where(url.str.startswith("http"), "https://" + url)
+    url = url.str.rstrip("/")
+    valid = url.str.match(WEBSITE_PATTERN)
+    return _finish(url, valid, present)
+
+
+def canonicalize_contact_fields(df: pd.DataFrame) -> pd.DataFrame:
+    """
+    Canonicalize and validate phone, email, ZIP and website columns of a roster
+
+    Returns:
+        DataFrame aligned with df holding the CANONICAL_FIELDS columns
+    """
+    phone = canonicalize_phones(_text_column(df, "phone"))
+    email = canonicalize_emails(_text_column(df, "email"))
+    zip_code = canonicalize_zip_codes(_text_column(df, "zip_code"))
+    website = canonicalize_websites(_text_column(df, "website"))
+
+    return pd.DataFrame({
+        "canonical_phone": phone["canonical"],
+        "phone_valid": phone["valid"],
+        "canonical_email": email["canonical"],
+        "email_valid": email["valid"],
+        "canonical_zip": zip_code["canonical"],
+        "zip_valid": zip_code["valid"],
+        "canonical_website": website["canonical"],
+        "website_valid": website["valid"]
+    }, index=df.index)
+
+
+def canonical_records(df: pd.DataFrame) -> List[Dict[str, Any]]:
+    """Canonical columns of a roster as one dictionary per row"""
+    canonical = canonicalize_contact_fields(df)
+    return canonical.astype(object).where(canonical.notna(), None).to_dict("records")
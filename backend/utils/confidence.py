@@ -5,6 +5,29 @@ from typing import Dict, Any, Optional, Tuple
 import re
 
 
+# Field weights used for the overall confidence score
+OVERALL_CONFIDENCE_WEIGHTS = {
+    "confidence_name": 0.25,
+    "confidence_phone": 0.20,
+    "confidence_address": 0.25,
+    "confidence_specialty": 0.15,
+    "confidence_email": 0.10,
+    "confidence_website": 0.05
+}
+
+# Fields counted towards data completeness
+COMPLETENESS_FIELDS = [
+    "name", "npi", "specialty", "phone", "email",
+    "address", "city", "state", "zip_code", "website"
+]
+
+# Fields a provider cannot be listed without
+CRITICAL_FIELDS = ["name", "phone", "address"]
+
+NON_DIGIT_PATTERN = re.compile(r'\D')
+EMAIL_PATTERN = re.compile(r'^[a-zA-Z0-9._%+-]+@[a-zA-Z0-9.-]+\.[a-zA-Z]{2,}$')
+
+
 def calculate_confidence_score(
     original_value: Optional[str],
     validated_value: Optional[str],
@@ -57,19 +80,10 @@ def calculate_overall_confidence(provider_data: Dict[str, Any]) -> float:
     Returns:
         Overall confidence score (0-1)
     """
-    weights = {
-        "confidence_name": 0.25,
-        "confidence_phone": 0.20,
-        "confidence_address": 0.25,
-        "confidence_specialty": 0.15,
-        "confidence_email": 0.10,
-        "confidence_website": 0.05
-    }
-    
     total_weight = 0.0
     weighted_sum = 0.0
     
-    for field, weight in weights.items():
+    for field, weight in OVERALL_CONFIDENCE_WEIGHTS.items():
         score = provider_data.get(field, 0.0)
         weighted_sum += score * weight
         total_weight += weight
@@ -80,14 +94,8 @@ def calculate_overall_confidence(provider_data: Dict[str, Any]) -> float:
     return weighted_sum / total_weight
 
 
-def validate_phone(phone: Optional[str]) -> Tuple[bool, float]:
-    """Validate phone number format"""
-    if not phone:
-        return False, 0.0
-    
-    # Remove non-digits
-    digits = re.sub(r'\D', '', phone)
-    
+def phone_format_result(digits: str) -> Tuple[bool, float]:
+    """Validate a phone number already reduced to its digits"""
     # Check if it's a valid US phone number (10 or 11 digits)
     if len(digits) == 10:
         return True, 1.0
@@ -97,16 +105,36 @@ def validate_phone(phone: Optional[str]) -> Tuple[bool, float]:
         return False, 0.3
 
 
+def email_format_result(is_valid: bool) -> Tuple[bool, float]:
+    """Score an email whose format has already been checked"""
+    return (True, 1.0) if is_valid else (False, 0.2)
+
+
+def zip_format_result(digits: str) -> Tuple[bool, float]:
+    """Validate a ZIP code already reduced to its digits"""
+    if len(digits) == 5:
+        return True, 1.0
+    elif len(digits) == 9:
+        return True, 0.95
+    else:
+        return False, 0.3
+
+
+def validate_phone(phone: Optional[str]) -> Tuple[bool, float]:
+    """Validate phone number format"""
+    if not phone:
+        return False, 0.0
+    
+    # Remove non-digits
+    return phone_format_result(NON_DIGIT_PATTERN.sub('', phone))
+
+
 def validate_email(email: Optional[str]) -> Tuple[bool, float]:
     """Validate email format"""
     if not email:
         return False, 0.0
     
-    pattern = r'^[a-zA-Z0-9._%+-]+@[a-zA-Z0-9.-]+\.[a-zA-Z]{2,}$'
-    if re.match(pattern, email):
-        return True, 1.0
-    else:
-        return False, 0.2
+    return email_format_result(EMAIL_PATTERN.match(email) is not None)
 
 
 def validate_zip_code(zip_code: Optional[str]) -> Tuple[bool, float]:
@@ -115,12 +143,4 @@ def validate_zip_code(zip_code: Optional[str]) -> Tuple[bool, float]:
         return False, 0.0
     
     # Remove non-digits
-    digits = re.sub(r'\D', '', zip_code)
-    
-    if len(digits) == 5:
-        return True, 1.0
-    elif len(digits) == 9:
-        return True, 0.95
-    else:
-        return False, 0.3
-
+    return zip_format_result(NON_DIGIT_PATTERN.sub('', zip_code))
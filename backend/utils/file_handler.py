@@ -2,16 +2,91 @@
 File handling utilities for CSV and PDF processing
 """
 import os
+import re
 import csv
 import json
 import uuid
-from typing import List, Dict, Any
+import hashlib
+from typing import List, Dict, Any, Iterator, NamedTuple, Optional
 from pathlib import Path
 import aiofiles
-from pdf2image import convert_from_path
-import pytesseract
-from PIL import Image
 import pandas as pd
+from config import settings
+from utils.ocr import extract_text_layer, ocr_pdf
+from utils.text_cache import get_text_cache, file_sha256
+from utils.confidence import NON_DIGIT_PATTERN
+from utils.blocking import run_blocking
+from utils.schema_inference import npi_check_digit_valid
+
+
+class UploadTooLargeError(Exception):
+    """Raised when an upload exceeds the configured size limit"""
+
+
+class SavedUpload(NamedTuple):
+    """An upload spooled to disk"""
+    path: str
+    size: int
+    sha256: str
+
+
+async def save_upload_stream(
+    upload: Any,
+    filename: str,
+    upload_dir: str,
+    max_size: int,
+    chunk_size: int = 1024 * 1024
+) -> SavedUpload:
+    """
+    Stream an upload to disk in chunks, hashing and size-checking as it goes
+    
+    Args:
+        upload: Object with an async read(size) method, e.g. fastapi.UploadFile
+        filename: Original filename (used for the extension)
+        upload_dir: Directory to save into
+        max_size: Maximum number of bytes accepted
+        chunk_size: Bytes read per chunk
+    
+    Returns:
+        SavedUpload with the file path, size and SHA-256 hex digest
+    
+    Raises:
+        UploadTooLargeError: As soon as more than max_size bytes were read;
+            the partial file is removed
+    """
+    os.makedirs(upload_dir, exist_ok=True)
+    
+    file_id = str(uuid.uuid4())
+    file_ext = Path(filename).suffix
+    file_path = os.path.join(upload_dir, f"{file_id}{file_ext}")
+    
+    hasher = hashlib.sha256()
+    size = 0
+    
+    def write_chunk(f, chunk: bytes):
+        hasher.update(chunk)
+        f.write(chunk)
+    
+    try:
+        f = await run_blocking(open, file_path, 'wb')
+        try:
+            while True:
+                chunk = await upload.read(chunk_size)
+                if not chunk:
+                    break
+                size += len(chunk)
+                if size > max_size:
+                    raise UploadTooLargeError(f"Upload exceeds maximum size of {max_size} bytes")
+                # Hashing and writing run off the event loop
+                await run_blocking(write_chunk, f, chunk)
+        finally:
+            await run_blocking(f.close)
+    except BaseException:
+        if os.path.exists(file_path):
+            os.remove(file_path)
+        raise
+    
+    return SavedUpload(path=file_path, size=size, sha256=hasher.hexdigest())
 
 
 async def save_uploaded_file(file_content: bytes, filename: str, upload_dir: str) -> str:
@@ -28,97 +103,246 @@ async def save_uploaded_file(file_content: bytes, filename: str, upload_dir: str
     return file_path
 
 
-async def read_csv_file(file_path: str) -> List[Dict[str, Any]]:
-    """Read CSV file and return list of dictionaries"""
+def frame_to_records(df: pd.DataFrame) -> List[Dict[str, Any]]:
+    """Convert a DataFrame to a list of dictionaries with missing values as None"""
+    return df.astype(object).where(df.notna(), None).to_dict('records')
+
+
+async def read_csv_frame(file_path: str) -> pd.DataFrame:
+    """Read CSV file into a DataFrame of text columns"""
     try:
-        df = pd.read_csv(file_path)
-        # Convert DataFrame to list of dictionaries
-        records = df.to_dict('records')
-        return records
+        # Keep every column as text so IDs, phones and ZIP codes are not mangled
+        return await run_blocking(pd.read_csv, file_path, dtype=str)
     except Exception as e:
         raise Exception(f"Error reading CSV file: {str(e)}")
 
 
-async def extract_pdf_text(file_path: str) -> str:
-    """Extract text from PDF using OCR"""
+def iter_csv_chunks(file_path: str, chunk_size: int) -> Iterator[pd.DataFrame]:
+    """Read CSV file in fixed-size chunks of text columns"""
+    try:
+        with pd.read_csv(file_path, dtype=str, chunksize=chunk_size) as reader:
+            for chunk in reader:
+                yield chunk
+    except Exception as e:
+        raise Exception(f"Error reading CSV file: {str(e)}")
+
+
+async def read_csv_file(file_path: str) -> List[Dict[str, Any]]:
+    """Read CSV file and return list of dictionaries"""
+    df = await read_csv_frame(file_path)
+    # Convert DataFrame to list of dictionaries
+    return frame_to_records(df)
+
+
+async def extract_pdf_text(file_path: str, content_hash: Optional[str] = None) -> str:
+    """
+    Extract text from PDF, falling back to parallel page-level OCR
+    
+    Results are cached by the file's SHA-256 (content_hash if already known),
+    so repeat documents skip extraction entirely.
+    """
     try:
+        cache = get_text_cache()
+        if cache:
+            content_hash = content_hash or await run_blocking(file_sha256, file_path)
+            cached = await run_blocking(cache.get, "document", content_hash)
+            if cached is not None:
+                return cached
+        
         # Try direct PDF text extraction first (faster)
-        try:
-            import PyPDF2
-            with open(file_path, 'rb') as file:
-                pdf_reader = PyPDF2.PdfReader(file)
-                text = ""
-                for page in pdf_reader.pages:
-                    text += page.extract_text() + "\n"
-                if text.strip():
-                    return text
-        except:
-            pass
+        text = await run_blocking(extract_text_layer, file_path)
         
         # Fallback to OCR if direct extraction fails
-        images = convert_from_path(file_path, dpi=300)
-        full_text = ""
-        for image in images:
-            text = pytesseract.image_to_string(image)
-            full_text += text + "\n"
+        if not text.strip():
+            text = await ocr_pdf(file_path, settings.OCR_DPI)
         
-        return full_text
+        if cache:
+            await run_blocking(cache.put, "document", content_hash, text)
+        return text
     except Exception as e:
         raise Exception(f"Error extracting PDF text: {str(e)}")
 
 
-def parse_provider_from_text(text: str) -> Dict[str, Any]:
-    """Parse provider information from extracted text"""
-    # Simple parsing logic - can be enhanced with NLP
-    provider = {
-        "name": "",
-        "npi": "",
-        "specialty": "",
-        "phone": "",
-        "email": "",
-        "address": "",
-        "city": "",
-        "state": "",
-        "zip_code": "",
-        "website": ""
-    }
-    
-    lines = text.split('\n')
-    for line in lines:
+# Patterns used to pull provider fields out of extracted PDF text, compiled once
+NPI_PATTERN = re.compile(r'\b\d{10}\b')
+PHONE_PATTERN = re.compile(r'(\+?1[-.\s]?)?\(?\d{3}\)?[-.\s]?\d{3}[-.\s]?\d{4}')
+TEXT_EMAIL_PATTERN = re.compile(r'\b[A-Za-z0-9._%+-]+@[A-Za-z0-9.-]+\.[A-Z|a-z]{2,}\b')
+URL_PATTERN = re.compile(r'https?://[^\s]+')
+STATE_ZIP_PATTERN = re.compile(r'\b([A-Z]{2})\s+(\d{5}(-\d{4})?)\b')
+CITY_STATE_ZIP_PATTERN = re.compile(r'^([A-Za-z][A-Za-z .\'-]*?),\s*([A-Z]{2})\s+(\d{5}(?:-\d{4})?)\b')
+ADDRESS_PATTERN = re.compile(
+    r'^\d+\s+.*\b(street|st|avenue|ave|road|rd|drive|dr|boulevard|blvd|lane|ln|way|court|ct|parkway|pkwy|place|pl|suite|ste)\b',
+    re.IGNORECASE
+)
+_CREDENTIALS = r'(?:MD|DO|NP|PA|PA-C|DDS|DPM|RN|PhD)'
+NAME_PATTERN = re.compile(
+    r'^(?:[Dd][Rr]\.?\s+[A-Z][^\d@]*|[A-Z][A-Za-z.\'-]*(?:,?\s+[A-Z][A-Za-z.\'-]*)+,?\s+' + _CREDENTIALS + r'\b[^\d@]*)$'
+)
+# Name in front of an NPI on the same line, credentials optional ("Smith, John MD", "Jane Doe")
+NAME_CELL_PATTERN = re.compile(
+    r'^(?:[Dd][Rr]\.?\s+)?[A-Z][A-Za-z.\'-]*(?:,?\s+[A-Z][A-Za-z.\'-]*)+(?:,?\s+' + _CREDENTIALS + r')?$'
+)
+# Column gaps of a tabular roster row: tabs, pipes or runs of spaces
+CELL_SEPARATOR_PATTERN = re.compile(r'\s*[\t|]\s*|\s{2,}')
+LABEL_PATTERN = re.compile(
+    r'^(provider name|provider|name|npi|specialty|speciality|phone|telephone|tel|email|e-mail|'
+    r'address|city|state|zip code|zip|website|url)\s*[:#]\s*(.+)$',
+    re.IGNORECASE
+)
+LABEL_FIELDS = {
+    "provider name": "name", "provider": "name", "name": "name",
+    "npi": "npi",
+    "specialty": "specialty", "speciality": "specialty",
+    "phone": "phone", "telephone": "phone", "tel": "phone",
+    "email": "email", "e-mail": "email",
+    "address": "address", "city": "city", "state": "state",
+    "zip code": "zip_code", "zip": "zip_code",
+    "website": "website", "url": "website"
+}
+# A different name or NPI means the text moved on to the next provider
+RECORD_KEY_FIELDS = ("name", "npi")
+
+PROVIDER_TEXT_FIELDS = [
+    "name", "npi", "specialty", "phone", "email",
+    "address", "city", "state", "zip_code", "website"
+]
+
+
+def _empty_provider() -> Dict[str, Any]:
+    return {field: "" for field in PROVIDER_TEXT_FIELDS}
+
+
+def _cells(text: str) -> List[str]:
+    return [cell for cell in CELL_SEPARATOR_PATTERN.split(text.strip(" \t|,")) if cell]
+
+
+def _line_fields(line: str) -> Dict[str, str]:
+    """
+    Provider fields found on a single line of text
+    
+    A line is either one labelled field, free text, or a whole tabular roster
+    row. An unlabelled 10-digit number is the NPI only if it passes the NPI
+    check digit; the phone is the first phone-like number that is not an NPI
+    candidate, falling back to a bare number that failed the check.
+    """
+    label_match = LABEL_PATTERN.match(line)
+    if label_match:
+        field = LABEL_FIELDS[label_match.group(1).lower()]
+        value = label_match.group(2).strip()
+        if field == "phone":
+            value = NON_DIGIT_PATTERN.sub('', value)
+        elif field == "npi":
+            npi_match = NPI_PATTERN.search(value)
+            value = npi_match.group() if npi_match else ""
+        found = {field: value} if value else {}
+        if field == "address":
+            found.update(_state_zip_fields(value))
+        return found
+    
+    found = {}
+    bare_matches = list(NPI_PATTERN.finditer(line))
+    npi_match = next((match for match in bare_matches if npi_check_digit_valid(match.group())), None)
+    if npi_match:
+        found["npi"] = npi_match.group()
+    
+    bare_numbers = {match.group() for match in bare_matches}
+    phones = [NON_DIGIT_PATTERN.sub('', match.group()) for match in PHONE_PATTERN.finditer(line)]
+    phone = next((digits for digits in phones if digits not in bare_numbers), None)
+    if phone is None:
+        phone = next((digits for digits in phones if digits != found.get("npi")), None)
+    if phone:
+        found["phone"] = phone
+    
+    email_match = TEXT_EMAIL_PATTERN.search(line)
+    if email_match:
+        found["email"] = email_match.group()
+    
+    url_match = URL_PATTERN.search(line)
+    if url_match:
+        found["website"] = url_match.group()
+    
+    cells = _cells(line)
+    if ADDRESS_PATTERN.search(line):
+        found["address"] = line
+    elif NAME_PATTERN.match(line):
+        found["name"] = line
+    elif len(cells) > 1:
+        address = next((cell for cell in cells if ADDRESS_PATTERN.search(cell)), None)
+        if address:
+            found["address"] = address
+    
+    if npi_match and "name" not in found:
+        leading = _cells(line[:npi_match.start()])
+        if leading and NAME_CELL_PATTERN.match(leading[0]):
+            found["name"] = leading[0]
+    
+    city_match = next(
+        (match for match in map(CITY_STATE_ZIP_PATTERN.match, cells) if match),
+        None
+    )
+    if city_match:
+        found["city"] = city_match.group(1).strip()
+    found.update(_state_zip_fields(line))
+    return found
+
+
+def _state_zip_fields(text: str) -> Dict[str, str]:
+    state_zip_match = STATE_ZIP_PATTERN.search(text)
+    if not state_zip_match:
+        return {}
+    return {"state": state_zip_match.group(1), "zip_code": state_zip_match.group(2)}
+
+
+def parse_providers_from_text(text: str, include_source: bool = False) -> List[Dict[str, Any]]:
+    """
+    Parse every provider in a roster's extracted text in a single pass
+    
+    Fields are taken from labelled lines ("NPI: ...") or recognised by pattern.
+    The first value found for a field wins; a new name or NPI that differs
+    from the current record's starts the next provider record, so both
+    stacked fields and one-row-per-provider tables split correctly.
+    
+    Args:
+        text: Extracted PDF text
+        include_source: Add the record's lines of text under "source_text"
+    
+    Returns:
+        One dictionary per provider, with empty strings for missing fields
+    """
+    providers = []
+    current = _empty_provider()
+    current_lines: List[str] = []
+    
+    def finish():
+        if any(current[field] for field in ("name", "npi", "phone", "email")):
+            if include_source:
+                current["source_text"] = "\n".join(current_lines)
+            providers.append(current)
+    
+    for line in text.splitlines():
         line = line.strip()
         if not line:
             continue
         
-        # Extract NPI (10-digit number)
-        import re
-        npi_match = re.search(r'\b\d{10}\b', line)
-        if npi_match and not provider["npi"]:
-            provider["npi"] = npi_match.group()
-        
-        # Extract phone
-        phone_match = re.search(r'(\+?1[-.\s]?)?\(?\d{3}\)?[-.\s]?\d{3}[-.\s]?\d{4}', line)
-        if phone_match and not provider["phone"]:
-            provider["phone"] = re.sub(r'[^\d]', '', phone_match.group())
-        
-        # Extract email
-        email_match = re.search(r'\b[A-Za-z0-9._%+-]+@[A-Za-z0-9.-]+\.[A-Z|a-z]{2,}\b', line)
-        if email_match and not provider["email"]:
-            provider["email"] = email_match.group()
+        found = _line_fields(line)
+        if any(
+            found.get(field) and current[field] and found[field] != current[field]
+            for field in RECORD_KEY_FIELDS
+        ):
+            finish()
+            current = _empty_provider()
+            current_lines = []
         
-        # Extract website
-        url_match = re.search(r'https?://[^\s]+', line)
-        if url_match and not provider["website"]:
-            provider["website"] = url_match.group()
-        
-        # Extract address components
-        if any(word in line.lower() for word in ['street', 'st', 'avenue', 'ave', 'road', 'rd', 'drive', 'dr']):
-            provider["address"] = line
-        
-        # Extract state and zip
-        state_zip_match = re.search(r'([A-Z]{2})\s+(\d{5}(-\d{4})?)', line)
-        if state_zip_match:
-            provider["state"] = state_zip_match.group(1)
-            provider["zip_code"] = state_zip_match.group(2)
+        current_lines.append(line)
+        for field, value in found.items():
+            if not current[field]:
+                current[field] = value
     
-    return provider
+    finish()
+    return providers
 
+
+def parse_provider_from_text(text: str) -> Dict[str, Any]:
+    """Parse the first provider from extracted text (see parse_providers_from_text)"""
+    providers = parse_providers_from_text(text)
+    return providers[0] if providers else _empty_provider()
@@ -1,8 +1,21 @@
 """
 Fuzzy matching utilities for data validation
 """
+import re
 from thefuzz import fuzz, process
-from typing import List, Tuple, Optional
+from typing import Dict, List, Tuple, Optional
+
+
+_ASCII_ALNUM = re.compile(r'[A-Za-z0-9]')
+
+
+# Outcomes of threshold-aware comparisons
+_threshold_stats = {
+    "comparisons": 0,
+    "accepted_early": 0,
+    "rejected_early": 0,
+    "full_scored": 0
+}
 
 
 def fuzzy_match_strings(str1: str, str2: str, threshold: float = 0.85) -> Tuple[bool, float]:
@@ -26,12 +39,90 @@ def fuzzy_match_strings(str1: str, str2: str, threshold: float = 0.85) -> Tuple[
     token_set_ratio = fuzz.token_set_ratio(str1, str2) / 100.0
     
     # Weighted average
-    similarity = (ratio * 0.3 + partial_ratio * 0.2 + token_sort_ratio * 0.25 + token_set_ratio * 0.25)
+    similarity = _weighted_similarity(ratio, partial_ratio, token_sort_ratio, token_set_ratio)
     
     is_match = similarity >= threshold
     return is_match, similarity
 
 
+def _weighted_similarity(ratio: float, partial_ratio: float, token_sort_ratio: float, token_set_ratio: float) -> float:
+    """Combine the individual scorers into one similarity score"""
+    return (ratio * 0.3 + partial_ratio * 0.2 + token_sort_ratio * 0.25 + token_set_ratio * 0.25)
+
+
+def fuzzy_match_threshold(str1: str, str2: str, threshold: float = 0.85) -> Tuple[bool, float]:
+    """
+    Decide whether two strings match at a threshold, running the expensive
+    scorers only in the ambiguous band
+    
+    Strings equal after normalization are accepted with a score of 1.0.
+    Otherwise a length-ratio bound and then the scorers, cheapest first, are
+    applied; after each step the pair is rejected as soon as the score could
+    not reach the threshold even if every remaining scorer returned 100.
+    Decisions are identical to fuzzy_match_strings, and so are scores of
+    pairs that were accepted or fully scored.
+    
+    Returns:
+        Tuple of (is_match, similarity_score); for a pair rejected before all
+        scorers ran, the score is the upper bound that ruled it out, which is
+        below the threshold and never below the full score
+    """
+    _threshold_stats["comparisons"] += 1
+    if not str1 or not str2:
+        _threshold_stats["rejected_early"] += 1
+        return False, 0.0
+    
+    # Token scorers drop non-ASCII characters; they need something left to compare
+    has_tokens = _ASCII_ALNUM.search(str1) is not None
+    
+    # Normalize strings
+    str1 = str1.lower().strip()
+    str2 = str2.lower().strip()
+    
+    # Equal after normalization: every scorer returns 100
+    if str1 == str2 and has_tokens:
+        _threshold_stats["accepted_early"] += 1
+        similarity = _weighted_similarity(1.0, 1.0, 1.0, 1.0)
+        return similarity >= threshold, similarity
+    
+    # Length bound: ratio is at most 2 * min(len) / (len1 + len2)
+    total = len(str1) + len(str2)
+    ratio_bound = min(100, -(-200 * min(len(str1), len(str2)) // total)) / 100.0 if total else 1.0
+    bound = _weighted_similarity(ratio_bound, 1.0, 1.0, 1.0)
+    if bound < threshold:
+        _threshold_stats["rejected_early"] += 1
+        return False, bound
+    
+    ratio = fuzz.ratio(str1, str2) / 100.0
+    bound = _weighted_similarity(ratio, 1.0, 1.0, 1.0)
+    if bound < threshold:
+        _threshold_stats["rejected_early"] += 1
+        return False, bound
+    
+    token_sort_ratio = fuzz.token_sort_ratio(str1, str2) / 100.0
+    bound = _weighted_similarity(ratio, 1.0, token_sort_ratio, 1.0)
+    if bound < threshold:
+        _threshold_stats["rejected_early"] += 1
+        return False, bound
+    
+    token_set_ratio = fuzz.token_set_ratio(str1, str2) / 100.0
+    bound = _weighted_similarity(ratio, 1.0, token_sort_ratio, token_set_ratio)
+    if bound < threshold:
+        _threshold_stats["rejected_early"] += 1
+        return False, bound
+    
+    # Ambiguous band: finish with the most expensive scorer
+    _threshold_stats["full_scored"] += 1
+    partial_ratio = fuzz.partial_ratio(str1, str2) / 100.0
+    similarity = _weighted_similarity(ratio, partial_ratio, token_sort_ratio, token_set_ratio)
+    return similarity >= threshold, similarity
+
+
+def get_threshold_stats() -> Dict[str, int]:
+    """Counts of threshold-aware comparisons by outcome"""
+    return dict(_threshold_stats)
+
+
 def calculate_similarity(str1: str, str2: str) -> float:
     """Calculate similarity score between two strings"""
     _, similarity = fuzzy_match_strings(str1, str2, threshold=0.0)
@@ -0,0 +1,139 @@
+"""
+Page-level PDF text extraction and OCR
+
+Scanned PDFs are rendered one page at a time (first_page/last_page) inside
+worker processes, which OCR the page they rendered, so only a bounded number
+of page images exist at once and neither rendering nor OCR runs on the event
+loop thread. Workers look rendered pages up in the text cache by image hash
+and only OCR pages they have not seen before.
+"""
+import asyncio
+import multiprocessing
+import os
+from concurrent.futures import ProcessPoolExecutor
+from typing import List, Optional, Tuple
+from config import settings
+from utils.text_cache import TextCache, get_text_cache, image_sha256
+from utils.blocking import run_blocking
+
+
+_executor: Optional[ProcessPoolExecutor] = None
+
+
+def ocr_worker_count() -> int:
+    """Configured OCR worker processes, defaulting to the CPU count"""
+    return settings.OCR_WORKERS or os.cpu_count() or 1
+
+
+def get_ocr_executor() -> ProcessPoolExecutor:
+    """Process pool used for OCR, created on first use"""
+    global _executor
+    if _executor is None:
+        # spawn: the API process runs threads, which fork does not copy safely
+        _executor = ProcessPoolExecutor(
+            max_workers=ocr_worker_count(),
+            mp_context=multiprocessing.get_context("spawn")
+        )
+    return _executor
+
+
+async def shutdown_ocr_executor():
+    """
+    Stop the OCR process pool, if it was started
+
+    Queued pages are cancelled; the wait for pages already being OCRed runs
+    in a thread so the event loop keeps serving while the pool drains.
+    """
+    global _executor
+    if _executor is not None:
+        executor, _executor = _executor, None
+        await asyncio.to_thread(executor.shutdown, wait=True, cancel_futures=True)
+
+
+def extract_text_layer(file_path: str) -> str:
+    """Text embedded in the PDF, empty if there is none or it cannot be read"""
+    try:
+        import PyPDF2
+        with open(file_path, 'rb') as file:
+            pdf_reader = PyPDF2.PdfReader(file)
+            return "".join((page.extract_text() or "") + "\n" for page in pdf_reader.pages)
+    except Exception:
+        return ""
+
+
+def pdf_page_count(file_path: str) -> int:
+    """Number of pages in a PDF"""
+    try:
+        import PyPDF2
+        with open(file_path, 'rb') as file:
+            return len(PyPDF2.PdfReader(file).pages)
+    except Exception:
+        from pdf2image import pdfinfo_from_path
+        return int(pdfinfo_from_path(file_path)["Pages"])
+
+
+def ocr_page(file_path: str, page_number: int, dpi: int, cache_dir: Optional[str] = None) -> Tuple[str, bool, int]:
+    """
+    Render a single page and OCR it (runs in a worker process)
+
+    Returns:
+        Page text, whether it came from the page cache, and bytes written to the cache
+    """
+    from pdf2image import convert_from_path
+    import pytesseract
+
+    cache = TextCache(cache_dir, 0) if cache_dir else None
+    texts = []
+    cache_hit = True
+    written = 0
+    for image in convert_from_path(file_path, dpi=dpi, first_page=page_number, last_page=page_number):
+        key = image_sha256(image) if cache else None
+        text = cache.lookup("page", key) if cache else None
+        if text is None:
+            cache_hit = False
+            text = pytesseract.image_to_string(image)
+            if cache:
+                written += cache.store("page", key, text)
+        texts.append(text + "\n")
+    return "".join(texts), cache_hit, written
+
+
+async def ocr_pdf(file_path: str, dpi: Optional[int] = None, max_in_flight: Optional[int] = None) -> str:
+    """
+    OCR every page of a PDF in the process pool
+
+    Args:
+        file_path: PDF to OCR
+        dpi: Render resolution, defaults to settings.OCR_DPI
+        max_in_flight: Pages submitted at once, defaults to twice the worker count
+
+    Returns:
+        Page texts joined in page order
+    """
+    dpi = dpi or settings.OCR_DPI
+    max_in_flight = max_in_flight or ocr_worker_count() * 2
+
+    loop = asyncio.get_running_loop()
+    page_count = await run_blocking(pdf_page_count, file_path)
+    executor = get_ocr_executor()
+    cache = get_text_cache()
+    cache_dir = cache.directory if cache else None
+    semaphore = asyncio.Semaphore(max_in_flight)
+    texts: List[str] = [""] * page_count
+    written = 0
+
+    async def run(page_number: int):
+        nonlocal written
+        async with semaphore:
+            text, cache_hit, page_written = await loop.run_in_executor(
+                executor, ocr_page, file_path, page_number, dpi, cache_dir
+            )
+        texts[page_number - 1] = text
+        written += page_written
+        if cache:
+            cache.record("page", hit=cache_hit)
+
+    await asyncio.gather(*(run(page_number) for page_number in range(1, page_count + 1)))
+    if cache and written:
+        await run_blocking(cache.added, written)
+    return "".join(texts)
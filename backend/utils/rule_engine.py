@@ -0,0 +1,377 @@
+"""
+Declarative QA rule engine
+
+Rules are loaded from a JSON rule set and compiled once into matchers
+(Aho-Corasick automata for keyword lists, precompiled regexes and column
+predicates). A compiled rule set evaluates one provider at a time for the
+pipeline, or every row of a job with one vectorized pass per rule for the
+columnar scorer, and keeps per-rule hit counts and timings.
+"""
+import json
+import re
+import time
+from abc import ABC, abstractmethod
+from functools import lru_cache
+from pathlib import Path
+from typing import Dict, Any, List, Optional, Callable, NamedTuple, Tuple
+import numpy as np
+import pandas as pd
+
+try:
+    import ahocorasick
+except ImportError:  # pragma: no cover - optional dependency
+    ahocorasick = None
+
+
+DEFAULT_RULES_PATH = Path(__file__).resolve().parent.parent / "config" / "qa_rules.json"
+
+EFFECT_NEEDS_REVIEW = "needs_review"
+EFFECT_SUSPICIOUS = "suspicious"
+
+
+class RuleHit(NamedTuple):
+    """A rule that fired for a provider"""
+    rule_id: str
+    effect: str
+    message: str
+
+
+class CompiledRule(ABC):
+    """
+    Base class for compiled rules
+
+    check() evaluates one provider dictionary and is the reference; mask()
+    computes the same decision for whole columns at once.
+    """
+
+    def __init__(self, spec: Dict[str, Any]):
+        self.rule_id = spec["id"]
+        self.rule_type = spec["type"]
+        self.effect = spec.get("effect", EFFECT_SUSPICIOUS)
+        self.message = spec["message"]
+        self.field = spec.get("field")
+        self.evaluated = 0
+        self.hits = 0
+        self.total_seconds = 0.0
+
+        if self.effect not in (EFFECT_NEEDS_REVIEW, EFFECT_SUSPICIOUS):
+            raise ValueError(f"Rule {self.rule_id}: unknown effect '{self.effect}'")
+
+    @property
+    def fields(self) -> List[str]:
+        """Columns this rule reads"""
+        return [self.field]
+
+    @abstractmethod
+    def check(self, provider: Dict[str, Any]) -> Optional[str]:
+        """Return the issue message if the provider hits the rule, None otherwise"""
+        pass
+
+    @abstractmethod
+    def mask(self, columns: Dict[str, np.ndarray], size: int) -> np.ndarray:
+        """Vectorized check: boolean array of the rows that hit the rule"""
+        pass
+
+
+def _truthy(values: np.ndarray) -> np.ndarray:
+    """Python truthiness of an object column"""
+    return values.astype(bool)
+
+
+def _text_mask(values: np.ndarray, matches: Callable[[pd.Series], pd.Series]) -> np.ndarray:
+    """Apply a pandas string predicate to the filled rows of a text column"""
+    filled = _truthy(values)
+    result = np.zeros(len(values), dtype=bool)
+    if filled.any():
+        result[filled] = matches(pd.Series(values[filled], dtype=object)).to_numpy(dtype=bool)
+    return result
+
+
+class ThresholdRule(CompiledRule):
+    """Numeric column below (or above) a threshold"""
+
+    def __init__(self, spec: Dict[str, Any]):
+        super().__init__(spec)
+        self.below = spec.get("below")
+        self.above = spec.get("above")
+
+    def check(self, provider):
+        value = provider.get(self.field)
+        hit = value is not None and (
+            (self.below is not None and value < self.below) or
+            (self.above is not None and value > self.above)
+        )
+        return self.message if hit else None
+
+    def mask(self, columns, size):
+        # None becomes NaN, which compares False like the missing-value check
+        values = pd.to_numeric(pd.Series(columns[self.field], dtype=object)).to_numpy(dtype=np.float64)
+        result = np.zeros(size, dtype=bool)
+        if self.below is not None:
+            result |= values < self.below
+        if self.above is not None:
+            result |= values > self.above
+        return result
+
+
+class MissingFieldsRule(CompiledRule):
+    """Fields empty in both original and validated form"""
+
+    def __init__(self, spec: Dict[str, Any]):
+        super().__init__(spec)
+        self.required = spec["fields"]
+        self.fallback_prefix = spec.get("fallback_prefix", "validated_")
+
+    @property
+    def fields(self):
+        return self.required + [f"{self.fallback_prefix}{field}" for field in self.required]
+
+    def check(self, provider):
+        missing = [
+            field for field in self.required
+            if not provider.get(field) and not provider.get(f"{self.fallback_prefix}{field}")
+        ]
+        return self.message.format(fields=", ".join(missing)) if missing else None
+
+    def mask(self, columns, size):
+        result = np.zeros(size, dtype=bool)
+        for field in self.required:
+            present = _truthy(columns[field]) | _truthy(columns[f"{self.fallback_prefix}{field}"])
+            result |= ~present
+        return result
+
+
+class SimilarityRule(CompiledRule):
+    """Fuzzy similarity between two columns below a threshold"""
+
+    def __init__(self, spec: Dict[str, Any]):
+        super().__init__(spec)
+        self.other_field = spec["other_field"]
+        self.below = spec["below"]
+
+    @property
+    def fields(self):
+        return [self.field, self.other_field]
+
+    def _mismatch(self, value, other) -> bool:
+        from utils.fuzzy_match import fuzzy_match_threshold
+
+        # Similarity below the threshold is exactly a failed threshold match
+        return not fuzzy_match_threshold(value, other, self.below)[0]
+
+    def check(self, provider):
+        value = provider.get(self.field)
+        other = provider.get(self.other_field)
+        hit = bool(value) and bool(other) and self._mismatch(value, other)
+        return self.message if hit else None
+
+    def mask(self, columns, size):
+        values = columns[self.field]
+        others = columns[self.other_field]
+        result = np.zeros(size, dtype=bool)
+        # Fuzzy scoring has no array form; only rows with both values are compared
+        for index in np.flatnonzero(_truthy(values) & _truthy(others)):
+            result[index] = self._mismatch(values[index], others[index])
+        return result
+
+
+class DigitCountRule(CompiledRule):
+    """
+    Number of digits in a text column outside an allowed set
+
+    If canonical_field names a digits-only column filled at ingest, its length
+    is used instead of scanning the raw value.
+    """
+
+    def __init__(self, spec: Dict[str, Any]):
+        super().__init__(spec)
+        self.allowed = frozenset(spec["allowed"])
+        self.canonical_field = spec.get("canonical_field")
+
+    @property
+    def fields(self):
+        return [self.field] + ([self.canonical_field] if self.canonical_field else [])
+
+    def check(self, provider):
+        value = provider.get(self.field)
+        if not value:
+            return None
+        canonical = provider.get(self.canonical_field) if self.canonical_field else None
+        digit_count = len(canonical) if canonical is not None else sum(map(str.isdigit, value))
+        return self.message if digit_count not in self.allowed else None
+
+    def mask(self, columns, size):
+        values = columns[self.field]
+        filled = _truthy(values)
+        result = np.zeros(size, dtype=bool)
+        if not filled.any():
+            return result
+
+        texts = pd.Series(values[filled], dtype=object)
+        # str.isdigit and \d agree on ASCII text; fall back per value otherwise
+        ascii_rows = texts.str.isascii().fillna(False).astype(bool).to_numpy()
+        digit_counts = texts.str.count(r"\d").where(ascii_rows, 0).to_numpy(dtype=np.int64, copy=True)
+        for position in np.flatnonzero(~ascii_rows):
+            digit_counts[position] = sum(map(str.isdigit, texts.iloc[position]))
+
+        if self.canonical_field:
+            canonical = pd.Series(columns[self.canonical_field][filled], dtype=object)
+            has_canonical = canonical.notna().to_numpy()
+            canonical_lengths = canonical.str.len().fillna(0).to_numpy(dtype=np.int64)
+            digit_counts = np.where(has_canonical, canonical_lengths, digit_counts)
+
+        result[filled] = ~np.isin(digit_counts, list(self.allowed))
+        return result
+
+
+class KeywordRule(CompiledRule):
+    """Text column containing any keyword from a list"""
+
+    def __init__(self, spec: Dict[str, Any]):
+        super().__init__(spec)
+        self.case_insensitive = spec.get("case_insensitive", True)
+        keywords = [
+            keyword.lower() if self.case_insensitive else keyword
+            for keyword in spec["keywords"]
+        ]
+        self._matcher = self._compile(keywords)
+        self._pattern = "|".join(re.escape(keyword) for keyword in keywords)
+
+    @staticmethod
+    def _compile(keywords: List[str]) -> Callable[[str], bool]:
+        """Compile keywords into a single-pass substring matcher"""
+        if ahocorasick is not None:
+            automaton = ahocorasick.Automaton()
+            for keyword in keywords:
+                automaton.add_word(keyword, keyword)
+            automaton.make_automaton()
+            return lambda text: next(automaton.iter(text), None) is not None
+
+        pattern = re.compile("|".join(re.escape(keyword) for keyword in keywords))
+        return lambda text: pattern.search(text) is not None
+
+    def check(self, provider):
+        value = provider.get(self.field)
+        if not value:
+            return None
+        text = value.lower() if self.case_insensitive else value
+        return self.message if self._matcher(text) else None
+
+    def mask(self, columns, size):
+        def contains(texts: pd.Series) -> pd.Series:
+            if self.case_insensitive:
+                texts = texts.str.lower()
+            return texts.str.contains(self._pattern, regex=True)
+
+        return _text_mask(columns[self.field], contains)
+
+
+class RegexRule(CompiledRule):
+    """Text column matching (or, with negate, not matching) a regular expression"""
+
+    def __init__(self, spec: Dict[str, Any]):
+        super().__init__(spec)
+        flags = re.IGNORECASE if spec.get("case_insensitive", False) else 0
+        self.pattern = re.compile(spec["pattern"], flags)
+        self.negate = spec.get("negate", False)
+
+    def check(self, provider):
+        value = provider.get(self.field)
+        hit = bool(value) and (self.pattern.search(value) is None) == self.negate
+        return self.message if hit else None
+
+    def mask(self, columns, size):
+        values = columns[self.field]
+        matched = _text_mask(values, lambda texts: texts.str.contains(self.pattern, regex=True))
+        if self.negate:
+            return _truthy(values) & ~matched
+        return matched
+
+
+RULE_TYPES = {
+    "threshold": ThresholdRule,
+    "missing_fields": MissingFieldsRule,
+    "similarity": SimilarityRule,
+    "digit_count": DigitCountRule,
+    "keywords": KeywordRule,
+    "regex": RegexRule
+}
+
+
+class RuleEngine:
+    """Compiled QA rule set"""
+
+    def __init__(self, config: Dict[str, Any]):
+        self.multiple_issues_threshold = config.get("multiple_issues_threshold", 3)
+        self.multiple_issues_message = config.get(
+            "multiple_issues_message", "Multiple validation issues detected"
+        )
+        self.rules: List[CompiledRule] = []
+
+        seen = set()
+        for spec in config.get("rules", []):
+            rule_class = RULE_TYPES.get(spec.get("type"))
+            if rule_class is None:
+                raise ValueError(f"Rule {spec.get('id')}: unknown type '{spec.get('type')}'")
+            if spec["id"] in seen:
+                raise ValueError(f"Duplicate rule id '{spec['id']}'")
+            seen.add(spec["id"])
+            self.rules.append(rule_class(spec))
+
+    @classmethod
+    def from_file(cls, path: str) -> "RuleEngine":
+        """Load and compile a rule set from a JSON file"""
+        with open(path, "r", encoding="utf-8") as f:
+            return cls(json.load(f))
+
+    def evaluate(self, provider: Dict[str, Any]) -> List[RuleHit]:
+        """Evaluate all rules for one provider dictionary"""
+        hits = []
+        for rule in self.rules:
+            started = time.perf_counter()
+            message = rule.check(provider)
+            if message is not None:
+                hits.append(RuleHit(rule.rule_id, rule.effect, message))
+                rule.hits += 1
+            rule.evaluated += 1
+            rule.total_seconds += time.perf_counter() - started
+        return hits
+
+    def evaluate_masks(self, columns: Dict[str, np.ndarray], size: int) -> List[Tuple["CompiledRule", np.ndarray]]:
+        """
+        Evaluate all rules over column arrays, one vectorized pass per rule
+
+        Returns:
+            (rule, hit mask) pairs in rule order; absent columns read as None
+        """
+        empty = np.full(size, None, dtype=object)
+        masks = []
+        for rule in self.rules:
+            started = time.perf_counter()
+            mask = rule.mask({field: columns.get(field, empty) for field in rule.fields}, size)
+            rule.evaluated += size
+            rule.hits += int(mask.sum())
+            rule.total_seconds += time.perf_counter() - started
+            masks.append((rule, mask))
+        return masks
+
+    def stats(self) -> List[Dict[str, Any]]:
+        """Per-rule evaluation counts, hit counts and timings"""
+        return [
+            {
+                "rule_id": rule.rule_id,
+                "type": rule.rule_type,
+                "effect": rule.effect,
+                "evaluated": rule.evaluated,
+                "hits": rule.hits,
+                "total_seconds": rule.total_seconds,
+                "avg_microseconds": (rule.total_seconds / rule.evaluated * 1e6) if rule.evaluated else 0.0
+            }
+            for rule in self.rules
+        ]
+
+
+@lru_cache(maxsize=None)
+def load_rule_engine(path: Optional[str] = None) -> RuleEngine:
+    """Load the compiled rule set for a path, compiling it only once per process"""
+    return RuleEngine.from_file(path or str(DEFAULT_RULES_PATH))
@@ -0,0 +1,260 @@
+"""
+Column mapping inference for heterogeneous rosters
+
+Headers are matched against known synonyms for each provider field; columns
+whose header is not recognised are classified from a sample of their values
+(NPI check digit, email, URL, state, ZIP, street address and phone patterns).
+Mappings are cached per header signature, in process and in the
+column_mappings table, so repeat uploads from the same source map without
+re-sampling.
+
+Only the first chunk of an upload (SCHEMA_SAMPLE_ROWS rows) is sampled, and
+the stored mapping is reused for every later file with the same header row,
+whatever its values. A wrong mapping therefore persists until it is corrected
+with update_column_mapping (PUT /api/upload/column-mappings/{signature}).
+"""
+import hashlib
+import re
+from collections import OrderedDict
+from typing import Dict, Any, List, Optional, Sequence
+import pandas as pd
+from config import settings
+from utils.address import STATE_ABBREVIATIONS
+from utils.confidence import EMAIL_PATTERN, NON_DIGIT_PATTERN
+
+
+# Provider fields a roster column can map to
+ROSTER_FIELDS = [
+    "name", "npi", "specialty", "phone", "email",
+    "address", "city", "state", "zip_code", "website"
+]
+
+# Normalized header spellings per field, in addition to the field name itself
+HEADER_SYNONYMS = {
+    "name": [
+        "provider_name", "provider", "full_name", "provider_full_name", "physician",
+        "physician_name", "practitioner", "practitioner_name", "doctor", "doctor_name", "clinician"
+    ],
+    "npi": ["npi_number", "npi_no", "npi_num", "npi_id", "provider_npi", "national_provider_identifier"],
+    "specialty": ["speciality", "primary_specialty", "specialization", "taxonomy", "taxonomy_description"],
+    "phone": [
+        "phone_number", "phone_no", "telephone", "tel", "office_phone", "practice_phone",
+        "contact_phone", "primary_phone", "phone_1"
+    ],
+    "email": ["email_address", "e_mail", "contact_email", "mail"],
+    "address": [
+        "street", "street_address", "address_1", "address1", "address_line_1", "address_line1",
+        "addr", "practice_address", "office_address", "mailing_address"
+    ],
+    "city": ["town", "practice_city", "city_name"],
+    "state": ["st", "state_code", "province", "practice_state"],
+    "zip_code": ["zip", "zipcode", "zip5", "postal_code", "postcode", "postal", "practice_zip"],
+    "website": ["url", "web", "web_site", "homepage", "site", "web_address"]
+}
+
+_HEADER_FIELDS = {
+    synonym: field
+    for field, synonyms in HEADER_SYNONYMS.items()
+    for synonym in [field] + synonyms
+}
+
+_HEADER_NORMALIZE_PATTERN = re.compile(r'[^a-z0-9]+')
+_ZIP_VALUE_PATTERN = re.compile(r'^\d{5}(-?\d{4})?$')
+_WEBSITE_VALUE_PATTERN = re.compile(r'^(https?://|www\.)\S+$', re.IGNORECASE)
+_ADDRESS_VALUE_PATTERN = re.compile(r'^\d+[A-Za-z]?\s+[A-Za-z]')
+_STATE_CODES = frozenset(STATE_ABBREVIATIONS.values())
+
+# Header words of columns whose values look like a provider field but are not
+# one (fax numbers pass the phone pattern); they are never mapped by value
+_UNMAPPED_HEADER_WORDS = frozenset(["fax", "facsimile"])
+
+# Share of sampled values that must match a field's pattern
+VALUE_MATCH_THRESHOLD = 0.8
+
+# Column mappings by header signature, least recently used evicted first
+_mapping_cache: "OrderedDict[str, Dict[str, str]]" = OrderedDict()
+
+
+def normalize_header(header: Any) -> str:
+    """Lowercase a header and collapse punctuation and spaces to underscores"""
+    return _HEADER_NORMALIZE_PATTERN.sub("_", str(header).strip().lower()).strip("_")
+
+
+def header_signature(headers: Sequence[Any]) -> str:
+    """Stable fingerprint of a roster's header row"""
+    return hashlib.sha256("\x1f".join(normalize_header(header) for header in headers).encode()).hexdigest()
+
+
+def npi_check_digit_valid(value: str) -> bool:
+    """Whether a 10-digit NPI passes the Luhn check (with the 80840 card prefix)"""
+    if len(value) != 10 or not value.isdigit():
+        return False
+    total = 24  # Luhn contribution of the 80840 prefix
+    for index, digit in enumerate(reversed(value[:9])):
+        number = int(digit)
+        if index % 2 == 0:
+            number *= 2
+            if number > 9:
+                number -= 9
+        total += number
+    return (10 - total % 10) % 10 == int(value[9])
+
+
+def _value_field(values: List[str]) -> Optional[str]:
+    """Provider field whose value pattern most of the sampled values match"""
+    if not values:
+        return None
+
+    def share(predicate) -> float:
+        return sum(1 for value in values if predicate(value)) / len(values)
+
+    digits = [NON_DIGIT_PATTERN.sub('', value) for value in values]
+    checks = [
+        ("npi", share(npi_check_digit_valid)),
+        ("email", share(lambda value: EMAIL_PATTERN.match(value) is not None)),
+        ("website", share(lambda value: _WEBSITE_VALUE_PATTERN.match(value) is not None)),
+        ("state", share(lambda value: value.upper() in _STATE_CODES)),
+        ("zip_code", share(lambda value: _ZIP_VALUE_PATTERN.match(value) is not None)),
+        ("address", share(lambda value: _ADDRESS_VALUE_PATTERN.match(value) is not None)),
+        ("phone", sum(
+            1 for value, digit_string in zip(values, digits)
+            if len(digit_string) in (10, 11) and not value.isalpha()
+        ) / len(values))
+    ]
+    for field, matched in checks:
+        if matched >= VALUE_MATCH_THRESHOLD:
+            return field
+    return None
+
+
+def infer_column_mapping(headers: Sequence[Any], sample: pd.DataFrame) -> Dict[str, str]:
+    """
+    Map roster columns onto provider fields
+
+    Args:
+        headers: Column names as they appear in the file
+        sample: First rows of the roster, used for columns with unknown headers
+
+    Returns:
+        Source column -> provider field, for every column that could be mapped
+    """
+    mapping: Dict[str, str] = {}
+    taken = set()
+
+    # Exact field names first, then synonyms, so "Name" wins over "Provider"
+    for exact in (True, False):
+        for header in headers:
+            if header in mapping:
+                continue
+            normalized = normalize_header(header)
+            field = normalized if exact and normalized in ROSTER_FIELDS else (
+                None if exact else _HEADER_FIELDS.get(normalized)
+            )
+            if field and field not in taken:
+                mapping[header] = field
+                taken.add(field)
+
+    for header in headers:
+        if header in mapping or header not in sample.columns:
+            continue
+        if _UNMAPPED_HEADER_WORDS.intersection(normalize_header(header).split("_")):
+            continue
+        values = [
+            str(value).strip() for value in sample[header].tolist()
+            if value is not None and not pd.isna(value) and str(value).strip()
+        ]
+        field = _value_field(values)
+        if field and field not in taken:
+            mapping[header] = field
+            taken.add(field)
+
+    return mapping
+
+
+def apply_column_mapping(
+    mapping: Dict[str, str],
+    records: List[Dict[str, Any]],
+    frame: pd.DataFrame
+):
+    """Rename mapped columns in a chunk's records and frame; other columns are kept as is"""
+    if all(source == field for source, field in mapping.items()):
+        return records, frame
+    records = [
+        {mapping.get(key, key): value for key, value in record.items()}
+        for record in records
+    ]
+    return records, frame.rename(columns=mapping)
+
+
+async def resolve_column_mapping(session, headers: Sequence[Any], sample: pd.DataFrame) -> Dict[str, str]:
+    """
+    Column mapping for a header row, from the in-process cache, the database
+    or fresh inference (which is then stored)
+    """
+    from sqlalchemy import select
+    from sqlalchemy.exc import IntegrityError
+    from database.models import ColumnMapping
+
+    headers = [str(header) for header in headers]
+    signature = header_signature(headers)
+    if signature in _mapping_cache:
+        _mapping_cache.move_to_end(signature)
+        return _mapping_cache[signature]
+
+    result = await session.execute(
+        select(ColumnMapping.mapping).where(ColumnMapping.signature == signature)
+    )
+    mapping = result.scalar_one_or_none()
+    if mapping is None:
+        mapping = infer_column_mapping(headers, sample)
+        try:
+            async with session.begin_nested():
+                session.add(ColumnMapping(signature=signature, headers=headers, mapping=mapping))
+        except IntegrityError:
+            # Another upload with the same headers stored its mapping first
+            pass
+
+    _mapping_cache[signature] = mapping
+    while len(_mapping_cache) > settings.COLUMN_MAPPING_CACHE_SIZE:
+        _mapping_cache.popitem(last=False)
+    return mapping
+
+
+def check_column_mapping(headers: Sequence[str], mapping: Dict[str, str]):
+    """Raise ValueError unless mapping sends header columns to distinct provider fields"""
+    unknown_columns = [source for source in mapping if source not in headers]
+    if unknown_columns:
+        raise ValueError(f"Columns not in the header row: {', '.join(unknown_columns)}")
+    unknown_fields = sorted(set(mapping.values()) - set(ROSTER_FIELDS))
+    if unknown_fields:
+        raise ValueError(f"Unknown provider fields: {', '.join(unknown_fields)}")
+    if len(set(mapping.values())) != len(mapping):
+        raise ValueError("Each provider field can be mapped from one column only")
+
+
+async def update_column_mapping(session, signature: str, mapping: Dict[str, str]):
+    """
+    Replace the stored mapping for a header signature
+
+    Args:
+        session: Database session; the caller commits
+        signature: Header signature of the roster source
+        mapping: Corrected source column -> provider field
+
+    Returns:
+        The updated ColumnMapping, or None if no mapping is stored for the signature
+    """
+    from sqlalchemy import select
+    from database.models import ColumnMapping
+
+    result = await session.execute(
+        select(ColumnMapping).where(ColumnMapping.signature == signature)
+    )
+    stored = result.scalar_one_or_none()
+    if stored is None:
+        return None
+    check_column_mapping(stored.headers, mapping)
+    stored.mapping = dict(mapping)
+    # Other worker processes keep their cached copy until it is evicted
+    _mapping_cache.pop(signature, None)
+    return stored
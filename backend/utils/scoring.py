@@ -0,0 +1,204 @@
+"""
+Columnar scoring utilities for whole-job confidence, QA flags and directory priority
+
+The per-provider functions in utils.confidence and the QA / directory agents
+remain the reference implementation; the functions here compute the same
+values for every row of a job at once and must stay bit-for-bit compatible.
+"""
+from typing import Dict, Any, List, Optional
+import numpy as np
+import pandas as pd
+from config import settings
+from utils.confidence import OVERALL_CONFIDENCE_WEIGHTS, COMPLETENESS_FIELDS, CRITICAL_FIELDS
+from utils.rule_engine import RuleEngine, load_rule_engine, EFFECT_NEEDS_REVIEW
+
+
+# Columns loaded into a score frame
+TEXT_COLUMNS = COMPLETENESS_FIELDS + [f"validated_{field}" for field in COMPLETENESS_FIELDS]
+CONFIDENCE_COLUMNS = list(OVERALL_CONFIDENCE_WEIGHTS.keys())
+
+
+def build_score_frame(records: List[Dict[str, Any]]) -> pd.DataFrame:
+    """
+    Build a score frame from provider dictionaries
+
+    Text columns are kept as object arrays so that missing values stay None
+    and truthiness matches the per-row checks exactly.
+    """
+    columns = {"id": [record.get("id") for record in records]}
+    for field in TEXT_COLUMNS:
+        columns[field] = pd.Series([record.get(field) for record in records], dtype=object)
+    for field in CONFIDENCE_COLUMNS:
+        columns[field] = np.array([record.get(field, 0.0) for record in records], dtype=np.float64)
+    columns["issue_count"] = np.array(
+        [len(record.get("issues") or []) for record in records], dtype=np.int64
+    )
+    return pd.DataFrame(columns)
+
+
+def _truthy(df: pd.DataFrame, field: str) -> np.ndarray:
+    """Python truthiness of a column, all False if the column is absent"""
+    if field not in df.columns:
+        return np.zeros(len(df), dtype=bool)
+    return df[field].to_numpy(dtype=object).astype(bool)
+
+
+def _present(df: pd.DataFrame, field: str) -> np.ndarray:
+    """Whether the original or validated value of a field is filled"""
+    return _truthy(df, field) | _truthy(df, f"validated_{field}")
+
+
+def overall_confidence_column(df: pd.DataFrame) -> np.ndarray:
+    """Vectorized calculate_overall_confidence"""
+    total_weight = 0.0
+    weighted_sum = np.zeros(len(df), dtype=np.float64)
+
+    for field, weight in OVERALL_CONFIDENCE_WEIGHTS.items():
+        if field in df.columns:
+            scores = df[field].fillna(0.0).to_numpy(dtype=np.float64)
+        else:
+            scores = np.zeros(len(df), dtype=np.float64)
+        weighted_sum = weighted_sum + scores * weight
+        total_weight += weight
+
+    if total_weight == 0:
+        return np.zeros(len(df), dtype=np.float64)
+
+    return weighted_sum / total_weight
+
+
+def completeness_column(df: pd.DataFrame) -> np.ndarray:
+    """Vectorized DirectoryAgent._calculate_completeness"""
+    filled_fields = np.zeros(len(df), dtype=np.int64)
+    for field in COMPLETENESS_FIELDS:
+        filled_fields += _present(df, field)
+    return filled_fields / len(COMPLETENESS_FIELDS)
+
+
+def critical_fields_column(df: pd.DataFrame) -> np.ndarray:
+    """Vectorized DirectoryAgent._check_critical_fields"""
+    present_fields = np.zeros(len(df), dtype=np.int64)
+    for field in CRITICAL_FIELDS:
+        present_fields += _present(df, field)
+    return present_fields / len(CRITICAL_FIELDS)
+
+
+def qa_flags(
+    df: pd.DataFrame,
+    overall_confidence: Optional[np.ndarray] = None,
+    rules: Optional[RuleEngine] = None
+) -> pd.DataFrame:
+    """
+    Vectorized QAAgent flags, one array pass per rule of the QA rule set
+
+    Returns:
+        DataFrame with needs_review and is_suspicious columns
+    """
+    if overall_confidence is None:
+        overall_confidence = overall_confidence_column(df)
+    if rules is None:
+        rules = load_rule_engine(settings.QA_RULES_PATH)
+
+    columns = {field: df[field].to_numpy(dtype=object) for field in df.columns}
+    columns["confidence_overall"] = overall_confidence
+
+    review_hits = np.zeros(len(df), dtype=np.int64)
+    suspicious_patterns = np.zeros(len(df), dtype=bool)
+    for rule, mask in rules.evaluate_masks(columns, len(df)):
+        if rule.effect == EFFECT_NEEDS_REVIEW:
+            review_hits += mask
+        else:
+            suspicious_patterns |= mask
+
+    if "issue_count" in df.columns:
+        issue_count = df["issue_count"].to_numpy(dtype=np.int64)
+    else:
+        issue_count = np.zeros(len(df), dtype=np.int64)
+    issue_count = issue_count + review_hits
+
+    return pd.DataFrame({
+        "needs_review": review_hits > 0,
+        "is_suspicious": (issue_count >= rules.multiple_issues_threshold) | suspicious_patterns
+    }, index=df.index)
+
+
+def score_frame(df: pd.DataFrame, recompute_flags: bool = True) -> pd.DataFrame:
+    """
+    Score every provider in a frame
+
+    Args:
+        df: Score frame
+        recompute_flags: Recompute QA flags; if False the frame's stored
+            needs_review and is_suspicious columns are used
+
+    Returns:
+        DataFrame with confidence_overall, completeness, critical_fields,
+        needs_review, is_suspicious, priority_score, is_validated and
+        directory_status columns
+    """
+    overall = overall_confidence_column(df)
+    completeness = completeness_column(df)
+    critical = critical_fields_column(df)
+    if recompute_flags:
+        flags = qa_flags(df, overall)
+        needs_review = flags["needs_review"].to_numpy(dtype=bool)
+        is_suspicious = flags["is_suspicious"].to_numpy(dtype=bool)
+    else:
+        needs_review = _truthy(df, "needs_review")
+        is_suspicious = _truthy(df, "is_suspicious")
+
+    priority_score = overall * 0.4 + completeness * 0.3 + critical * 0.3
+    is_validated = (overall >= 0.8) & ~needs_review & ~is_suspicious & (critical >= 0.8)
+    directory_status = np.where(
+        is_validated,
+        "validated",
+        np.where(needs_review | is_suspicious, "needs_review", "pending")
+    )
+
+    result = pd.DataFrame({
+        "confidence_overall": overall,
+        "completeness": completeness,
+        "critical_fields": critical,
+        "needs_review": needs_review,
+        "is_suspicious": is_suspicious,
+        "priority_score": priority_score,
+        "is_validated": is_validated,
+        "directory_status": directory_status
+    }, index=df.index)
+    if "id" in df.columns:
+        result.insert(0, "id", df["id"].to_numpy())
+    return result
+
+
+async def load_job_score_frame(session, job_id: str) -> pd.DataFrame:
+    """Load a job's field values, confidences and stored flags into a score frame"""
+    from sqlalchemy import select
+    from database.models import Provider
+
+    fields = ["id"] + [
+        field for field in TEXT_COLUMNS + CONFIDENCE_COLUMNS + ["needs_review", "is_suspicious"]
+        if hasattr(Provider, field)
+    ]
+    result = await session.execute(
+        select(*[getattr(Provider, field) for field in fields])
+        .where(Provider.job_id == job_id)
+        .order_by(Provider.id)
+    )
+    rows = result.all()
+    if not rows:
+        from database.archive import get_archived_job, read_archived_rows
+        from utils.blocking import run_blocking
+
+        archive = await get_archived_job(session, job_id)
+        if archive is not None:
+            records = await run_blocking(read_archived_rows, archive.providers_path, columns=fields)
+            rows = [tuple(record[field] for field in fields) for record in records]
+
+    columns = {}
+    for position, field in enumerate(fields):
+        values = [row[position] for row in rows]
+        if field in CONFIDENCE_COLUMNS:
+            columns[field] = np.array([value or 0.0 for value in values], dtype=np.float64)
+        else:
+            columns[field] = pd.Series(values, dtype=object)
+    return pd.DataFrame(columns)
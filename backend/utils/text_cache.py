@@ -0,0 +1,190 @@
+"""
+On-disk cache of extracted PDF text
+
+Entries live in one file per key under a namespace directory ("document"
+keys are file SHA-256 digests, "page" keys are rendered page image digests),
+so OCR worker processes can share them. Reads refresh an entry's mtime and
+eviction removes the least recently used files once the cache outgrows its
+byte budget.
+"""
+import hashlib
+import os
+import threading
+import uuid
+from typing import Dict, Any, Optional
+from config import settings
+
+
+NAMESPACES = ("document", "page")
+
+# Suffix of entries still being written; they are not part of the cache yet
+TEMP_SUFFIX = ".tmp"
+
+
+def file_sha256(file_path: str, chunk_size: int = 1024 * 1024) -> str:
+    """SHA-256 hex digest of a file, read in chunks"""
+    hasher = hashlib.sha256()
+    with open(file_path, 'rb') as f:
+        for chunk in iter(lambda: f.read(chunk_size), b""):
+            hasher.update(chunk)
+    return hasher.hexdigest()
+
+
+def image_sha256(image) -> str:
+    """SHA-256 hex digest of a PIL image's mode, size and pixel data"""
+    hasher = hashlib.sha256(f"{image.mode}:{image.size[0]}x{image.size[1]}:".encode())
+    hasher.update(image.tobytes())
+    return hasher.hexdigest()
+
+
+class TextCache:
+    """Size-bounded text cache stored as files under a directory"""
+
+    def __init__(self, directory: str, max_bytes: int):
+        self.directory = directory
+        self.max_bytes = max_bytes
+        self.hits = {namespace: 0 for namespace in NAMESPACES}
+        self.misses = {namespace: 0 for namespace in NAMESPACES}
+        self.evictions = 0
+        self._approx_bytes: Optional[int] = None
+        self._lock = threading.Lock()
+
+    def _path(self, namespace: str, key: str) -> str:
+        return os.path.join(self.directory, namespace, key[:2], f"{key}.txt")
+
+    def lookup(self, namespace: str, key: str) -> Optional[str]:
+        """Cached text for a key without counting the lookup, refreshing its recency"""
+        path = self._path(namespace, key)
+        try:
+            with open(path, 'r', encoding='utf-8') as f:
+                text = f.read()
+            os.utime(path)
+        except OSError:
+            return None
+        return text
+
+    def store(self, namespace: str, key: str, text: str) -> int:
+        """
+        Write text for a key without budget accounting; the file is written
+        under a temporary name and renamed so readers never see a partial entry
+
+        A failed write (disk full, the directory evicted meanwhile) leaves the
+        key uncached rather than failing the caller's extraction.
+
+        Returns:
+            Bytes written, 0 if nothing was stored
+        """
+        path = self._path(namespace, key)
+        temp_path = f"{path}.{uuid.uuid4().hex}{TEMP_SUFFIX}"
+        try:
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            with open(temp_path, 'w', encoding='utf-8') as f:
+                f.write(text)
+            os.replace(temp_path, path)
+            return os.path.getsize(path)
+        except OSError:
+            try:
+                os.remove(temp_path)
+            except OSError:
+                pass
+            return 0
+
+    def get(self, namespace: str, key: str) -> Optional[str]:
+        """Cached text for a key, or None"""
+        text = self.lookup(namespace, key)
+        self.record(namespace, hit=text is not None)
+        return text
+
+    def put(self, namespace: str, key: str, text: str):
+        """Store text for a key, evicting old entries if the cache is over budget"""
+        self.added(self.store(namespace, key, text))
+
+    def record(self, namespace: str, hit: bool):
+        """Count a lookup made here or reported by a worker process"""
+        with self._lock:
+            if hit:
+                self.hits[namespace] += 1
+            else:
+                self.misses[namespace] += 1
+
+    def added(self, size: int):
+        """Account for bytes written by this process or a worker, evicting if over budget"""
+        with self._lock:
+            if self._approx_bytes is None:
+                self._approx_bytes = self._scan()[0]
+            else:
+                self._approx_bytes += size
+            over_budget = self._approx_bytes > self.max_bytes
+        if over_budget:
+            self.evict()
+
+    def _scan(self):
+        """Total bytes and (mtime, size, path) of every entry, skipping writes in progress"""
+        entries = []
+        total = 0
+        for root, _, files in os.walk(self.directory):
+            for name in files:
+                if name.endswith(TEMP_SUFFIX):
+                    continue
+                path = os.path.join(root, name)
+                try:
+                    stat = os.stat(path)
+                except FileNotFoundError:
+                    continue
+                entries.append((stat.st_mtime, stat.st_size, path))
+                total += stat.st_size
+        return total, entries
+
+    def evict(self):
+        """Remove least recently used entries until the cache is within 90% of its budget"""
+        with self._lock:
+            total, entries = self._scan()
+            target = int(self.max_bytes * 0.9)
+            for _, size, path in sorted(entries):
+                if total <= target:
+                    break
+                try:
+                    os.remove(path)
+                except FileNotFoundError:
+                    pass
+                total -= size
+                self.evictions += 1
+            self._approx_bytes = total
+
+    def stats(self) -> Dict[str, Any]:
+        """Hit rates per namespace plus entry counts and bytes on disk"""
+        total, entries = self._scan()
+        counts = {namespace: 0 for namespace in NAMESPACES}
+        for _, _, path in entries:
+            namespace = os.path.relpath(path, self.directory).split(os.sep)[0]
+            if namespace in counts:
+                counts[namespace] += 1
+
+        namespaces = {}
+        for namespace in NAMESPACES:
+            lookups = self.hits[namespace] + self.misses[namespace]
+            namespaces[namespace] = {
+                "hits": self.hits[namespace],
+                "misses": self.misses[namespace],
+                "size": counts[namespace],
+                "hit_rate": (self.hits[namespace] / lookups) if lookups > 0 else 0.0
+            }
+        return {
+            "namespaces": namespaces,
+            "bytes": total,
+            "max_bytes": self.max_bytes,
+            "evictions": self.evictions
+        }
+
+
+_text_cache: Optional[TextCache] = None
+
+
+def get_text_cache() -> Optional[TextCache]:
+    """Process-wide text cache, or None when caching is disabled"""
+    global _text_cache
+    if not settings.OCR_CACHE_ENABLED:
+        return None
+    if _text_cache is None:
+        _text_cache = TextCache(settings.OCR_CACHE_DIR, settings.OCR_CACHE_MAX_BYTES)
+    return _text_cache